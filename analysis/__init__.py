@@ -0,0 +1,21 @@
+from .frequency import FrequencyResponse, frequency_response
+from .covariance import CovarianceResult, covariance_analysis, solve_lyapunov_batch
+from .evaluation import build_models, channel_trajectories, evaluate_rms
+from .optimization import ComfortObjective, OptimizationResult, SuspensionOptimizer
+from .doe import (
+    DesignOfExperiments,
+    PolynomialSurrogate,
+    run_design,
+    sample_parameter_space,
+)
+from .sensitivity import SensitivityTable, local_sensitivity, sobol_indices
+from .montecarlo import MetricAccumulator, MonteCarloAnalysis, MonteCarloResult
+from .control_design import (
+    LQRDesign,
+    actuated_output_channels,
+    lqr_design,
+    solve_riccati_batch,
+    weight_grid,
+)
+from .identification import IdentificationResult, Measurement, identify_parameters
+from .estimation import KalmanEstimator
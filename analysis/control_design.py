@@ -0,0 +1,229 @@
+import itertools
+import numpy as np
+from dataclasses import dataclass, field
+from simulation.control_loop import StateFeedbackController, actuator_geometry
+from .covariance import covariance_analysis, road_augmented_system, solve_lyapunov_batch
+
+
+@dataclass
+class LQRDesign:
+    """
+    Optimal state-feedback gains and closed-loop statistics for a weight grid.
+
+    Every entry of ``rms`` and ``force_rms`` holds one value per design.
+    """
+
+    model_type: str
+    actuators: list
+    weights: list  # Channel weights of every design
+    control_weight: float  # Weight of the squared actuator forces [1/N^2]
+    gains: np.ndarray  # Feedback gains (n_designs, n_actuators, n_states)
+    rms: dict = field(default_factory=dict)  # Closed-loop RMS per channel
+    force_rms: np.ndarray = None  # Actuator force RMS (n_designs, n_actuators) [N]
+    passive_rms: dict = field(default_factory=dict)  # Passive RMS per channel
+
+    def controller(self, index, **kwargs):
+        """
+        Return the state-feedback controller of one design.
+
+        Args:
+            index (int): Index of the design.
+            **kwargs: Further SuspensionController arguments, e.g. max_force.
+
+        Returns:
+            StateFeedbackController: Controller applying the design's gains.
+        """
+        return StateFeedbackController(self.gains[index], **kwargs)
+
+    def pareto_front(self, channels):
+        """
+        Return the designs that no other design improves in every channel.
+
+        Args:
+            channels (list[str]): Channels whose RMS values are minimized.
+
+        Returns:
+            np.ndarray: Indices of the non-dominated designs.
+        """
+        values = np.column_stack([self.rms[channel] for channel in channels])
+        no_worse = np.all(values[:, None, :] <= values[None, :, :], axis=2)
+        better = np.any(values[:, None, :] < values[None, :, :], axis=2)
+        dominated = np.any(no_worse & better, axis=0)
+        return np.flatnonzero(~dominated)
+
+
+def weight_grid(**weights):
+    """
+    Return the channel weights of every combination of the given values.
+
+    Args:
+        **weights: Sequence of weights per channel, e.g.
+            ``weight_grid(body_acc=[1.0], suspension_travel=np.logspace(-2, 2, 20))``.
+
+    Returns:
+        list[dict]: One weight dictionary per combination.
+    """
+    channels = list(weights)
+    return [
+        dict(zip(channels, map(float, values)))
+        for values in itertools.product(*(np.atleast_1d(weights[c]) for c in channels))
+    ]
+
+
+def actuated_output_channels(vehicle_model, input_matrix):
+    """
+    Return the output channels of a model with actuator forces as further inputs.
+
+    Args:
+        vehicle_model (VehicleModel): Linear vehicle model.
+        input_matrix (np.ndarray): State derivative per actuator force.
+
+    Returns:
+        dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]: Rows of C, D and of the
+            force feedthrough E per channel, ``y = C x + D r + E F``.
+    """
+    n_inputs = len(vehicle_model.input_delays())
+    channels = {}
+    for channel, (C, D) in vehicle_model.output_channels(input_matrix).items():
+        channels[channel] = (C, D[:n_inputs], D[n_inputs:])
+    return channels
+
+
+def solve_riccati_batch(A, B, Q, R, N=None):
+    """
+    Solve the continuous-time algebraic Riccati equation for a stack of weights.
+
+    Solves ``Aᵀ P + P A - (P B + N) R⁻¹ (Bᵀ P + Nᵀ) + Q = 0`` for every set of
+    weights from the stable invariant subspace of the Hamiltonian matrix, found
+    by one batched eigendecomposition.
+
+    Args:
+        A (np.ndarray): System matrix (n, n), shared by all sets.
+        B (np.ndarray): Input matrix (n, m), shared by all sets.
+        Q (np.ndarray): State weights (n_sets, n, n).
+        R (np.ndarray): Input weights (n_sets, m, m).
+        N (np.ndarray, optional): Cross weights (n_sets, n, m), zero if None.
+
+    Returns:
+        np.ndarray: Stabilizing solutions P (n_sets, n, n).
+    """
+    n = A.shape[0]
+    if N is None:
+        N = np.zeros(Q.shape[:2] + (B.shape[1],))
+    R_inv = np.linalg.inv(R)
+    N_T = np.swapaxes(N, -1, -2)
+    # eliminate the cross term
+    A_0 = A - B @ R_inv @ N_T
+    H = np.zeros((len(Q), 2 * n, 2 * n))
+    H[:, :n, :n] = A_0
+    H[:, :n, n:] = -B @ R_inv @ B.T
+    H[:, n:, :n] = N @ R_inv @ N_T - Q
+    H[:, n:, n:] = -np.swapaxes(A_0, -1, -2)
+
+    eigenvalues, V = np.linalg.eig(H)
+    stable = np.argsort(eigenvalues.real, axis=-1)[:, :n]
+    V = np.take_along_axis(V, stable[:, None, :], axis=-1)
+    # P = U2 U1⁻¹ with the stable subspace [U1; U2]
+    P = np.linalg.solve(
+        np.swapaxes(V[:, :n], -1, -2), np.swapaxes(V[:, n:], -1, -2)
+    ).real
+    return 0.5 * (P + np.swapaxes(P, -1, -2))
+
+
+def lqr_design(
+    vehicle_model,
+    road,
+    weights,
+    control_weight=1e-6,
+    actuators=("suspension_travel",),
+    channels=None,
+    normalize=True,
+    pade_order=6,
+):
+    """
+    Design LQR suspension gains and evaluate them on a random road.
+
+    The cost ``E[sum_i w_i y_i^2 + control_weight * |F|^2]`` of the weighted output
+    channels, including the actuator force feedthrough of acceleration channels,
+    gives the weighting matrices Q, R and the cross term N of the continuous-time
+    Riccati equation. The Riccati equations of all designs are solved at once (see
+    ``solve_riccati_batch``) and the closed-loop RMS values follow from one
+    batched covariance analysis.
+
+    Args:
+        vehicle_model (VehicleModel): Linear vehicle model.
+        road (ISO8608Road): Random road the designs are evaluated on.
+        weights (dict or list[dict]): Weight per output channel, or a grid of
+            weights (see ``weight_grid``).
+        control_weight (float): Weight of the squared actuator forces [1/N^2].
+        actuators (tuple[str]): Suspension travel channel of every actuator.
+        channels (list[str], optional): Channels evaluated in closed loop, the
+            weighted channels by default.
+        normalize (bool): Divide each channel by its passive RMS value, so the
+            weights express relative trade-offs.
+        pade_order (int): Order of the Padé approximation of road input delays.
+
+    Returns:
+        LQRDesign: Gains and closed-loop RMS values of every design.
+
+    Raises:
+        ValueError: If a channel or actuator is not provided by the model.
+    """
+    if isinstance(weights, dict):
+        weights = [weights]
+    weighted = list(dict.fromkeys(c for design in weights for c in design))
+    if channels is None:
+        channels = weighted
+    else:
+        channels = list(dict.fromkeys(list(channels) + weighted))
+
+    input_matrix = actuator_geometry([vehicle_model], list(actuators)).input_matrix[0]
+    outputs = actuated_output_channels(vehicle_model, input_matrix)
+    unsupported = [channel for channel in channels if channel not in outputs]
+    if unsupported:
+        raise ValueError(f"Unsupported output channels: {unsupported}")
+
+    passive = covariance_analysis(vehicle_model, road, channels, pade_order).rms
+    passive_rms = {channel: float(passive[channel][0]) for channel in channels}
+
+    A, _ = vehicle_model.state_space()
+    C = np.array([outputs[channel][0] for channel in weighted])
+    E = np.array([outputs[channel][2] for channel in weighted])
+    scale = np.array([1 / passive_rms[c] ** 2 if normalize else 1.0 for c in weighted])
+    n_actuators = input_matrix.shape[1]
+
+    w = scale * np.array([[design.get(c, 0.0) for c in weighted] for design in weights])
+    Q = np.einsum("ki,dk,kj->dij", C, w, C)
+    N = np.einsum("ki,dk,kj->dij", C, w, E)
+    R = np.einsum("ki,dk,kj->dij", E, w, E) + control_weight * np.eye(n_actuators)
+    P = solve_riccati_batch(A, input_matrix, Q, R, N)
+    gains = np.linalg.solve(R, input_matrix.T @ P + np.swapaxes(N, -1, -2))
+
+    # closed loop on the road augmented system
+    A_aug, G, C_aug = road_augmented_system(vehicle_model, road, channels, pade_order)
+    n = A.shape[0]
+    feedback = np.zeros((len(weights), n_actuators, A_aug.shape[0]))
+    feedback[:, :, :n] = -gains
+    B_aug = np.zeros((A_aug.shape[0], n_actuators))
+    B_aug[:n] = input_matrix
+    A_cl = A_aug + B_aug @ feedback
+    E_all = np.array([outputs[channel][2] for channel in channels])
+    C_cl = C_aug + E_all @ feedback
+
+    P = solve_lyapunov_batch(A_cl, np.broadcast_to(np.outer(G, G), A_cl.shape))
+    variances = np.einsum("dij,djk,dik->di", C_cl, P, C_cl)
+    force_variances = np.einsum("dij,djk,dik->di", feedback, P, feedback)
+
+    return LQRDesign(
+        model_type=type(vehicle_model).__name__,
+        actuators=list(actuators),
+        weights=weights,
+        control_weight=control_weight,
+        gains=gains,
+        rms={
+            channel: np.sqrt(np.maximum(variances[:, i], 0.0))
+            for i, channel in enumerate(channels)
+        },
+        force_rms=np.sqrt(np.maximum(force_variances, 0.0)),
+        passive_rms=passive_rms,
+    )
@@ -0,0 +1,193 @@
+import numpy as np
+from dataclasses import dataclass, field
+from math import factorial
+from scipy import signal
+
+
+@dataclass
+class CovarianceResult:
+    """
+    Steady-state response statistics of vehicle models driven by a random road.
+
+    Every entry of ``rms`` holds one value per analysed parameter set.
+    """
+
+    model_type: str
+    channels: list
+    rms: dict = field(default_factory=dict)  # RMS value per output channel
+    covariance: np.ndarray = None  # Augmented state covariance (n_sets, n, n)
+
+
+def pade_delay(delay, order):
+    """
+    Return a state-space realization of the Padé approximation of exp(-s delay).
+
+    Args:
+        delay (float): Time delay [s].
+        order (int): Order of the numerator and denominator polynomials.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: A, B, C and D.
+    """
+    k = np.arange(order + 1)
+    coefficients = np.array(
+        [
+            factorial(2 * order - i)
+            * factorial(order)
+            / (factorial(2 * order) * factorial(i) * factorial(order - i))
+            for i in k
+        ]
+    )
+    numerator = coefficients * (-delay) ** k
+    denominator = coefficients * delay**k
+    return signal.tf2ss(numerator[::-1], denominator[::-1])
+
+
+def road_augmented_system(vehicle_model, road, channels=None, pade_order=6):
+    """
+    Augment a linear vehicle model with the shaping filter of a random road.
+
+    The augmented state is ``[x, z_r, x_delay...]``, where the road displacement
+    z_r is driven by unit white noise and delayed road inputs are realized with
+    Padé approximations.
+
+    Args:
+        vehicle_model (VehicleModel): Linear vehicle model.
+        road (ISO8608Road): Random road model.
+        channels (list[str], optional): Output channels, all channels by default.
+        pade_order (int): Order of the Padé approximation of road input delays.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Augmented system matrix, white
+            noise input vector and output matrix (one row per channel).
+
+    Raises:
+        ValueError: If a requested output channel is not provided by the model.
+    """
+    A, B = vehicle_model.state_space()
+    delays = vehicle_model.input_delays()
+    outputs = vehicle_model.output_channels()
+    alpha, q = road.shaping_filter()
+
+    if channels is None:
+        channels = list(outputs)
+    unsupported = [channel for channel in channels if channel not in outputs]
+    if unsupported:
+        raise ValueError(f"Unsupported output channels: {unsupported}")
+
+    n = A.shape[0]
+    delay_blocks = [
+        pade_delay(delay, pade_order) if delay > 0 else None for delay in delays
+    ]
+    n_aug = n + 1 + sum(block[0].shape[0] for block in delay_blocks if block)
+
+    A_aug = np.zeros((n_aug, n_aug))
+    A_aug[:n, :n] = A
+    A_aug[n, n] = -alpha
+
+    # every road input as a row vector acting on the augmented state
+    inputs = np.zeros((len(delays), n_aug))
+    start = n + 1
+    for j, block in enumerate(delay_blocks):
+        if block is None:
+            inputs[j, n] = 1.0
+            continue
+        Ap, Bp, Cp, Dp = block
+        stop = start + Ap.shape[0]
+        A_aug[start:stop, start:stop] = Ap
+        A_aug[start:stop, n] = Bp[:, 0]
+        inputs[j, start:stop] = Cp[0]
+        inputs[j, n] = Dp[0, 0]
+        start = stop
+
+    A_aug[:n] += B @ inputs
+
+    G = np.zeros(n_aug)
+    G[n] = q
+
+    C_aug = np.zeros((len(channels), n_aug))
+    for i, channel in enumerate(channels):
+        C, D = outputs[channel]
+        C_aug[i, :n] = C
+        C_aug[i] += D @ inputs
+    return A_aug, G, C_aug
+
+
+def solve_lyapunov_batch(A, Q):
+    """
+    Solve A P + P Aᵀ + Q = 0 for a stack of stable systems.
+
+    The equations are diagonalized with the eigenvectors of A, so every system
+    costs a few small dense operations and the whole stack runs vectorized.
+
+    Args:
+        A (np.ndarray): Stable system matrices (n_sets, n, n).
+        Q (np.ndarray): Symmetric right hand sides (n_sets, n, n).
+
+    Returns:
+        np.ndarray: Solutions P (n_sets, n, n).
+    """
+    eigenvalues, V = np.linalg.eig(A)
+    V_inv = np.linalg.inv(V)
+    Q_modal = V_inv @ Q @ np.conj(np.swapaxes(V_inv, -1, -2))
+    P_modal = -Q_modal / (eigenvalues[:, :, None] + np.conj(eigenvalues[:, None, :]))
+    P = V @ P_modal @ np.conj(np.swapaxes(V, -1, -2))
+    return np.real(P)
+
+
+def covariance_analysis(vehicle_models, road, channels=None, pade_order=6):
+    """
+    Compute steady-state RMS responses to a random road without time integration.
+
+    Every vehicle model is augmented with the road shaping filter and the
+    stationary covariance follows from the Lyapunov equation
+    A P + P Aᵀ + G Gᵀ = 0, solved for all parameter sets at once.
+
+    Args:
+        vehicle_models (VehicleModel or list[VehicleModel]): Linear models of the
+            same type, one per parameter set.
+        road (ISO8608Road or list[ISO8608Road]): Random road, or one per model.
+        channels (list[str], optional): Output channels, all channels by default.
+        pade_order (int): Order of the Padé approximation of road input delays.
+
+    Returns:
+        CovarianceResult: RMS value of every channel for every parameter set.
+
+    Raises:
+        ValueError: If the models are of different types or the roads do not
+            match the number of models.
+    """
+    if not isinstance(vehicle_models, (list, tuple)):
+        vehicle_models = [vehicle_models]
+    if not isinstance(road, (list, tuple)):
+        road = [road] * len(vehicle_models)
+    if len(road) != len(vehicle_models):
+        raise ValueError("Expected one road per vehicle model")
+
+    model_types = {type(model).__name__ for model in vehicle_models}
+    if len(model_types) != 1:
+        raise ValueError("All vehicle models must have the same type")
+
+    if channels is None:
+        channels = list(vehicle_models[0].output_channels())
+
+    systems = [
+        road_augmented_system(model, model_road, channels, pade_order)
+        for model, model_road in zip(vehicle_models, road)
+    ]
+    A = np.stack([system[0] for system in systems])
+    G = np.stack([system[1] for system in systems])
+    C = np.stack([system[2] for system in systems])
+
+    P = solve_lyapunov_batch(A, G[:, :, None] * G[:, None, :])
+    variances = np.einsum("sij,sjk,sik->si", C, P, C)
+
+    return CovarianceResult(
+        model_type=model_types.pop(),
+        channels=list(channels),
+        rms={
+            channel: np.sqrt(np.maximum(variances[:, i], 0.0))
+            for i, channel in enumerate(channels)
+        },
+        covariance=P,
+    )
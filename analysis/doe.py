@@ -0,0 +1,236 @@
+import json
+import numpy as np
+from dataclasses import dataclass, field
+from itertools import combinations_with_replacement
+from scipy.stats import qmc
+from .evaluation import build_models, evaluate_rms
+
+
+def sample_parameter_space(bounds, n_samples, method="latin_hypercube", seed=None):
+    """
+    Sample a bounded parameter space with a space filling design.
+
+    Args:
+        bounds (dict[str, tuple[float, float]]): Lower and upper bound per field.
+        n_samples (int): Number of samples.
+        method (str): "latin_hypercube" or "sobol".
+        seed (int, optional): Seed of the sampler.
+
+    Returns:
+        np.ndarray: Parameter values (n_samples, n_fields) in the order of bounds.
+
+    Raises:
+        ValueError: If the sampling method is unsupported.
+    """
+    if method == "latin_hypercube":
+        sampler = qmc.LatinHypercube(d=len(bounds), seed=seed)
+    elif method == "sobol":
+        sampler = qmc.Sobol(d=len(bounds), scramble=True, seed=seed)
+    else:
+        raise ValueError(f"Unsupported sampling method: {method}")
+
+    lower = [bound[0] for bound in bounds.values()]
+    upper = [bound[1] for bound in bounds.values()]
+    return qmc.scale(sampler.random(n_samples), lower, upper)
+
+
+@dataclass
+class DesignOfExperiments:
+    """Sampled parameter sets of a vehicle model and their RMS metrics."""
+
+    model_type: str
+    bounds: dict  # Lower and upper bound per varied field
+    samples: np.ndarray  # Parameter values (n_samples, n_fields)
+    metrics: dict = field(default_factory=dict)  # RMS value per sample and channel
+
+    def fit_surrogate(self, degree=2, regularization=1e-8):
+        """
+        Fit a polynomial surrogate model to the sampled metrics.
+
+        Args:
+            degree (int): Total degree of the polynomial.
+            regularization (float): Ridge regularization of the least squares fit.
+
+        Returns:
+            PolynomialSurrogate: The fitted surrogate.
+        """
+        surrogate = PolynomialSurrogate(self.model_type, self.bounds, degree)
+        surrogate.fit(self.samples, self.metrics, regularization)
+        return surrogate
+
+
+def run_design(
+    model_class,
+    base_params,
+    bounds,
+    road,
+    channels,
+    n_samples,
+    method="latin_hypercube",
+    seed=None,
+    initial_conditions=None,
+    t_eval=None,
+    workers=None,
+):
+    """
+    Sample a parameter space and evaluate RMS metrics for every sample.
+
+    The samples run through the batched evaluation path: vectorized covariance
+    analysis on random roads, or worker processes for deterministic profiles.
+
+    Args:
+        model_class (type): Vehicle model class, e.g. SeatAddedQuarterCarModel.
+        base_params (dataclass): Parameters of the fields that are not varied.
+        bounds (dict[str, tuple[float, float]]): Lower and upper bound per field.
+        road (ISO8608Road or RoadProfile): Road excitation.
+        channels (list[str]): Output channels whose RMS values are evaluated.
+        n_samples (int): Number of samples.
+        method (str): "latin_hypercube" or "sobol".
+        seed (int, optional): Seed of the sampler.
+        initial_conditions (dataclass, optional): Initial conditions of the model.
+        t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+        workers (int, optional): Worker processes for time simulations.
+
+    Returns:
+        DesignOfExperiments: The samples and their metrics.
+    """
+    samples = sample_parameter_space(bounds, n_samples, method, seed)
+    models = build_models(
+        model_class, base_params, list(bounds), samples, initial_conditions
+    )
+    return DesignOfExperiments(
+        model_type=model_class.__name__,
+        bounds=dict(bounds),
+        samples=samples,
+        metrics=evaluate_rms(models, road, channels, t_eval, workers),
+    )
+
+
+class PolynomialSurrogate:
+    """
+    Polynomial regression of metrics over a bounded parameter space.
+
+    Predictions come with a standard error from the residual variance and the
+    leverage of the evaluated point, so they can be shown with error bars.
+    """
+
+    def __init__(self, model_type, bounds, degree=2):
+        """
+        Initialize the PolynomialSurrogate for a parameter space.
+
+        Args:
+            model_type (str): Name of the vehicle model class.
+            bounds (dict[str, tuple[float, float]]): Lower and upper bound per field.
+            degree (int): Total degree of the polynomial.
+        """
+        self.model_type = model_type
+        self.bounds = {name: tuple(bound) for name, bound in bounds.items()}
+        self.degree = degree
+        self.names = list(bounds)
+        self.lower = np.array([bound[0] for bound in self.bounds.values()])
+        self.upper = np.array([bound[1] for bound in self.bounds.values()])
+
+        # exponent of every parameter in every polynomial term
+        terms = [()]
+        for order in range(1, degree + 1):
+            terms += combinations_with_replacement(range(len(self.names)), order)
+        self.powers = np.array(
+            [np.bincount(term, minlength=len(self.names)) for term in terms]
+        )
+        self.coefficients = {}
+        self.residual_variance = {}
+        self.covariance = None
+
+    def _features(self, values):
+        scaled = (
+            2 * (np.atleast_2d(values) - self.lower) / (self.upper - self.lower) - 1
+        )
+        return np.prod(scaled[:, None, :] ** self.powers[None, :, :], axis=2)
+
+    def fit(self, samples, metrics, regularization=1e-8):
+        """
+        Fit the polynomial coefficients of every metric by least squares.
+
+        Args:
+            samples (np.ndarray): Parameter values (n_samples, n_fields).
+            metrics (dict[str, np.ndarray]): Metric value per sample.
+            regularization (float): Ridge regularization of the least squares fit.
+        """
+        X = self._features(samples)
+        gram = X.T @ X + regularization * np.eye(X.shape[1])
+        self.covariance = np.linalg.inv(gram)
+        dof = max(X.shape[0] - X.shape[1], 1)
+        for name, values in metrics.items():
+            coefficients = self.covariance @ X.T @ values
+            self.coefficients[name] = coefficients
+            self.residual_variance[name] = float(
+                np.sum((X @ coefficients - values) ** 2) / dof
+            )
+
+    def predict(self, params):
+        """
+        Predict the metrics and their standard errors for parameter values.
+
+        Args:
+            params (dict[str, float] or np.ndarray): Values of the surrogate's fields,
+                as a dictionary or an array (n_points, n_fields).
+
+        Returns:
+            tuple[dict, dict]: Predicted value and standard error per metric.
+        """
+        if isinstance(params, dict):
+            params = [params[name] for name in self.names]
+        X = self._features(np.asarray(params, dtype=float))
+        leverage = np.einsum("ij,jk,ik->i", X, self.covariance, X)
+
+        prediction, error = {}, {}
+        for name, coefficients in self.coefficients.items():
+            prediction[name] = X @ coefficients
+            error[name] = np.sqrt(self.residual_variance[name] * (1 + leverage))
+        return prediction, error
+
+    def save(self, filename):
+        """
+        Save the surrogate to a JSON file.
+
+        Args:
+            filename (str): The filename to save the surrogate to.
+        """
+        with open(filename, "w") as f:
+            json.dump(
+                {
+                    "model_type": self.model_type,
+                    "bounds": self.bounds,
+                    "degree": self.degree,
+                    "coefficients": {
+                        name: values.tolist()
+                        for name, values in self.coefficients.items()
+                    },
+                    "residual_variance": self.residual_variance,
+                    "covariance": self.covariance.tolist(),
+                },
+                f,
+                indent=2,
+            )
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a surrogate from a JSON file.
+
+        Args:
+            filename (str): The filename to load the surrogate from.
+
+        Returns:
+            PolynomialSurrogate: The loaded surrogate.
+        """
+        with open(filename, "r") as f:
+            data = json.load(f)
+
+        surrogate = cls(data["model_type"], data["bounds"], data["degree"])
+        surrogate.coefficients = {
+            name: np.array(values) for name, values in data["coefficients"].items()
+        }
+        surrogate.residual_variance = data["residual_variance"]
+        surrogate.covariance = np.array(data["covariance"])
+        return surrogate
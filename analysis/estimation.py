@@ -0,0 +1,235 @@
+from collections import OrderedDict
+import numpy as np
+from scipy.linalg import expm, solve_discrete_are
+from .covariance import road_augmented_system
+
+
+class KalmanEstimator:
+    """
+    Streaming state estimator for a batch of linear vehicle models.
+
+    The process model is the vehicle model augmented with the shaping filter of a
+    random road (and Padé states of delayed road inputs), discretized exactly for
+    the sensor sampling time. With constant noise settings the Kalman gain
+    converges to the solution of a discrete Riccati equation, which is computed
+    once and cached, so filtering costs a few batched matrix products per sample.
+    Streams are processed chunk by chunk and only the current state is kept.
+    """
+
+    #: Number of cached filters, the least recently used are dropped first.
+    max_cached_filters = 128
+
+    #: Steady-state filter matrices shared by all estimators.
+    _gain_cache = OrderedDict()
+
+    def __init__(
+        self,
+        vehicle_models,
+        road,
+        sensors,
+        sensor_noise,
+        dt,
+        outputs=None,
+        pade_order=6,
+    ):
+        """
+        Initialize the KalmanEstimator.
+
+        Args:
+            vehicle_models (VehicleModel or list[VehicleModel]): Linear models of the
+                same type, one per vehicle.
+            road (ISO8608Road): Random road model of the process noise.
+            sensors (list[str]): Measured output channels, e.g. ``["body_acc"]``.
+            sensor_noise (float or list[float]): Noise standard deviation of every
+                sensor in the channel's unit.
+            dt (float): Sampling time of the sensors [s].
+            outputs (list[str], optional): Estimated channels, all model channels
+                and the road displacement ``"road"`` by default.
+            pade_order (int): Order of the Padé approximation of road input delays.
+
+        Raises:
+            ValueError: If the models are of different types or a channel is not
+                provided by the model.
+        """
+        if not isinstance(vehicle_models, (list, tuple)):
+            vehicle_models = [vehicle_models]
+        if len({type(model).__name__ for model in vehicle_models}) != 1:
+            raise ValueError("All vehicle models must have the same type")
+        self.vehicle_models = list(vehicle_models)
+        self.sensors = list(sensors)
+        self.sensor_noise = np.broadcast_to(
+            np.asarray(sensor_noise, dtype=float), (len(self.sensors),)
+        ).copy()
+        self.dt = dt
+
+        model_outputs = vehicle_models[0].output_channels()
+        if outputs is None:
+            outputs = list(model_outputs) + ["road"]
+        self.outputs = list(outputs)
+
+        matrices = [
+            self._filter_matrices(model, road, pade_order) for model in vehicle_models
+        ]
+        self.Ad, self.C, self.K, self.J, self.C_out = (
+            np.stack(items) for items in zip(*matrices)
+        )
+        identity = np.eye(self.Ad.shape[1])
+        self.F = np.matmul(identity - np.matmul(self.K, self.C), self.Ad)
+        self.reset()
+
+    def _cache_key(self, vehicle_model, road, pade_order):
+        return (
+            type(vehicle_model).__name__,
+            tuple(sorted(vehicle_model.params.items())),
+            repr(road),
+            self.dt,
+            tuple(self.sensors),
+            tuple(self.sensor_noise),
+            tuple(self.outputs),
+            pade_order,
+        )
+
+    def _filter_matrices(self, vehicle_model, road, pade_order):
+        """Return Ad, C, K, J and the output rows of one vehicle model."""
+        key = self._cache_key(vehicle_model, road, pade_order)
+        if key in self._gain_cache:
+            self._gain_cache.move_to_end(key)
+            return self._gain_cache[key]
+
+        channels = [channel for channel in self.outputs if channel != "road"]
+        A, G, C_all = road_augmented_system(
+            vehicle_model, road, self.sensors + channels, pade_order
+        )
+        n = A.shape[0]
+        n_vehicle = len(vehicle_model.initial_conditions)
+        C = C_all[: len(self.sensors)]
+        rows = dict(zip(channels, C_all[len(self.sensors) :]))
+        road_row = np.zeros(n)
+        road_row[n_vehicle] = 1.0
+        rows["road"] = road_row
+        C_out = np.array([rows[channel] for channel in self.outputs])
+
+        # Van Loan's method for the discrete process noise covariance
+        van_loan = np.zeros((2 * n, 2 * n))
+        van_loan[:n, :n] = -A
+        van_loan[:n, n:] = np.outer(G, G)
+        van_loan[n:, n:] = A.T
+        F = expm(van_loan * self.dt)
+        Ad = F[n:, n:].T
+        Qd = Ad @ F[:n, n:]
+        Qd = (Qd + Qd.T) / 2
+        R = np.diag(self.sensor_noise**2)
+
+        P_predicted = solve_discrete_are(Ad.T, C.T, Qd, R)
+        K = P_predicted @ C.T @ np.linalg.inv(C @ P_predicted @ C.T + R)
+        P_filtered = P_predicted - K @ C @ P_predicted
+        J = P_filtered @ Ad.T @ np.linalg.pinv(P_predicted)
+
+        self._gain_cache[key] = (Ad, C, K, J, C_out)
+        while len(self._gain_cache) > self.max_cached_filters:
+            self._gain_cache.popitem(last=False)
+        return self._gain_cache[key]
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached steady-state filter matrices."""
+        cls._gain_cache.clear()
+
+    def reset(self):
+        """Restart the estimate from the zero state."""
+        self.state = np.zeros(self.Ad.shape[:2])
+
+    def _measurements(self, y):
+        """Return measurements as (n_vehicles, n_sensors, n_samples)."""
+        y = np.asarray(y, dtype=float)
+        if y.ndim == 2:
+            y = np.broadcast_to(y, (len(self.vehicle_models),) + y.shape)
+        if y.shape[:2] != (len(self.vehicle_models), len(self.sensors)):
+            raise ValueError(
+                "Measurements must have the shape (n_vehicles, n_sensors, n_samples)"
+            )
+        return y
+
+    def filter_states(self, y):
+        """
+        Filter one chunk of measurements and return the filtered states.
+
+        Args:
+            y (np.ndarray): Measurements (n_vehicles, n_sensors, n_samples), or
+                (n_sensors, n_samples) for a single vehicle.
+
+        Returns:
+            np.ndarray: Filtered augmented states (n_vehicles, n_states, n_samples).
+        """
+        # x[k] = (I - K C) Ad x[k-1] + K y[k] with the gain term computed at once
+        states = np.matmul(self.K, self._measurements(y))
+        x = self.state
+        for k in range(states.shape[2]):
+            x = np.matmul(self.F, x[:, :, None])[:, :, 0] + states[:, :, k]
+            states[:, :, k] = x
+        self.state = x
+        return states
+
+    def _estimates(self, states):
+        estimates = np.matmul(self.C_out, states)
+        return {channel: estimates[:, i] for i, channel in enumerate(self.outputs)}
+
+    def filter(self, y):
+        """
+        Filter one chunk of measurements.
+
+        Args:
+            y (np.ndarray): Measurements (n_vehicles, n_sensors, n_samples), or
+                (n_sensors, n_samples) for a single vehicle.
+
+        Returns:
+            dict[str, np.ndarray]: Estimate of every output (n_vehicles, n_samples).
+        """
+        return self._estimates(self.filter_states(y))
+
+    def iter_filter(self, chunks):
+        """
+        Filter a stream of measurement chunks.
+
+        Args:
+            chunks (Iterable[np.ndarray]): Measurement chunks.
+
+        Yields:
+            dict[str, np.ndarray]: Estimates of every chunk.
+        """
+        for chunk in chunks:
+            yield self.filter(chunk)
+
+    def _smooth(self, filtered):
+        """Run the steady-state RTS recursion backwards over filtered states."""
+        # s[k] = (I - J Ad) f[k] + J s[k+1]
+        smoothed = filtered - np.matmul(np.matmul(self.J, self.Ad), filtered)
+        smoothed[:, :, -1] = filtered[:, :, -1]
+        for k in range(filtered.shape[2] - 2, -1, -1):
+            smoothed[:, :, k] += np.matmul(self.J, smoothed[:, :, k + 1, None])[:, :, 0]
+        return smoothed
+
+    def iter_smooth(self, chunks, lag=500):
+        """
+        Smooth a stream of measurement chunks with a fixed-lag RTS smoother.
+
+        Every sample is emitted once ``lag`` later samples have been filtered, so
+        memory stays bounded by the chunk size plus the lag. The last samples of
+        the stream are smoothed exactly.
+
+        Args:
+            chunks (Iterable[np.ndarray]): Measurement chunks.
+            lag (int): Number of later samples used to smooth each sample.
+
+        Yields:
+            dict[str, np.ndarray]: Smoothed estimates, in stream order.
+        """
+        pending = np.zeros(self.Ad.shape[:2] + (0,))
+        for chunk in chunks:
+            pending = np.concatenate([pending, self.filter_states(chunk)], axis=2)
+            ready = pending.shape[2] - lag
+            if ready > 0:
+                yield self._estimates(self._smooth(pending)[:, :, :ready])
+                pending = pending[:, :, ready:]
+        if pending.shape[2]:
+            yield self._estimates(self._smooth(pending))
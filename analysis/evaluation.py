@@ -0,0 +1,127 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from road.spectral import ISO8608Road
+from simulation.integration import integrate
+from .covariance import covariance_analysis
+
+
+def build_models(model_class, base_params, names, values, initial_conditions=None):
+    """
+    Build one vehicle model per row of parameter values.
+
+    Args:
+        model_class (type): Vehicle model class, e.g. HalfCarModel.
+        base_params (dataclass): Parameters of the unchanged fields.
+        names (list[str]): Names of the varied parameter fields.
+        values (np.ndarray): Parameter values (n_sets, n_names).
+        initial_conditions (dataclass, optional): Initial conditions of every model,
+            the model's defaults if None.
+
+    Returns:
+        list[VehicleModel]: The vehicle models.
+    """
+    models = []
+    for row in np.atleast_2d(values):
+        params = replace(
+            base_params, **{name: float(value) for name, value in zip(names, row)}
+        )
+        if initial_conditions is None:
+            models.append(model_class(params))
+        else:
+            models.append(model_class(params, initial_conditions))
+    return models
+
+
+def channel_trajectories(vehicle_model, t, y, road_input, channels=None):
+    """
+    Compute linear output channels from simulated state trajectories.
+
+    Args:
+        vehicle_model (VehicleModel): Linear vehicle model.
+        t (np.ndarray): Time points [s].
+        y (np.ndarray): State trajectories (n_states, n_time).
+        road_input (callable): Road displacement as a function of time.
+        channels (list[str], optional): Output channels, all channels by default.
+
+    Returns:
+        dict[str, np.ndarray]: Trajectory of every channel.
+    """
+    outputs = vehicle_model.output_channels()
+    if channels is None:
+        channels = list(outputs)
+    road = np.array(
+        [road_input(np.maximum(0, t - delay)) for delay in vehicle_model.input_delays()]
+    )
+    return {
+        channel: outputs[channel][0] @ y + outputs[channel][1] @ road
+        for channel in channels
+    }
+
+
+def _simulated_rms(vehicle_model, road_profile, t_eval, channels):
+    """Return the RMS of every channel from a time integration of one model."""
+    results = integrate(
+        vehicle_model,
+        road_profile.get_profile,
+        vehicle_model.initial_conditions,
+        (t_eval[0], t_eval[-1]),
+        t_eval,
+    )
+    trajectories = channel_trajectories(
+        vehicle_model, results.t, results.y, road_profile.get_profile, channels
+    )
+    return [np.sqrt(np.mean(trajectories[channel] ** 2)) for channel in channels]
+
+
+def evaluate_rms(
+    vehicle_models, road, channels, t_eval=None, workers=None, executor=None
+):
+    """
+    Return RMS output channels of many vehicle models on one road.
+
+    Random roads use the vectorized covariance analysis. Deterministic road
+    profiles are integrated in time, in a process pool when workers are given.
+
+    Args:
+        vehicle_models (list[VehicleModel]): Linear vehicle models of one type.
+        road (ISO8608Road or RoadProfile): Road excitation, or a list with one road
+            per model.
+        channels (list[str]): Output channels.
+        t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+        workers (int, optional): Number of worker processes for time integration.
+        executor (concurrent.futures.Executor, optional): Executor of the time
+            integrations, e.g. a process pool kept across calls. A pool of
+            ``workers`` processes is started for this call if None.
+
+    Returns:
+        dict[str, np.ndarray]: RMS value per model for every channel.
+
+    Raises:
+        ValueError: If a deterministic road profile is given without time points.
+    """
+    roads = road if isinstance(road, (list, tuple)) else [road] * len(vehicle_models)
+    if all(isinstance(item, ISO8608Road) for item in roads):
+        return covariance_analysis(vehicle_models, roads, channels).rms
+
+    if t_eval is None:
+        raise ValueError("t_eval is required for deterministic road profiles")
+
+    arguments = (
+        vehicle_models,
+        roads,
+        [t_eval] * len(vehicle_models),
+        [channels] * len(vehicle_models),
+    )
+    if executor is not None:
+        chunksize = max(1, len(vehicle_models) // (4 * (workers or 1)))
+        rms = list(executor.map(_simulated_rms, *arguments, chunksize=chunksize))
+    elif workers and workers > 1:
+        chunksize = max(1, len(vehicle_models) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rms = list(executor.map(_simulated_rms, *arguments, chunksize=chunksize))
+    else:
+        rms = list(map(_simulated_rms, *arguments))
+
+    rms = np.array(rms).reshape(len(vehicle_models), len(channels))
+    return {channel: rms[:, i] for i, channel in enumerate(channels)}
@@ -0,0 +1,108 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FrequencyResponse:
+    """
+    Frequency response of a vehicle model from the road input to its output channels.
+
+    The responses hold the complex transfer function H(jω) of every requested
+    channel, including the wheelbase delay of models with more than one road input.
+    """
+
+    model_type: str
+    frequencies: np.ndarray  # Frequencies [Hz]
+    responses: dict = field(default_factory=dict)  # Complex H(jω) per channel
+
+    def magnitude(self, channel):
+        """
+        Return the magnitude of a channel's transfer function.
+
+        Args:
+            channel (str): Name of the output channel.
+
+        Returns:
+            np.ndarray: |H(jω)| at every frequency.
+        """
+        return np.abs(self.responses[channel])
+
+    def phase(self, channel, degrees=True):
+        """
+        Return the unwrapped phase of a channel's transfer function.
+
+        Args:
+            channel (str): Name of the output channel.
+            degrees (bool): Return degrees instead of radians.
+
+        Returns:
+            np.ndarray: Phase of H(jω) at every frequency.
+        """
+        phase = np.unwrap(np.angle(self.responses[channel]))
+        return np.degrees(phase) if degrees else phase
+
+    def to_dict(self):
+        """
+        Convert the frequency response to a JSON serializable dictionary.
+
+        Returns:
+            dict: Frequencies with magnitude and phase of every channel.
+        """
+        return {
+            "model_type": self.model_type,
+            "frequencies": self.frequencies.tolist(),
+            "responses": {
+                channel: {
+                    "magnitude": self.magnitude(channel).tolist(),
+                    "phase": self.phase(channel).tolist(),
+                }
+                for channel in self.responses
+            },
+        }
+
+
+def frequency_response(vehicle_model, frequencies, channels=None):
+    """
+    Evaluate H(jω) = C (jωI - A)⁻¹ B + D of a linear vehicle model.
+
+    All frequencies are solved at once with a batched linear solve. Road inputs
+    with a delay (the rear tire of the half car) are weighted with exp(-jωτ), so
+    the response is the one to a single road profile driven over by all tires.
+
+    Args:
+        vehicle_model (VehicleModel): Linear vehicle model.
+        frequencies (np.ndarray): Frequencies [Hz] to evaluate.
+        channels (list[str], optional): Output channels, all channels by default.
+
+    Returns:
+        FrequencyResponse: Complex transfer functions of the requested channels.
+
+    Raises:
+        ValueError: If a requested output channel is not provided by the model.
+    """
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    A, B = vehicle_model.state_space()
+    delays = vehicle_model.input_delays()
+    outputs = vehicle_model.output_channels()
+
+    if channels is None:
+        channels = list(outputs)
+    unsupported = [channel for channel in channels if channel not in outputs]
+    if unsupported:
+        raise ValueError(f"Unsupported output channels: {unsupported}")
+
+    C = np.array([outputs[channel][0] for channel in channels])
+    D = np.array([outputs[channel][1] for channel in channels])
+
+    s = 2j * np.pi * frequencies
+    road_terms = np.exp(-s[:, None] * delays[None, :])  # (n_freq, n_inputs)
+
+    system = s[:, None, None] * np.eye(A.shape[0]) - A
+    x = np.linalg.solve(system, (road_terms @ B.T)[..., None])[..., 0]
+    H = x @ C.T + road_terms @ D.T  # (n_freq, n_channels)
+
+    return FrequencyResponse(
+        model_type=type(vehicle_model).__name__,
+        frequencies=frequencies,
+        responses={channel: H[:, i] for i, channel in enumerate(channels)},
+    )
@@ -0,0 +1,240 @@
+import numpy as np
+from dataclasses import dataclass, field, replace
+from scipy import stats
+from scipy.optimize import least_squares
+from simulation.convolution import ConvolutionEngine
+
+
+@dataclass
+class Measurement:
+    """Measured response time series of a test drive over a known road."""
+
+    t: np.ndarray  # Equally spaced sample times [s]
+    channels: dict  # Measured signal per output channel, e.g. {"body_acc": ...}
+    road: np.ndarray  # Road displacement at the sample times [m]
+
+    def __post_init__(self):
+        self.t = np.asarray(self.t, dtype=float)
+        self.road = np.broadcast_to(np.asarray(self.road, dtype=float), self.t.shape)
+        self.channels = {
+            channel: np.asarray(values, dtype=float)
+            for channel, values in self.channels.items()
+        }
+        steps = np.diff(self.t)
+        if len(steps) == 0 or not np.allclose(steps, steps[0], rtol=1e-6, atol=0):
+            raise ValueError("Measurements must be sampled at equally spaced times")
+
+    @property
+    def dt(self):
+        """Sampling time [s]."""
+        return self.t[1] - self.t[0]
+
+    @classmethod
+    def from_file(cls, filename, road=None, time_column="t", road_column="road"):
+        """
+        Load a measurement from a CSV file with a header row or a NumPy .npz file.
+
+        Args:
+            filename (str): Path of the measurement file.
+            road (RoadProfile, optional): Known road profile, sampled at the
+                measurement times. Read from ``road_column`` if None.
+            time_column (str): Name of the time column.
+            road_column (str): Name of the road displacement column.
+
+        Returns:
+            Measurement: The loaded measurement. Every other column is a channel.
+
+        Raises:
+            ValueError: If the file lacks the time or road column.
+        """
+        if str(filename).endswith(".npz"):
+            with np.load(filename) as data:
+                columns = {name: data[name] for name in data.files}
+        else:
+            data = np.genfromtxt(filename, delimiter=",", names=True)
+            columns = {name: data[name] for name in data.dtype.names}
+
+        if time_column not in columns:
+            raise ValueError(f"Missing time column: {time_column}")
+        t = columns.pop(time_column)
+        if road is not None:
+            road_input = road.get_profile(t)
+            columns.pop(road_column, None)
+        elif road_column in columns:
+            road_input = columns.pop(road_column)
+        else:
+            raise ValueError(f"Missing road column: {road_column}")
+        return cls(t=t, channels=columns, road=road_input)
+
+
+@dataclass
+class IdentificationResult:
+    """Fitted parameters with their uncertainty and the remaining fit residuals."""
+
+    model_type: str
+    params: object  # Fitted parameter dataclass
+    values: dict = field(default_factory=dict)  # Fitted value per parameter
+    standard_errors: dict = field(default_factory=dict)  # Standard error per parameter
+    confidence_intervals: dict = field(default_factory=dict)  # (lower, upper)
+    correlation: np.ndarray = None  # Correlation matrix of the fitted parameters
+    residuals: dict = field(default_factory=dict)  # Model minus measurement
+    residual_rms: dict = field(default_factory=dict)  # RMS residual per channel
+    n_evaluations: int = 0  # Number of model responses computed
+
+
+class _ResponseModel:
+    """Responses of parameter variants for one measurement, computed in batches."""
+
+    def __init__(self, model_class, base_params, names, measurement, channels, scale):
+        self.model_class = model_class
+        self.base_params = base_params
+        self.names = names
+        self.measurement = measurement
+        self.channels = channels
+        self.scale = scale
+        self.n_evaluations = 0
+        self._engine_settings = dict(dt=measurement.dt, channels=channels)
+        fft_size = 2 ** int(np.ceil(np.log2(2 * len(measurement.t))))
+        self._engine_settings["fft_size"] = max(fft_size, 2**15)
+        self._road = ConvolutionEngine(**self._engine_settings).transform_road(
+            measurement.road
+        )
+        self._last = None
+
+    def responses(self, thetas):
+        """Return the scaled residual vector of every log-parameter row."""
+        models = [
+            self.model_class(
+                replace(
+                    self.base_params,
+                    **{name: float(v) for name, v in zip(self.names, np.exp(theta))},
+                )
+            )
+            for theta in thetas
+        ]
+        # a fresh engine per batch keeps the impulse response cache small
+        engine = ConvolutionEngine(**self._engine_settings)
+        self.n_evaluations += len(models)
+        return np.array(
+            [
+                np.concatenate(
+                    [
+                        (output[channel] - self.measurement.channels[channel])
+                        / self.scale[channel]
+                        for channel in self.channels
+                    ]
+                )
+                for output in engine.response_batch(models, self._road)
+            ]
+        )
+
+    def residual(self, theta):
+        self._last = (theta.copy(), self.responses(theta[None, :])[0])
+        return self._last[1]
+
+    def jacobian(self, theta, step):
+        if self._last is None or not np.array_equal(self._last[0], theta):
+            self.residual(theta)
+        shifted = theta + step * np.eye(len(theta))
+        return (self.responses(shifted) - self._last[1]).T / step
+
+
+def identify_parameters(
+    model_class,
+    base_params,
+    measurement,
+    names,
+    bounds=None,
+    channels=None,
+    confidence=0.95,
+    step=1e-6,
+    max_nfev=100,
+):
+    """
+    Fit vehicle model parameters to a measured response by least squares.
+
+    The parameters are fitted on a logarithmic scale, so they stay positive and
+    equally resolved. Model responses come from the ConvolutionEngine with the road
+    transformed once, and the finite difference Jacobian is evaluated as one batch
+    of parameter variants. Confidence intervals follow from the linearized
+    covariance ``s^2 (J^T J)^-1`` at the optimum.
+
+    Args:
+        model_class (type): Vehicle model class, e.g. QuarterCarModel.
+        base_params (dataclass): Initial guess, also holding the fixed parameters.
+        measurement (Measurement): Measured response and road input.
+        names (list[str]): Names of the fitted parameter fields.
+        bounds (dict, optional): (lower, upper) per fitted parameter.
+        channels (list[str], optional): Fitted channels, all measured by default.
+            Each channel is normalized by the standard deviation of its signal.
+        confidence (float): Confidence level of the reported intervals.
+        step (float): Relative finite difference step of the Jacobian.
+        max_nfev (int): Maximum number of residual evaluations.
+
+    Returns:
+        IdentificationResult: Fitted parameters, uncertainty and residuals.
+
+    Raises:
+        ValueError: If a bound is not positive or a channel was not measured.
+    """
+    if channels is None:
+        channels = list(measurement.channels)
+    missing = [channel for channel in channels if channel not in measurement.channels]
+    if missing:
+        raise ValueError(f"Channels not measured: {missing}")
+
+    bounds = bounds or {}
+    lower = np.array([bounds.get(name, (0, np.inf))[0] for name in names], float)
+    upper = np.array([bounds.get(name, (0, np.inf))[1] for name in names], float)
+    if np.any(lower < 0) or np.any(upper <= 0):
+        raise ValueError("Parameter bounds must be positive")
+    with np.errstate(divide="ignore"):
+        log_bounds = (np.log(lower), np.log(upper))
+
+    scale = {channel: np.std(measurement.channels[channel]) for channel in channels}
+    response = _ResponseModel(
+        model_class, base_params, names, measurement, channels, scale
+    )
+    theta0 = np.log([getattr(base_params, name) for name in names])
+    theta0 = np.clip(theta0, *log_bounds)
+
+    solution = least_squares(
+        response.residual,
+        theta0,
+        jac=lambda theta: response.jacobian(theta, step),
+        bounds=log_bounds,
+        x_scale="jac",
+        max_nfev=max_nfev,
+    )
+
+    theta = solution.x
+    values = np.exp(theta)
+    J = response.jacobian(theta, step)
+    dof = max(J.shape[0] - len(theta), 1)
+    variance = np.sum(response.residual(theta) ** 2) / dof
+    covariance = variance * np.linalg.pinv(J.T @ J)
+    sigma = np.sqrt(np.diag(covariance))
+    quantile = stats.t.ppf(0.5 + confidence / 2, dof)
+
+    n_samples = len(measurement.t)
+    residuals = {
+        channel: solution.fun[i * n_samples : (i + 1) * n_samples] * scale[channel]
+        for i, channel in enumerate(channels)
+    }
+    return IdentificationResult(
+        model_type=model_class.__name__,
+        params=replace(base_params, **dict(zip(names, map(float, values)))),
+        values=dict(zip(names, values)),
+        standard_errors=dict(zip(names, values * sigma)),
+        confidence_intervals={
+            name: (value * np.exp(-quantile * s), value * np.exp(quantile * s))
+            for name, value, s in zip(names, values, sigma)
+        },
+        correlation=covariance / np.outer(sigma, sigma),
+        residuals=residuals,
+        residual_rms={
+            channel: float(np.sqrt(np.mean(residual**2)))
+            for channel, residual in residuals.items()
+        },
+        n_evaluations=response.n_evaluations,
+    )
@@ -0,0 +1,197 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, is_dataclass, replace
+from road.profiles import RoadProfile
+from .evaluation import build_models, evaluate_rms
+
+
+@dataclass
+class MonteCarloResult:
+    """Statistics of RMS metrics over sampled parameter and road variations."""
+
+    n_samples: int
+    mean: dict = field(default_factory=dict)  # Mean value per metric
+    std: dict = field(default_factory=dict)  # Standard deviation per metric
+    percentiles: dict = field(default_factory=dict)  # {metric: {percentile: value}}
+    histograms: dict = field(default_factory=dict)  # {metric: (counts, bin_edges)}
+    values: dict = field(default_factory=dict)  # Metric value per sample
+
+
+class MetricAccumulator:
+    """
+    Streaming aggregation of one scalar metric.
+
+    Mean and variance are merged chunk by chunk (Chan et al.), and only the scalar
+    metric of every sample is kept for exact percentiles and histograms.
+    """
+
+    def __init__(self, n_samples):
+        """
+        Initialize the MetricAccumulator for a known number of samples.
+
+        Args:
+            n_samples (int): Total number of samples.
+        """
+        self.values = np.empty(n_samples)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values):
+        """
+        Add the metric values of one chunk.
+
+        Args:
+            values (np.ndarray): Metric value per sample of the chunk.
+        """
+        n = len(values)
+        chunk_mean = np.mean(values)
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += (
+            np.sum((values - chunk_mean) ** 2) + delta**2 * self.count * n / total
+        )
+        self.values[self.count : total] = values
+        self.count = total
+
+    @property
+    def std(self):
+        """Sample standard deviation of the added values."""
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+def _sample(distributions, size, rng):
+    """Draw samples of every distribution in a fixed order."""
+    return {
+        name: np.asarray(distribution.rvs(size=size, random_state=rng), float)
+        for name, distribution in distributions.items()
+    }
+
+
+def _sampled_road(road, values, i):
+    """Return the road with the sampled road parameters of sample i."""
+    if not values:
+        return road
+    if is_dataclass(road):
+        return replace(road, **{name: float(v[i]) for name, v in values.items()})
+    return RoadProfile(
+        road.profile_type,
+        **{**road.params, **{name: float(v[i]) for name, v in values.items()}},
+    )
+
+
+def _evaluate_chunk(analysis, seed_sequence, size):
+    """Sample and evaluate one chunk; runs in worker processes as well."""
+    rng = np.random.default_rng(seed_sequence)
+    params = _sample(analysis.distributions, size, rng)
+    road_params = _sample(analysis.road_distributions, size, rng)
+
+    names = list(params)
+    values = (
+        np.column_stack([params[name] for name in names])
+        if names
+        else np.empty((size, 0))
+    )
+    models = build_models(
+        analysis.model_class,
+        analysis.base_params,
+        names,
+        values,
+        analysis.initial_conditions,
+    )
+    roads = [_sampled_road(analysis.road, road_params, i) for i in range(size)]
+    return evaluate_rms(models, roads, analysis.metrics, analysis.t_eval)
+
+
+class MonteCarloAnalysis:
+    """
+    Monte Carlo propagation of parameter and road uncertainty to RMS metrics.
+
+    Samples are drawn in fixed size chunks, each with its own child seed of one
+    seed sequence, and evaluated through the batched evaluation path. The
+    results therefore do not depend on the number of worker processes.
+    """
+
+    def __init__(
+        self,
+        model_class,
+        base_params,
+        distributions,
+        road,
+        metrics,
+        road_distributions=None,
+        initial_conditions=None,
+        t_eval=None,
+        chunk_size=1024,
+        seed=None,
+    ):
+        """
+        Initialize the MonteCarloAnalysis with the uncertain inputs.
+
+        Args:
+            model_class (type): Vehicle model class, e.g. HalfCarModel.
+            base_params (dataclass): Parameters of the fields that are not sampled.
+            distributions (dict): Frozen scipy.stats distribution per parameter
+                field, e.g. ``{"ms": stats.uniform(450, 100)}``.
+            road (ISO8608Road or RoadProfile): Nominal road excitation.
+            metrics (list[str]): Output channels whose RMS values are analysed.
+            road_distributions (dict, optional): Distribution per road parameter,
+                e.g. ``{"velocity": stats.norm(20, 2)}``.
+            initial_conditions (dataclass, optional): Initial conditions of the model.
+            t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+            chunk_size (int): Samples per chunk.
+            seed (int, optional): Seed of the root seed sequence.
+        """
+        self.model_class = model_class
+        self.base_params = base_params
+        self.distributions = dict(distributions)
+        self.road = road
+        self.metrics = list(metrics)
+        self.road_distributions = dict(road_distributions or {})
+        self.initial_conditions = initial_conditions
+        self.t_eval = t_eval
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def run(self, n_samples, workers=None, percentiles=(5, 50, 95), bins=50):
+        """
+        Draw and evaluate all samples and aggregate the metric statistics.
+
+        Args:
+            n_samples (int): Total number of samples.
+            workers (int, optional): Worker processes evaluating chunks in parallel.
+            percentiles (tuple[float]): Percentiles to report.
+            bins (int): Number of histogram bins.
+
+        Returns:
+            MonteCarloResult: Statistics of every metric.
+        """
+        sizes = [
+            min(self.chunk_size, n_samples - start)
+            for start in range(0, n_samples, self.chunk_size)
+        ]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        accumulators = {metric: MetricAccumulator(n_samples) for metric in self.metrics}
+        arguments = ([self] * len(sizes), seeds, sizes)
+
+        if workers and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for rms in executor.map(_evaluate_chunk, *arguments):
+                    for metric, accumulator in accumulators.items():
+                        accumulator.add(rms[metric])
+        else:
+            for rms in map(_evaluate_chunk, *arguments):
+                for metric, accumulator in accumulators.items():
+                    accumulator.add(rms[metric])
+
+        result = MonteCarloResult(n_samples=n_samples)
+        for metric, accumulator in accumulators.items():
+            result.mean[metric] = accumulator.mean
+            result.std[metric] = accumulator.std
+            result.percentiles[metric] = dict(
+                zip(percentiles, np.percentile(accumulator.values, percentiles))
+            )
+            result.histograms[metric] = np.histogram(accumulator.values, bins=bins)
+            result.values[metric] = accumulator.values
+        return result
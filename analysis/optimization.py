@@ -0,0 +1,270 @@
+import logging
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from dataclasses import dataclass, field
+from road.spectral import ISO8608Road
+from .evaluation import build_models, evaluate_rms
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ComfortObjective:
+    """
+    Weighted sum of RMS responses with penalties for exceeded RMS limits.
+
+    The default minimizes the RMS seat acceleration; limits such as
+    ``{"suspension_travel": 0.03, "tire_force": 1500}`` add a penalty
+    proportional to the relative excess of each limited channel.
+    """
+
+    weights: dict = field(default_factory=lambda: {"seat_acc": 1.0})
+    limits: dict = field(default_factory=dict)  # Maximum RMS value per channel
+    penalty: float = 1000.0  # Penalty per relative limit excess
+
+    @property
+    def channels(self):
+        """Output channels needed to evaluate the objective."""
+        return list(dict.fromkeys([*self.weights, *self.limits]))
+
+    def __call__(self, rms):
+        """
+        Evaluate the objective for a batch of RMS responses.
+
+        Args:
+            rms (dict[str, np.ndarray]): RMS value per candidate for every channel.
+
+        Returns:
+            np.ndarray: Objective value per candidate.
+        """
+        value = sum(weight * rms[channel] for channel, weight in self.weights.items())
+        for channel, limit in self.limits.items():
+            value = value + self.penalty * np.maximum(rms[channel] / limit - 1, 0)
+        return value
+
+    def feasible(self, rms):
+        """
+        Check the RMS limits for a batch of RMS responses.
+
+        Args:
+            rms (dict[str, np.ndarray]): RMS value per candidate for every channel.
+
+        Returns:
+            np.ndarray: True for every candidate within all limits.
+        """
+        feasible = np.ones(len(next(iter(rms.values()))), dtype=bool)
+        for channel, limit in self.limits.items():
+            feasible &= rms[channel] <= limit
+        return feasible
+
+
+@dataclass
+class OptimizationResult:
+    """Best parameter set found by the suspension optimizer."""
+
+    params: dict  # Optimized parameter values
+    objective: float  # Objective value of the optimized parameters
+    rms: dict  # RMS responses of the optimized parameters
+    feasible: bool  # Whether all RMS limits are met
+    generations: int  # Number of completed generations
+    evaluations: int  # Number of evaluated parameter sets
+    message: str  # Reason of termination
+
+
+class SuspensionOptimizer:
+    """
+    Differential evolution optimizer for suspension parameters.
+
+    Every generation is evaluated as one population through the batched
+    evaluation path (vectorized covariance analysis on random roads, or a
+    process pool of time simulations for deterministic road profiles). The
+    process pool is started once and kept until ``close`` is called, e.g. by
+    using the optimizer as a context manager.
+    """
+
+    def __init__(
+        self,
+        model_class,
+        base_params,
+        bounds,
+        road,
+        objective=None,
+        initial_conditions=None,
+        t_eval=None,
+        workers=None,
+        population_size=None,
+        mutation=0.7,
+        crossover=0.9,
+        seed=None,
+    ):
+        """
+        Initialize the SuspensionOptimizer with the parameter space and road.
+
+        Args:
+            model_class (type): Vehicle model class, e.g. SeatAddedQuarterCarModel.
+            base_params (dataclass): Parameters of the fields that are not optimized.
+            bounds (dict[str, tuple[float, float]]): Lower and upper bound per field.
+            road (ISO8608Road or RoadProfile): Road excitation.
+            objective (ComfortObjective, optional): Objective, RMS seat acceleration
+                by default.
+            initial_conditions (dataclass, optional): Initial conditions of the model.
+            t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+            workers (int, optional): Worker processes for time simulations.
+            population_size (int, optional): Candidates per generation, ten per
+                optimized parameter by default.
+            mutation (float): Differential weight of the mutation.
+            crossover (float): Crossover probability.
+            seed (int, optional): Seed of the random number generator.
+        """
+        self.model_class = model_class
+        self.base_params = base_params
+        self.names = list(bounds)
+        self.lower = np.array([bounds[name][0] for name in self.names], dtype=float)
+        self.upper = np.array([bounds[name][1] for name in self.names], dtype=float)
+        self.road = road
+        self.objective = objective or ComfortObjective()
+        self.initial_conditions = initial_conditions
+        self.t_eval = t_eval
+        self.workers = workers
+        self.population_size = population_size or 10 * len(self.names)
+        self.mutation = mutation
+        self.crossover = crossover
+        self.rng = np.random.default_rng(seed)
+        self.history = []
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the worker pool of the time simulations down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self):
+        """Return the worker pool, started on first use, or None without workers."""
+        if not self.workers or self.workers < 2:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # shut the workers down with the optimizer if close is never called
+            weakref.finalize(self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    def evaluate(self, values, generation=0):
+        """
+        Evaluate a population of parameter sets and log every evaluation.
+
+        Args:
+            values (np.ndarray): Parameter values (n_candidates, n_params).
+            generation (int): Generation number recorded in the history.
+
+        Returns:
+            tuple[np.ndarray, dict[str, np.ndarray]]: Objective value and RMS
+                responses per candidate.
+        """
+        models = build_models(
+            self.model_class,
+            self.base_params,
+            self.names,
+            values,
+            self.initial_conditions,
+        )
+        deterministic = not isinstance(self.road, ISO8608Road)
+        rms = evaluate_rms(
+            models,
+            self.road,
+            self.objective.channels,
+            self.t_eval,
+            self.workers,
+            executor=self._pool() if deterministic else None,
+        )
+        objective = self.objective(rms)
+
+        for i, row in enumerate(values):
+            record = {
+                "generation": generation,
+                "params": dict(zip(self.names, row.tolist())),
+                "objective": float(objective[i]),
+                "rms": {channel: float(rms[channel][i]) for channel in rms},
+            }
+            self.history.append(record)
+            logger.debug("Evaluation %d: %s", len(self.history), record)
+        return objective, rms
+
+    def optimize(self, max_generations=100, tolerance=1e-6, callback=None):
+        """
+        Run the differential evolution until convergence or early termination.
+
+        Args:
+            max_generations (int): Maximum number of generations.
+            tolerance (float): Relative spread of the population objective at which
+                the optimization has converged.
+            callback (callable, optional): Called as ``callback(generation, params,
+                objective)`` after every generation; returning True stops early.
+
+        Returns:
+            OptimizationResult: The best parameter set found.
+        """
+        span = self.upper - self.lower
+        population = self.lower + span * self.rng.random(
+            (self.population_size, len(self.names))
+        )
+        fitness, rms = self.evaluate(population)
+
+        message = "Maximum number of generations reached."
+        generation = 0
+        for generation in range(1, max_generations + 1):
+            trial = self._trial_population(population)
+            trial_fitness, trial_rms = self.evaluate(trial, generation)
+
+            improved = trial_fitness <= fitness
+            population[improved] = trial[improved]
+            fitness[improved] = trial_fitness[improved]
+            for channel in rms:
+                rms[channel][improved] = trial_rms[channel][improved]
+
+            best = np.argmin(fitness)
+            logger.info("Generation %d: best objective %.6g", generation, fitness[best])
+            if callback is not None and callback(
+                generation, dict(zip(self.names, population[best])), fitness[best]
+            ):
+                message = "Stopped by callback."
+                break
+            if np.std(fitness) <= tolerance * np.abs(np.mean(fitness)):
+                message = "Population converged."
+                break
+
+        best = np.argmin(fitness)
+        return OptimizationResult(
+            params=dict(zip(self.names, population[best].tolist())),
+            objective=float(fitness[best]),
+            rms={channel: float(rms[channel][best]) for channel in rms},
+            feasible=bool(self.objective.feasible(rms)[best]),
+            generations=generation,
+            evaluations=len(self.history),
+            message=message,
+        )
+
+    def _trial_population(self, population):
+        """Create trial candidates by DE/rand/1 mutation and binomial crossover."""
+        size, dimension = population.shape
+        donors = np.array(
+            [
+                self.rng.choice(np.delete(np.arange(size), i), 3, replace=False)
+                for i in range(size)
+            ]
+        )
+        mutant = population[donors[:, 0]] + self.mutation * (
+            population[donors[:, 1]] - population[donors[:, 2]]
+        )
+        mutant = np.clip(mutant, self.lower, self.upper)
+
+        crossover = self.rng.random((size, dimension)) < self.crossover
+        crossover[np.arange(size), self.rng.integers(dimension, size=size)] = True
+        return np.where(crossover, mutant, population)
@@ -0,0 +1,172 @@
+import numpy as np
+from dataclasses import dataclass, field, fields
+from scipy.stats import qmc
+import configuration
+from .evaluation import build_models, evaluate_rms
+
+
+@dataclass
+class SensitivityTable:
+    """Parameters of one metric ranked by their influence."""
+
+    metric: str
+    columns: list  # Names of the numeric columns, the first one ranks the rows
+    rows: list = field(default_factory=list)  # One dictionary per parameter
+
+    def format(self):
+        """
+        Format the table with the configured significant figures.
+
+        Returns:
+            str: The ranked table as text.
+        """
+        digits = configuration.TABLE_STYLE["significant_figures"]["default"]
+        header = f"{'Parameter':<22}" + "".join(f"{c:>16}" for c in self.columns)
+        lines = [f" Sensitivity of {self.metric}", "=" * len(header), header]
+        lines.append("-" * len(header))
+        for row in self.rows:
+            lines.append(
+                f"{row['parameter']:<22}"
+                + "".join(f"{row[c]:>16.{digits}g}" for c in self.columns)
+            )
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.format()
+
+
+def _ranked(metric, columns, parameters, values):
+    rows = [
+        {"parameter": name, **{c: float(values[c][i]) for c in columns}}
+        for i, name in enumerate(parameters)
+    ]
+    rows.sort(key=lambda row: abs(row[columns[0]]), reverse=True)
+    return SensitivityTable(metric=metric, columns=columns, rows=rows)
+
+
+def local_sensitivity(
+    model_class,
+    base_params,
+    road,
+    metrics,
+    parameters=None,
+    relative_step=1e-4,
+    initial_conditions=None,
+    t_eval=None,
+    workers=None,
+):
+    """
+    Compute local gradients of RMS metrics with respect to model parameters.
+
+    All central differences are evaluated as one batch of 2 P + 1 parameter sets.
+    The tables are ranked by the normalized sensitivity (p / m) dm/dp.
+
+    Args:
+        model_class (type): Vehicle model class, e.g. QuarterCarModel.
+        base_params (dataclass): Parameters at which the gradients are evaluated.
+        road (ISO8608Road or RoadProfile): Road excitation.
+        metrics (list[str]): Output channels whose RMS values are differentiated.
+        parameters (list[str], optional): Parameter fields, all fields by default.
+        relative_step (float): Relative step of the central differences.
+        initial_conditions (dataclass, optional): Initial conditions of the model.
+        t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+        workers (int, optional): Worker processes for time simulations.
+
+    Returns:
+        dict[str, SensitivityTable]: Ranked gradients per metric.
+    """
+    if parameters is None:
+        parameters = [f.name for f in fields(base_params)]
+    nominal = np.array([getattr(base_params, name) for name in parameters], float)
+    steps = relative_step * np.where(nominal != 0, np.abs(nominal), 1.0)
+
+    values = np.tile(nominal, (2 * len(parameters) + 1, 1))
+    for i, step in enumerate(steps):
+        values[2 * i + 1, i] += step
+        values[2 * i + 2, i] -= step
+
+    models = build_models(
+        model_class, base_params, parameters, values, initial_conditions
+    )
+    rms = evaluate_rms(models, road, metrics, t_eval, workers)
+
+    tables = {}
+    for metric in metrics:
+        gradient = (rms[metric][1::2] - rms[metric][2::2]) / (2 * steps)
+        normalized = gradient * nominal / rms[metric][0]
+        tables[metric] = _ranked(
+            metric,
+            ["normalized", "gradient", "value"],
+            parameters,
+            {"normalized": normalized, "gradient": gradient, "value": nominal},
+        )
+    return tables
+
+
+def sobol_indices(
+    model_class,
+    base_params,
+    bounds,
+    road,
+    metrics,
+    n_samples=1024,
+    seed=None,
+    initial_conditions=None,
+    t_eval=None,
+    workers=None,
+):
+    """
+    Compute global first order and total Sobol indices of RMS metrics.
+
+    The Saltelli design needs N (d + 2) evaluations, which are run as one batch.
+    First order indices use the Saltelli (2010) estimator and total indices the
+    Jansen estimator.
+
+    Args:
+        model_class (type): Vehicle model class, e.g. HalfCarModel.
+        base_params (dataclass): Parameters of the fields that are not varied.
+        bounds (dict[str, tuple[float, float]]): Lower and upper bound per field.
+        road (ISO8608Road or RoadProfile): Road excitation.
+        metrics (list[str]): Output channels whose RMS values are analysed.
+        n_samples (int): Base sample size N, preferably a power of two.
+        seed (int, optional): Seed of the Sobol sequence.
+        initial_conditions (dataclass, optional): Initial conditions of the model.
+        t_eval (np.ndarray, optional): Time points of deterministic road profiles.
+        workers (int, optional): Worker processes for time simulations.
+
+    Returns:
+        dict[str, SensitivityTable]: Indices ranked by the total index per metric.
+    """
+    names = list(bounds)
+    d = len(names)
+    sampler = qmc.Sobol(d=2 * d, scramble=True, seed=seed)
+    base = qmc.scale(
+        sampler.random(n_samples),
+        [bounds[name][0] for name in names] * 2,
+        [bounds[name][1] for name in names] * 2,
+    )
+    A, B = base[:, :d], base[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+
+    values = np.concatenate([A, B, AB.reshape(-1, d)])
+    models = build_models(model_class, base_params, names, values, initial_conditions)
+    rms = evaluate_rms(models, road, metrics, t_eval, workers)
+
+    tables = {}
+    for metric in metrics:
+        f_A = rms[metric][:n_samples]
+        f_B = rms[metric][n_samples : 2 * n_samples]
+        f_AB = rms[metric][2 * n_samples :].reshape(d, n_samples)
+        variance = np.var(np.concatenate([f_A, f_B]))
+
+        first_order = np.mean(f_B * (f_AB - f_A), axis=1) / variance
+        total = 0.5 * np.mean((f_A - f_AB) ** 2, axis=1) / variance
+        tables[metric] = _ranked(
+            metric,
+            ["total", "first_order"],
+            names,
+            {"total": total, "first_order": first_order},
+        )
+    return tables
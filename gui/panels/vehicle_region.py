@@ -1,7 +1,18 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
+from analysis.doe import PolynomialSurrogate
 from ..widgets.parameter_input import ParameterInput
 
+# Dataclass field names of the parameters that are labelled differently in the GUI
+PARAMETER_FIELDS = {"kt": "ku", "kt_f": "ku_f", "kt_r": "ku_r"}
+
+# Vehicle model class of every model choice
+MODEL_TYPES = {
+    "Quarter Car Model": "QuarterCarModel",
+    "Seat-Added Quarter Car Model": "SeatAddedQuarterCarModel",
+    "Half Car Model": "HalfCarModel",
+}
+
 
 class VehicleRegion:
     def __init__(self, parent):
@@ -69,6 +80,15 @@ def __init__(self, parent):
         self.ic_inner_frame = ttk.Frame(self.ic_canvas)
         self.ic_canvas.create_window((0, 0), window=self.ic_inner_frame, anchor="nw")
 
+        # Predicted metrics of the loaded surrogate model
+        self.surrogate = None
+        self.surrogate_button = ttk.Button(
+            self.frame, text="Load Surrogate", command=self.load_surrogate
+        )
+        self.surrogate_button.pack(fill=tk.X, padx=5, pady=5)
+        self.prediction_label = ttk.Label(self.frame, text="", justify=tk.LEFT)
+        self.prediction_label.pack(fill=tk.X, padx=5, pady=5)
+
         # Initialize with Quarter Car Model parameters and initial conditions
         self.current_params = {}
         self.current_ic = {}
@@ -154,6 +174,7 @@ def on_model_change(self, event):
             self.init_seat_added_quarter_car()
         elif model == "Half Car Model":
             self.init_half_car()
+        self.bind_prediction()
 
     def get_parameters(self):
         return {
@@ -162,3 +183,49 @@ def get_parameters(self):
 
     def get_initial_conditions(self):
         return {key: float(ic.get_value()) for key, ic in self.current_ic.items()}
+
+    def load_surrogate(self):
+        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        if file_path:
+            try:
+                surrogate = PolynomialSurrogate.load(file_path)
+            except (OSError, KeyError, ValueError):
+                self.prediction_label.config(text="Invalid surrogate file")
+                return
+            self.set_surrogate(surrogate)
+
+    def set_surrogate(self, surrogate):
+        self.surrogate = surrogate
+        self.bind_prediction()
+
+    def bind_prediction(self):
+        for param in self.current_params.values():
+            param.on_change(self.update_prediction)
+        self.update_prediction()
+
+    def update_prediction(self):
+        # predictions of a surrogate of another vehicle model are hidden
+        if self.surrogate is None or self.surrogate.model_type != MODEL_TYPES.get(
+            self.model_var.get()
+        ):
+            self.prediction_label.config(text="")
+            return
+
+        try:
+            params = {
+                PARAMETER_FIELDS.get(key, key): value
+                for key, value in self.get_parameters().items()
+            }
+            prediction, error = self.surrogate.predict(
+                {name: params[name] for name in self.surrogate.names}
+            )
+        except (KeyError, ValueError):
+            self.prediction_label.config(text="No prediction for these parameters")
+            return
+
+        self.prediction_label.config(
+            text="\n".join(
+                f"{name}: {prediction[name][0]:.3g} ± {error[name][0]:.2g}"
+                for name in prediction
+            )
+        )
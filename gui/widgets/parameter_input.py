@@ -11,6 +11,7 @@ def __init__(self, parent, label, default_value="", unit=""):
         self.label.pack(side=tk.LEFT, padx=(0, 5))
 
         self.value = tk.StringVar(value=default_value)
+        self._trace = None
         self.entry = ttk.Entry(self.frame, textvariable=self.value, width=10)
         self.entry.pack(side=tk.LEFT)
 
@@ -23,3 +24,9 @@ def get_value(self):
 
     def set_value(self, value):
         self.value.set(value)
+
+    def on_change(self, callback):
+        # a single change callback, replacing the previous one
+        if self._trace is not None:
+            self.value.trace_remove("write", self._trace)
+        self._trace = self.value.trace_add("write", lambda *args: callback())
@@ -9,3 +9,4 @@
     HalfCarModelParams,
     HalfCarModelInitialConditions,
 )
+from .assembly import AssembledModel, Body, Damper, RoadContact, Spring
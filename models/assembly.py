@@ -0,0 +1,360 @@
+import numpy as np
+from dataclasses import dataclass, fields
+from scipy import sparse
+from .base import VehicleModel, append_inputs
+
+
+@dataclass
+class Body:
+    """
+    Rigid body of an assembled model.
+
+    Every body moves vertically. Giving a pitch or roll inertia adds the rotation as
+    a further degree of freedom.
+    """
+
+    name: str
+    mass: float  # Mass [kg]
+    pitch_inertia: float = None  # Pitch moment of inertia [kg*m^2]
+    roll_inertia: float = None  # Roll moment of inertia [kg*m^2]
+
+
+@dataclass
+class Spring:
+    """
+    Linear spring between two bodies, or between a body and the ground.
+
+    Attachment points are ``(x, y)`` offsets from the body's reference point with
+    x pointing forward and y to the left. The vertical displacement of a point is
+    ``z + x * pitch + y * roll``.
+    """
+
+    name: str
+    body_a: str
+    body_b: str  # Second body, None for the ground
+    stiffness: float  # Stiffness [N/m]
+    point_a: tuple = (0.0, 0.0)  # Attachment point on body_a [m]
+    point_b: tuple = (0.0, 0.0)  # Attachment point on body_b [m]
+
+
+@dataclass
+class Damper:
+    """Linear viscous damper between two bodies, attached like a Spring."""
+
+    name: str
+    body_a: str
+    body_b: str  # Second body, None for the ground
+    damping: float  # Damping coefficient [Ns/m]
+    point_a: tuple = (0.0, 0.0)  # Attachment point on body_a [m]
+    point_b: tuple = (0.0, 0.0)  # Attachment point on body_b [m]
+
+
+@dataclass
+class RoadContact:
+    """
+    Tire spring between a body and the road.
+
+    Every contact is one road input. A contact located ``offset`` metres behind the
+    first contact sees the road profile delayed by ``offset / velocity``.
+    """
+
+    name: str
+    body: str
+    stiffness: float  # Tire stiffness [N/m]
+    offset: float = 0.0  # Distance behind the first contact along the road [m]
+    point: tuple = (0.0, 0.0)  # Contact point on the body [m]
+
+
+class AssembledModel(VehicleModel):
+    """
+    Linear vehicle model assembled from a list of components.
+
+    The global mass, damping and stiffness matrices are assembled from the bodies,
+    springs, dampers and road contacts. Above ``sparse_threshold`` degrees of
+    freedom they are stored as sparse matrices, so evaluating the equations of
+    motion scales with the number of components.
+    """
+
+    is_linear = True
+
+    #: Number of degrees of freedom above which sparse matrices are used.
+    sparse_threshold = 64
+
+    def __init__(self, components, velocity=20.0, initial_conditions=None):
+        """
+        Initialize the AssembledModel from its components.
+
+        Args:
+            components (list): Body, Spring, Damper and RoadContact instances.
+            velocity (float): Longitudinal velocity [m/s].
+            initial_conditions (list[float], optional): Initial state, interleaving
+                the displacement and velocity of every degree of freedom. Zero by
+                default.
+
+        Raises:
+            ValueError: If a name is duplicated, a component refers to an unknown
+                body, a contact offset is negative or the model has no road contact.
+        """
+        self.components = list(components)
+        self.velocity = velocity
+
+        self.dofs = []  # (body name, "heave" | "pitch" | "roll")
+        self._body_dofs = {}
+        masses = []
+        for body in self._of_type(Body):
+            if body.name in self._body_dofs:
+                raise ValueError(f"Duplicate body name: {body.name}")
+            indices = {"heave": len(self.dofs)}
+            self.dofs.append((body.name, "heave"))
+            masses.append(body.mass)
+            for axis, inertia in (
+                ("pitch", body.pitch_inertia),
+                ("roll", body.roll_inertia),
+            ):
+                if inertia is not None:
+                    indices[axis] = len(self.dofs)
+                    self.dofs.append((body.name, axis))
+                    masses.append(inertia)
+            self._body_dofs[body.name] = indices
+        self.mass = np.array(masses, dtype=float)
+
+        self.contacts = self._of_type(RoadContact)
+        if not self.contacts:
+            raise ValueError("An assembled model needs at least one road contact")
+        if any(contact.offset < 0 for contact in self.contacts):
+            raise ValueError("Road contact offsets must not be negative")
+
+        # every field but the name, so models of different geometry or topology
+        # never share the cache entries keyed on the parameters
+        params = {"velocity": float(velocity)}
+        for component in self.components:
+            for item in fields(component):
+                if item.name == "name":
+                    continue
+                value = getattr(component, item.name)
+                if isinstance(value, tuple):
+                    value = tuple(float(v) for v in value)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    value = float(value)
+                params[f"{component.name}.{item.name}"] = value
+
+        n_states = 2 * len(self.dofs)
+        if initial_conditions is None:
+            initial_conditions = [0.0] * n_states
+        elif len(initial_conditions) != n_states:
+            raise ValueError(f"Expected {n_states} initial conditions")
+        super().__init__(params=params, initial_conditions=list(initial_conditions))
+
+        self._assemble()
+
+    def _of_type(self, component_type):
+        """Return the components of one type in their given order."""
+        return [c for c in self.components if isinstance(c, component_type)]
+
+    def _point(self, body, point):
+        """Return the degree of freedom coefficients of a point's displacement."""
+        if body is None:
+            return {}
+        if body not in self._body_dofs:
+            raise ValueError(f"Unknown body: {body}")
+        indices = self._body_dofs[body]
+        x, y = point
+        vector = {indices["heave"]: 1.0}
+        if "pitch" in indices and x:
+            vector[indices["pitch"]] = x
+        if "roll" in indices and y:
+            vector[indices["roll"]] = y
+        return vector
+
+    def _deflection(self, element):
+        """Return the coefficients of an element's deflection (a minus b)."""
+        vector = self._point(element.body_a, element.point_a)
+        for index, value in self._point(element.body_b, element.point_b).items():
+            vector[index] = vector.get(index, 0.0) - value
+        return vector
+
+    def _assemble(self):
+        """Assemble the global matrices from component triplets."""
+        n_dof = len(self.dofs)
+        triplets = {"K": ([], [], []), "C": ([], [], [])}
+
+        def add(key, vector, coefficient):
+            rows, cols, values = triplets[key]
+            for i, ci in vector.items():
+                for j, cj in vector.items():
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(coefficient * ci * cj)
+
+        self._deflections = {}
+        for element in self._of_type(Spring) + self._of_type(Damper):
+            # springs and dampers share the <name>_travel channels
+            if element.name in self._deflections:
+                raise ValueError(f"Duplicate spring or damper name: {element.name}")
+            vector = self._deflection(element)
+            self._deflections[element.name] = vector
+            if isinstance(element, Spring):
+                add("K", vector, element.stiffness)
+            else:
+                add("C", vector, element.damping)
+
+        names = [contact.name for contact in self.contacts]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate road contact names: {names}")
+        road_rows, road_cols, road_values = [], [], []
+        self._contact_points = []
+        for column, contact in enumerate(self.contacts):
+            vector = self._point(contact.body, contact.point)
+            self._contact_points.append(vector)
+            add("K", vector, contact.stiffness)
+            for i, ci in vector.items():
+                road_rows.append(i)
+                road_cols.append(column)
+                road_values.append(contact.stiffness * ci)
+
+        shape = (n_dof, n_dof)
+        K = sparse.coo_matrix((triplets["K"][2], triplets["K"][:2]), shape).tocsr()
+        C = sparse.coo_matrix((triplets["C"][2], triplets["C"][:2]), shape).tocsr()
+        K_road = sparse.coo_matrix(
+            (road_values, (road_rows, road_cols)), (n_dof, len(self.contacts))
+        ).tocsr()
+
+        if self.is_sparse:
+            self._K, self._C, self._K_road = K, C, K_road
+        else:
+            self._K, self._C, self._K_road = K.toarray(), C.toarray(), K_road.toarray()
+        self._delays = np.array([c.offset for c in self.contacts]) / self.velocity
+
+    @property
+    def is_sparse(self):
+        """Whether the global matrices are stored as sparse matrices."""
+        return len(self.dofs) > self.sparse_threshold
+
+    def equations_of_motion(self, y: np.ndarray, t: float, u: callable) -> np.ndarray:
+        """
+        Compute the equations of motion for the assembled model.
+
+        Args:
+            y (np.ndarray): State vector.
+            t (float): Time variable.
+            u (callable): Function to provide road input.
+
+        Returns:
+            np.ndarray: Derivatives of the state vector.
+        """
+        q, q_dot = y[0::2], y[1::2]
+        road = np.array([u(max(0, t - delay)) for delay in self._delays])
+
+        dydt = np.empty_like(y, dtype=float)
+        dydt[0::2] = q_dot
+        dydt[1::2] = (self._K_road @ road - self._K @ q - self._C @ q_dot) / self.mass
+        return dydt
+
+    def sparse_matrices(self):
+        """
+        Return the global matrices in sparse storage.
+
+        Returns:
+            tuple[sparse.csr_matrix, ...]: M, C, K and K_road.
+        """
+        return tuple(
+            sparse.csr_matrix(matrix)
+            for matrix in (sparse.diags(self.mass), self._C, self._K, self._K_road)
+        )
+
+    def sparse_state_space(self):
+        """
+        Return the state-space matrices in sparse storage.
+
+        The mass matrix is diagonal, so the equations are scaled by the inverse
+        masses and no matrix is inverted or stored densely.
+
+        Returns:
+            tuple[sparse.csr_matrix, sparse.csr_matrix]: System matrix A and road
+                input matrix B.
+        """
+        n_dof = len(self.dofs)
+        M_inv = sparse.diags(1.0 / self.mass)
+        K, C, K_road = (
+            sparse.csr_matrix(matrix) for matrix in (self._K, self._C, self._K_road)
+        )
+        # blocks [q, q_dot], interleaved like the equations of motion
+        A = sparse.bmat([[None, sparse.identity(n_dof)], [-M_inv @ K, -M_inv @ C]])
+        B = sparse.vstack([sparse.csr_matrix(K_road.shape), M_inv @ K_road])
+        order = np.arange(2 * n_dof).reshape(2, n_dof).T.ravel()
+        return A.tocsr()[order][:, order], B.tocsr()[order]
+
+    def state_space(self):
+        """
+        Return the linear state-space matrices ``x' = A x + B r`` of the model.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: System matrix A and road input matrix B.
+        """
+        return tuple(matrix.toarray() for matrix in self.sparse_state_space())
+
+    def second_order_matrices(self):
+        """
+        Return the mass, damping, stiffness and road stiffness matrices.
+
+        The degrees of freedom are ordered like ``dofs`` and every road contact is
+        one road input.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: M, C, K and K_road.
+        """
+        return tuple(matrix.toarray() for matrix in self.sparse_matrices())
+
+    def input_delays(self):
+        """
+        Return the road delay of every contact.
+
+        Returns:
+            np.ndarray: Delays in seconds, one per road contact.
+        """
+        return self._delays.copy()
+
+    def output_channels(self, input_matrix=None):
+        """
+        Return the linear output channels of the assembled model.
+
+        Every degree of freedom gives ``<body>_disp`` and ``<body>_acc`` (heave) or
+        ``<body>_<axis>`` and ``<body>_<axis>_acc`` (pitch and roll). Springs and
+        dampers give ``<name>_travel`` and road contacts ``<name>_force``.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces, appended after the road inputs.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Rows of C and D per channel.
+        """
+        A, B = self.sparse_state_space()
+        B = append_inputs(B.toarray(), input_matrix)
+        n_states, n_inputs = B.shape
+
+        def row(vector, scale=1.0):
+            C = np.zeros(n_states)
+            for index, value in vector.items():
+                C[2 * index] = scale * value
+            return C
+
+        channels = {}
+        for index, (body, axis) in enumerate(self.dofs):
+            name = body if axis == "heave" else f"{body}_{axis}"
+            suffix = "_disp" if axis == "heave" else ""
+            channels[name + suffix] = (row({index: 1.0}), np.zeros(n_inputs))
+            channels[f"{name}_acc"] = (
+                A.getrow(2 * index + 1).toarray().ravel(),
+                B[2 * index + 1],
+            )
+        for name, vector in self._deflections.items():
+            channels[f"{name}_travel"] = (row(vector), np.zeros(n_inputs))
+        for column, contact in enumerate(self.contacts):
+            D = np.zeros(n_inputs)
+            D[column] = contact.stiffness
+            channels[f"{contact.name}_force"] = (
+                row(self._contact_points[column], -contact.stiffness),
+                D,
+            )
+        return channels
@@ -16,6 +16,9 @@ def __init__(self, params: dict[str, float], initial_conditions: list[float]):
         self.params = params
         self.initial_conditions = initial_conditions
 
+    #: Whether the equations of motion are linear in the state and road input.
+    is_linear = False
+
     def __repr__(self):
         return f"Parameters of this vehicle: {self.params} \n and initial conditions: {self.initial_conditions}"
 
@@ -33,3 +36,131 @@ def equations_of_motion(self, y: np.ndarray, t: float, u: callable) -> np.ndarra
             np.ndarray: Derivatives of the state vector.
         """
         pass
+
+    def second_order_matrices(self):
+        """
+        Return the second-order matrices ``M q'' + C q' + K q = K_road r`` of the model.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Mass, damping and
+                stiffness matrices and the road stiffness matrix, which maps each road
+                input to generalized forces.
+
+        Raises:
+            NotImplementedError: If the model has no linear second-order form.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not provide a linear state-space form"
+        )
+
+    def state_space(self):
+        """
+        Return the linear state-space matrices ``x' = A x + B r`` of the model.
+
+        The state ordering matches ``equations_of_motion`` and every column of ``B``
+        belongs to one road input, delayed as given by ``input_delays``.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: System matrix A and road input matrix B.
+        """
+        return second_order_state_space(*self.second_order_matrices())
+
+    def input_state_space(self, input_matrix=None):
+        """
+        Return the state-space matrices with further inputs appended to the road.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: System matrix A and the input matrix with
+                the road columns first.
+
+        Raises:
+            ValueError: If the input matrix does not have one row per state.
+        """
+        A, B = self.state_space()
+        return A, append_inputs(B, input_matrix)
+
+    def input_delays(self) -> np.ndarray:
+        """
+        Return the time delay of every road input with respect to the first one.
+
+        Returns:
+            np.ndarray: Delays in seconds, one per column of the road input matrix.
+        """
+        _, _, _, K_road = self.second_order_matrices()
+        return np.zeros(K_road.shape[1])
+
+    def output_channels(self, input_matrix=None) -> dict:
+        """
+        Return the linear output channels ``y = C x + D r`` of the model.
+
+        With an input matrix the inputs ``r`` are the road inputs followed by the
+        further inputs, see ``input_state_space``.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces, appended after the road inputs.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Row of C and row of D for every
+                named channel (e.g. ``"body_acc"`` or ``"suspension_travel"``).
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not provide linear output channels"
+        )
+
+
+def append_inputs(B, input_matrix=None):
+    """
+    Append the columns of further inputs to an input matrix.
+
+    Args:
+        B (np.ndarray): Input matrix, one row per state.
+        input_matrix (np.ndarray, optional): State derivative per further input.
+
+    Returns:
+        np.ndarray: B followed by the columns of input_matrix.
+
+    Raises:
+        ValueError: If the input matrix does not have one row per state.
+    """
+    if input_matrix is None:
+        return B
+    input_matrix = np.asarray(input_matrix, dtype=float)
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != B.shape[0]:
+        raise ValueError(
+            f"The input matrix must have one row per state, got {input_matrix.shape}"
+        )
+    return np.hstack([B, input_matrix])
+
+
+def second_order_state_space(M, C, K, K_road):
+    """
+    Build first-order state-space matrices from second-order system matrices.
+
+    The state vector interleaves displacements and velocities
+    ``[q_0, q_0_dot, q_1, q_1_dot, ...]`` like the equations of motion of the models.
+
+    Args:
+        M (np.ndarray): Mass matrix.
+        C (np.ndarray): Damping matrix.
+        K (np.ndarray): Stiffness matrix.
+        K_road (np.ndarray): Road stiffness matrix, one column per road input.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: System matrix A and road input matrix B.
+    """
+    n_dof = M.shape[0]
+    M_inv = np.linalg.inv(M)
+
+    A = np.zeros((2 * n_dof, 2 * n_dof))
+    A[0::2, 1::2] = np.eye(n_dof)
+    A[1::2, 0::2] = -M_inv @ K
+    A[1::2, 1::2] = -M_inv @ C
+
+    B = np.zeros((2 * n_dof, K_road.shape[1]))
+    B[1::2] = M_inv @ K_road
+    return A, B
@@ -7,6 +7,8 @@
 class HalfCarModel(VehicleModel):
     """Model representing a half car for dynamic analysis."""
 
+    is_linear = True
+
     def __init__(
         self,
         params: HalfCarModelParams = HalfCarModelParams(),
@@ -82,3 +84,81 @@ def equations_of_motion(self, y: np.ndarray, t: float, u: callable) -> np.ndarra
                 x_u_r_ddot,
             ]
         )
+
+    def second_order_matrices(self):
+        """
+        Return the mass, damping, stiffness and road stiffness matrices.
+
+        The degrees of freedom are ``[z_s, theta, z_u_f, z_u_r]``. The first road
+        input acts on the front tire and the second one on the rear tire.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: M, C, K and K_road.
+        """
+        ms, I = self.params["ms"], self.params["I"]
+        mu_f, mu_r = self.params["mu_f"], self.params["mu_r"]
+        ks_f, ks_r = self.params["ks_f"], self.params["ks_r"]
+        cs_f, cs_r = self.params["cs_f"], self.params["cs_r"]
+        ku_f, ku_r = self.params["ku_f"], self.params["ku_r"]
+        a, b = self.params["a"], self.params["b"]
+
+        # suspension deflections as a function of the degrees of freedom
+        front = np.array([1.0, a, -1.0, 0.0])
+        rear = np.array([1.0, -b, 0.0, -1.0])
+
+        M = np.diag([ms, I, mu_f, mu_r])
+        C = cs_f * np.outer(front, front) + cs_r * np.outer(rear, rear)
+        K = ks_f * np.outer(front, front) + ks_r * np.outer(rear, rear)
+        K += np.diag([0.0, 0.0, ku_f, ku_r])
+        K_road = np.array([[0.0, 0.0], [0.0, 0.0], [ku_f, 0.0], [0.0, ku_r]])
+        return M, C, K, K_road
+
+    def input_delays(self):
+        """
+        Return the road input delays of the front and rear tires.
+
+        Returns:
+            np.ndarray: Zero for the front tire and the wheelbase delay for the rear.
+        """
+        a, b = self.params["a"], self.params["b"]
+        return np.array([0.0, (a + b) / self.params["longitudial_velocity"]])
+
+    def output_channels(self, input_matrix=None):
+        """
+        Return the linear output channels of the half car model.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces, appended after the road inputs.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Rows of C and D per channel.
+        """
+        A, B = self.input_state_space(input_matrix)
+        n_inputs = B.shape[1]
+        ku_f, ku_r = self.params["ku_f"], self.params["ku_r"]
+        a, b = self.params["a"], self.params["b"]
+        return {
+            "body_disp": (np.array([1.0, 0, 0, 0, 0, 0, 0, 0]), np.zeros(n_inputs)),
+            "body_acc": (A[1], B[1]),
+            "pitch": (np.array([0, 0, 1.0, 0, 0, 0, 0, 0]), np.zeros(n_inputs)),
+            "pitch_acc": (A[3], B[3]),
+            "wheel_front_acc": (A[5], B[5]),
+            "wheel_rear_acc": (A[7], B[7]),
+            "suspension_travel_front": (
+                np.array([1.0, 0, a, 0, -1.0, 0, 0, 0]),
+                np.zeros(n_inputs),
+            ),
+            "suspension_travel_rear": (
+                np.array([1.0, 0, -b, 0, 0, 0, -1.0, 0]),
+                np.zeros(n_inputs),
+            ),
+            "tire_force_front": (
+                np.array([0, 0, 0, 0, -ku_f, 0, 0, 0]),
+                np.pad([ku_f, 0.0], (0, n_inputs - 2)),
+            ),
+            "tire_force_rear": (
+                np.array([0, 0, 0, 0, 0, 0, -ku_r, 0]),
+                np.pad([0.0, ku_r], (0, n_inputs - 2)),
+            ),
+        }
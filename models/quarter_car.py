@@ -7,8 +7,12 @@
 class QuarterCarModel(VehicleModel):
     """Model representing a quarter car for dynamic analysis."""
 
+    is_linear = True
+
     def __init__(
-        self, params: QuarterCarParams, initial_conditions: QuarterCarInitialConditions
+        self,
+        params: QuarterCarParams = QuarterCarParams(),
+        initial_conditions: QuarterCarInitialConditions = QuarterCarInitialConditions(),
     ):
         """
         Initialize the QuarterCarModel with parameters and initial conditions.
@@ -49,3 +53,45 @@ def equations_of_motion(self, y: np.ndarray, t: float, u: callable) -> np.ndarra
         ) / mu
 
         return np.array([z_s_dot, z_s_ddot, z_u_dot, z_u_ddot])
+
+    def second_order_matrices(self):
+        """
+        Return the mass, damping, stiffness and road stiffness matrices.
+
+        The degrees of freedom are ``[z_s, z_u]`` and the road acts on the tire.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: M, C, K and K_road.
+        """
+        ms, mu = self.params["ms"], self.params["mu"]
+        ks, cs = self.params["ks"], self.params["cs"]
+        ku = self.params["ku"]
+
+        M = np.diag([ms, mu])
+        C = np.array([[cs, -cs], [-cs, cs]])
+        K = np.array([[ks, -ks], [-ks, ks + ku]])
+        K_road = np.array([[0.0], [ku]])
+        return M, C, K, K_road
+
+    def output_channels(self, input_matrix=None):
+        """
+        Return the linear output channels of the quarter car model.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces, appended after the road inputs.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Rows of C and D per channel.
+        """
+        A, B = self.input_state_space(input_matrix)
+        n_inputs = B.shape[1]
+        ku = self.params["ku"]
+        return {
+            "body_disp": (np.array([1.0, 0, 0, 0]), np.zeros(n_inputs)),
+            "body_acc": (A[1], B[1]),
+            "wheel_disp": (np.array([0, 0, 1.0, 0]), np.zeros(n_inputs)),
+            "wheel_acc": (A[3], B[3]),
+            "suspension_travel": (np.array([1.0, 0, -1.0, 0]), np.zeros(n_inputs)),
+            "tire_force": (np.array([0, 0, -ku, 0]), np.pad([ku], (0, n_inputs - 1))),
+        }
@@ -10,6 +10,8 @@
 class SeatAddedQuarterCarModel(VehicleModel):
     """Model representing a quarter car with an added seat for dynamic analysis."""
 
+    is_linear = True
+
     def __init__(
         self,
         params: SeatAddedQuarterCarParams = SeatAddedQuarterCarParams(),
@@ -61,3 +63,59 @@ def equations_of_motion(self, y: np.ndarray, t: float, u: callable) -> np.ndarra
         z_u_ddot = (ks * (z_s - z_u) + cs * (z_s_dot - z_u_dot) - ku * (z_u - z_r)) / mu
 
         return np.array([z_seat_dot, z_seat_ddot, z_s_dot, z_s_ddot, z_u_dot, z_u_ddot])
+
+    def second_order_matrices(self):
+        """
+        Return the mass, damping, stiffness and road stiffness matrices.
+
+        The degrees of freedom are ``[z_seat, z_s, z_u]`` and the road acts on the tire.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: M, C, K and K_road.
+        """
+        ms, m_seat, mu = self.params["ms"], self.params["m_seat"], self.params["mu"]
+        ks, cs = self.params["ks"], self.params["cs"]
+        k_seat, c_seat = self.params["k_seat"], self.params["c_seat"]
+        ku = self.params["ku"]
+
+        seat = np.array([1.0, -1.0, 0.0])
+        suspension = np.array([0.0, 1.0, -1.0])
+
+        M = np.diag([m_seat, ms, mu])
+        C = c_seat * np.outer(seat, seat) + cs * np.outer(suspension, suspension)
+        K = k_seat * np.outer(seat, seat) + ks * np.outer(suspension, suspension)
+        K[2, 2] += ku
+        K_road = np.array([[0.0], [0.0], [ku]])
+        return M, C, K, K_road
+
+    def output_channels(self, input_matrix=None):
+        """
+        Return the linear output channels of the seat added quarter car model.
+
+        Args:
+            input_matrix (np.ndarray, optional): State derivative per further input,
+                e.g. actuator forces, appended after the road inputs.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Rows of C and D per channel.
+        """
+        A, B = self.input_state_space(input_matrix)
+        n_inputs = B.shape[1]
+        ku = self.params["ku"]
+        return {
+            "seat_disp": (np.array([1.0, 0, 0, 0, 0, 0]), np.zeros(n_inputs)),
+            "seat_acc": (A[1], B[1]),
+            "body_disp": (np.array([0, 0, 1.0, 0, 0, 0]), np.zeros(n_inputs)),
+            "body_acc": (A[3], B[3]),
+            "wheel_disp": (np.array([0, 0, 0, 0, 1.0, 0]), np.zeros(n_inputs)),
+            "wheel_acc": (A[5], B[5]),
+            "seat_travel": (np.array([1.0, 0, -1.0, 0, 0, 0]), np.zeros(n_inputs)),
+            "suspension_travel": (
+                np.array([0, 0, 1.0, 0, -1.0, 0]),
+                np.zeros(n_inputs),
+            ),
+            "tire_force": (
+                np.array([0, 0, 0, 0, -ku, 0]),
+                np.pad([ku], (0, n_inputs - 1)),
+            ),
+        }
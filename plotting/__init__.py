@@ -2,4 +2,5 @@
     QuarterCarPlottingStrategy,
     SeatAddedQuarterCarPlottingStrategy,
     HalfCarPlottingStrategy,
+    FrequencyResponsePlottingStrategy,
 )
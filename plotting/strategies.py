@@ -85,9 +85,9 @@ def plot(self, analysis_data):
         plt.rcParams["font.size"] = configuration.PLOT_STYLE["font_size"]
         plt.rcParams["font.family"] = configuration.PLOT_STYLE["font_family"]
 
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
-        road_profile = np.array(analysis_data["results"]["road_profile"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
+        road_profile = np.asarray(analysis_data["results"]["road_profile"])
 
         z_s_data = y_data[0]  # sprung mass displacement
         z_s_dot_data = y_data[1]  # sprung mass velocity
@@ -188,9 +188,9 @@ def plot(self, analysis_data):
         plt.rcParams["font.size"] = configuration.PLOT_STYLE["font_size"]
         plt.rcParams["font.family"] = configuration.PLOT_STYLE["font_family"]
 
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
-        road_profile = np.array(analysis_data["results"]["road_profile"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
+        road_profile = np.asarray(analysis_data["results"]["road_profile"])
 
         # Extract displacement data
         z_seat_data = y_data[0]  # seat displacement
@@ -306,9 +306,9 @@ def plot(self, analysis_data):
 class HalfCarPlottingStrategy(PlottingStrategy):
     def plot(self, analysis_data):
         # Extract data
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
-        road_profile = np.array(analysis_data["results"]["road_profile"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
+        road_profile = np.asarray(analysis_data["results"]["road_profile"])
         # Displacements and angles
         z_s_data = y_data[0]  # sprung mass displacement
         z_s_dot_data = y_data[1]  # sprung mass velocity
@@ -476,7 +476,88 @@ def plot(self, analysis_data):
         plt.show()
 
 
+class FrequencyResponsePlottingStrategy(PlottingStrategy):
+    def plot(self, frequency_response):
+        """
+        Plots the frequency response of a vehicle model as a Bode diagram.
+
+        Args:
+            frequency_response (FrequencyResponse): Transfer functions of the output
+                                channels, e.g. from analysis.frequency_response.
+
+        Returns:
+            None: Displays magnitude and phase subplots of every channel.
+        """
+        plt.rcParams["font.size"] = configuration.PLOT_STYLE["font_size"]
+        plt.rcParams["font.family"] = configuration.PLOT_STYLE["font_family"]
+
+        frequencies = frequency_response.frequencies
+        colors = configuration.PLOT_STYLE["colors"]
+
+        fig, (ax1, ax2) = plt.subplots(
+            2, 1, figsize=configuration.PLOT_STYLE["figure_size"], sharex=True
+        )
+
+        for i, channel in enumerate(frequency_response.responses):
+            ax1.loglog(
+                frequencies,
+                frequency_response.magnitude(channel),
+                label=channel,
+                linewidth=configuration.PLOT_STYLE["line_width"],
+                color=colors[i % len(colors)],
+            )
+            ax2.semilogx(
+                frequencies,
+                frequency_response.phase(channel),
+                label=channel,
+                linewidth=configuration.PLOT_STYLE["line_width"],
+                color=colors[i % len(colors)],
+            )
+
+        ax1.set_title(
+            f"{frequency_response.model_type} Frequency Response - Magnitude",
+            fontsize=configuration.PLOT_STYLE["title_size"],
+            fontweight=configuration.PLOT_STYLE["title_weight"],
+        )
+        ax1.set_ylabel(
+            "|H(jω)| [-]", fontsize=configuration.PLOT_STYLE["axis_label_size"]
+        )
+        ax1.legend(
+            fontsize=configuration.PLOT_STYLE["legend_font_size"],
+            loc=configuration.PLOT_STYLE["legend_location"],
+        )
+        ax1.grid(
+            True,
+            which="both",
+            linewidth=configuration.PLOT_STYLE["grid_style"].get("linewidth", 1),
+        )
+
+        ax2.set_title(
+            f"{frequency_response.model_type} Frequency Response - Phase",
+            fontsize=configuration.PLOT_STYLE["title_size"],
+            fontweight=configuration.PLOT_STYLE["title_weight"],
+        )
+        ax2.set_xlabel(
+            "Frequency [Hz]", fontsize=configuration.PLOT_STYLE["axis_label_size"]
+        )
+        ax2.set_ylabel(
+            "Phase [degree]", fontsize=configuration.PLOT_STYLE["axis_label_size"]
+        )
+        ax2.grid(
+            True,
+            which="both",
+            linewidth=configuration.PLOT_STYLE["grid_style"].get("linewidth", 1),
+        )
+
+        plt.tight_layout()
+        plt.show()
+
+
 class PerformanceMetricsStrategy(ABC):
+    @abstractmethod
+    def compute_metrics(self, analysis_data):
+        pass
+
     @abstractmethod
     def calculate_performance_metrics(self, analysis_data):
         pass
@@ -486,22 +567,18 @@ class QuarterCarPerformanceMetricsStrategy(PerformanceMetricsStrategy):
     def __init__(self, params=QuarterCarOutouts()):
         self.params = params
 
-    def calculate_performance_metrics(self, analysis_data):
+    def compute_metrics(self, analysis_data):
         """
-        Calculates and displays performance metrics for quarter car simulation.
+        Calculates the performance metrics without displaying them.
 
         Args:
             analysis_data (dict): Dictionary containing simulation results and metadata.
 
-        Updates:
-            self.params: Updates the QuarterCarOutputs dataclass with calculated metrics.
+        Returns:
+            QuarterCarOutouts: The updated metrics dataclass.
         """
-        # Implement performance metrics calculation for quarter car
-        name = analysis_data["name"]
-        execution_date = analysis_data["execution_date"]
-
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
 
         z_s_data = y_data[0]
         z_s_dot_data = y_data[1]
@@ -521,6 +598,24 @@ def calculate_performance_metrics(self, analysis_data):
         self.params.rms_acc_ms = np.sqrt(np.mean(z_s_ddot_data**2))
         self.params.disp_range = np.ptp(z_s_data)
 
+        return self.params
+
+    def calculate_performance_metrics(self, analysis_data):
+        """
+        Calculates and displays performance metrics for quarter car simulation.
+
+        Args:
+            analysis_data (dict): Dictionary containing simulation results and metadata.
+
+        Updates:
+            self.params: Updates the QuarterCarOutputs dataclass with calculated metrics.
+        """
+        # Implement performance metrics calculation for quarter car
+        name = analysis_data["name"]
+        execution_date = analysis_data["execution_date"]
+
+        self.compute_metrics(analysis_data)
+
         # Get significant figures from configuration
         sig_figs = configuration.TABLE_STYLE["significant_figures"]
 
@@ -565,21 +660,18 @@ class SeatAddedQuarterCarPerformanceMetricsStrategy(PerformanceMetricsStrategy):
     def __init__(self, params=SeatAddedQuarterCarOutouts()):
         self.params = params
 
-    def calculate_performance_metrics(self, analysis_data):
+    def compute_metrics(self, analysis_data):
         """
-        Calculates and displays performance metrics for seat-added quarter car simulation.
+        Calculates the performance metrics without displaying them.
 
         Args:
             analysis_data (dict): Dictionary containing simulation results and metadata.
 
-        Updates:
-            self.params: Updates the SeatAddedQuarterCarOutouts dataclass with calculated metrics.
+        Returns:
+            SeatAddedQuarterCarOutouts: The updated metrics dataclass.
         """
-        name = analysis_data["name"]
-        execution_date = analysis_data["execution_date"]
-
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
 
         # Extract data
         z_seat_data = y_data[0]  # seat displacement
@@ -611,6 +703,23 @@ def calculate_performance_metrics(self, analysis_data):
         self.params.disp_range_seat = np.ptp(z_seat_data)
         self.params.disp_range_ms = np.ptp(z_s_data)
 
+        return self.params
+
+    def calculate_performance_metrics(self, analysis_data):
+        """
+        Calculates and displays performance metrics for seat-added quarter car simulation.
+
+        Args:
+            analysis_data (dict): Dictionary containing simulation results and metadata.
+
+        Updates:
+            self.params: Updates the SeatAddedQuarterCarOutouts dataclass with calculated metrics.
+        """
+        name = analysis_data["name"]
+        execution_date = analysis_data["execution_date"]
+
+        self.compute_metrics(analysis_data)
+
         # Get significant figures from configuration
         sig_figs = configuration.TABLE_STYLE["significant_figures"]
 
@@ -673,21 +782,18 @@ class HalfCarPerformanceMetricsStrategy(PerformanceMetricsStrategy):
     def __init__(self, params=HalfCarOutouts()):
         self.params = params
 
-    def calculate_performance_metrics(self, analysis_data):
+    def compute_metrics(self, analysis_data):
         """
-        Calculates and displays performance metrics for half car simulation.
+        Calculates the performance metrics without displaying them.
 
         Args:
             analysis_data (dict): Dictionary containing simulation results and metadata.
 
-        Updates:
-            self.params: Updates the HalfCarOutouts dataclass with calculated metrics.
+        Returns:
+            HalfCarOutouts: The updated metrics dataclass.
         """
-        name = analysis_data["name"]
-        execution_date = analysis_data["execution_date"]
-
-        time_data = np.array(analysis_data["results"]["t"])
-        y_data = np.array(analysis_data["results"]["y"])
+        time_data = np.asarray(analysis_data["results"]["t"])
+        y_data = np.asarray(analysis_data["results"]["y"])
 
         # Extract data
         z_s_data = y_data[0]  # sprung mass displacement
@@ -735,6 +841,23 @@ def calculate_performance_metrics(self, analysis_data):
 
         self.params.disp_range = np.ptp(z_s_data)
 
+        return self.params
+
+    def calculate_performance_metrics(self, analysis_data):
+        """
+        Calculates and displays performance metrics for half car simulation.
+
+        Args:
+            analysis_data (dict): Dictionary containing simulation results and metadata.
+
+        Updates:
+            self.params: Updates the HalfCarOutouts dataclass with calculated metrics.
+        """
+        name = analysis_data["name"]
+        execution_date = analysis_data["execution_date"]
+
+        self.compute_metrics(analysis_data)
+
         # Get significant figures from configuration
         sig_figs = configuration.TABLE_STYLE["significant_figures"]
 
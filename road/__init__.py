@@ -1 +1,2 @@
-from .profiles import RoadProfile
+from .profiles import RoadProfile, CombinedRoadProfile
+from .spectral import ISO8608Road, ISO_8608_ROAD_CLASSES
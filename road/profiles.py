@@ -16,6 +16,27 @@ def __init__(self, profile_type, **kwargs):
         self.profile_type = profile_type
         self.params = kwargs
 
+    def __add__(self, other):
+        """
+        Superimpose two road profiles.
+
+        Args:
+            other (RoadProfile): The road profile to add.
+
+        Returns:
+            CombinedRoadProfile: The sum of both road profiles.
+        """
+        return CombinedRoadProfile(self.components() + other.components())
+
+    def components(self):
+        """
+        Return the single road profiles this profile is made of.
+
+        Returns:
+            list[RoadProfile]: The profile itself for a single road profile.
+        """
+        return [self]
+
     def get_profile(self, t):
         """
         Get the road profile value at a given time.
@@ -67,3 +88,46 @@ def plot_profile(self, t):
         plt.ylabel("Displacement [m]")
         plt.grid(True)
         plt.show()
+
+
+class CombinedRoadProfile(RoadProfile):
+    """Class representing the sum of several road profiles."""
+
+    def __init__(self, profiles):
+        """
+        Initialize the CombinedRoadProfile with the profiles to superimpose.
+
+        Args:
+            profiles (list[RoadProfile]): Road profiles to add up.
+        """
+        self.profiles = [
+            component for profile in profiles for component in profile.components()
+        ]
+        super().__init__(
+            "combined",
+            components=[
+                {"type": profile.profile_type, "params": profile.params}
+                for profile in self.profiles
+            ],
+        )
+
+    def components(self):
+        """
+        Return the single road profiles this profile is made of.
+
+        Returns:
+            list[RoadProfile]: The superimposed road profiles.
+        """
+        return list(self.profiles)
+
+    def get_profile(self, t):
+        """
+        Get the combined road profile value at a given time.
+
+        Args:
+            t (float): Time variable.
+
+        Returns:
+            float: Sum of the road profile displacements at time t.
+        """
+        return sum(profile.get_profile(t) for profile in self.profiles)
@@ -0,0 +1,107 @@
+import numpy as np
+from dataclasses import dataclass
+from scipy.signal import lfilter
+
+# Geometric mean of the displacement PSD Gd(n0) at n0 = 0.1 cycles/m [m³]
+ISO_8608_ROAD_CLASSES = {
+    "A": 16e-6,
+    "B": 64e-6,
+    "C": 256e-6,
+    "D": 1024e-6,
+    "E": 4096e-6,
+    "F": 16384e-6,
+    "G": 65536e-6,
+    "H": 262144e-6,
+}
+
+
+@dataclass
+class ISO8608Road:
+    """
+    Random road described by its ISO 8608 displacement power spectral density.
+
+    The spectrum Gd(n) = Gd(n0) (n / n0)^-2 is realized as shaped white noise
+    z_r' = -alpha z_r + q w(t), where w has unit intensity and alpha sets the
+    lower cut-off spatial frequency.
+    """
+
+    road_class: str = "C"  # ISO 8608 road class from "A" to "H"
+    velocity: float = 20.0  # Vehicle speed [m/s]
+    cutoff_wavenumber: float = 0.011  # Lower cut-off spatial frequency [cycles/m]
+    reference_wavenumber: float = 0.1  # Reference spatial frequency n0 [cycles/m]
+    roughness: float = None  # Gd(n0) [m³], taken from road_class if None
+
+    def reference_psd(self):
+        """
+        Return the displacement PSD Gd(n0) at the reference spatial frequency.
+
+        Returns:
+            float: Road roughness Gd(n0) [m³].
+
+        Raises:
+            ValueError: If the road class is unsupported.
+        """
+        if self.roughness is not None:
+            return self.roughness
+        if self.road_class not in ISO_8608_ROAD_CLASSES:
+            raise ValueError(f"Unsupported ISO 8608 road class: {self.road_class}")
+        return ISO_8608_ROAD_CLASSES[self.road_class]
+
+    def shaping_filter(self):
+        """
+        Return the first order shaping filter of the road displacement.
+
+        Returns:
+            tuple[float, float]: Pole alpha [1/s] and white noise gain q of
+                z_r' = -alpha z_r + q w(t).
+        """
+        alpha = 2 * np.pi * self.cutoff_wavenumber * self.velocity
+        q = (
+            2
+            * np.pi
+            * self.reference_wavenumber
+            * np.sqrt(self.reference_psd() * self.velocity / 2)
+        )
+        return alpha, q
+
+    def psd(self, frequencies):
+        """
+        Return the one-sided temporal displacement PSD of the road.
+
+        Args:
+            frequencies (np.ndarray): Temporal frequencies [Hz].
+
+        Returns:
+            np.ndarray: Displacement PSD [m²/Hz] of the shaped white noise.
+        """
+        alpha, q = self.shaping_filter()
+        omega = 2 * np.pi * np.asarray(frequencies)
+        return 2 * q**2 / (omega**2 + alpha**2)
+
+    def generate(self, t, seed=None):
+        """
+        Generate a road displacement realization at equally spaced time points.
+
+        The shaping filter is discretized exactly, so the samples have the same
+        covariance as the continuous road model.
+
+        Args:
+            t (np.ndarray): Equally spaced time points [s].
+            seed (int, optional): Seed of the random number generator.
+
+        Returns:
+            np.ndarray: Road displacement [m] at the time points.
+        """
+        t = np.asarray(t, dtype=float)
+        alpha, q = self.shaping_filter()
+        rng = np.random.default_rng(seed)
+
+        dt = t[1] - t[0] if len(t) > 1 else 0.0
+        decay = np.exp(-alpha * dt)
+        stationary_std = q / np.sqrt(2 * alpha)
+        noise = rng.standard_normal(len(t))
+        noise[1:] *= stationary_std * np.sqrt(1 - decay**2)
+        noise[0] *= stationary_std
+
+        # z[k] = decay * z[k-1] + noise[k] as a first order recursive filter
+        return lfilter([1.0], [1.0, -decay], noise)
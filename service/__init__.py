@@ -0,0 +1,2 @@
+from .jobs import MODEL_REGISTRY, batch_key, parse_job, run_jobs
+from .server import SimulationServer, SimulationService
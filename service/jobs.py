@@ -0,0 +1,236 @@
+import numbers
+import numpy as np
+from dataclasses import asdict
+from datetime import datetime
+from models import (
+    HalfCarModel,
+    HalfCarModelInitialConditions,
+    HalfCarModelParams,
+    QuarterCarInitialConditions,
+    QuarterCarModel,
+    QuarterCarParams,
+    SeatAddedQuarterCarModel,
+    SeatAddedQuarterCarModelInitialConditions,
+    SeatAddedQuarterCarParams,
+)
+from road.profiles import RoadProfile
+from simulation.integration import integrate, integrate_batch
+from simulation.shared import SharedArray
+
+#: Model class, parameter and initial condition dataclasses per model name.
+MODEL_REGISTRY = {
+    "QuarterCarModel": (
+        QuarterCarModel,
+        QuarterCarParams,
+        QuarterCarInitialConditions,
+    ),
+    "SeatAddedQuarterCarModel": (
+        SeatAddedQuarterCarModel,
+        SeatAddedQuarterCarParams,
+        SeatAddedQuarterCarModelInitialConditions,
+    ),
+    "HalfCarModel": (
+        HalfCarModel,
+        HalfCarModelParams,
+        HalfCarModelInitialConditions,
+    ),
+}
+
+
+def parse_job(spec):
+    """
+    Validate a job spec and return it in normalized form.
+
+    A job spec is a JSON object such as::
+
+        {"model": "QuarterCarModel", "params": {"ms": 300},
+         "road": {"type": "sinusoidal", "params": {"amplitude": 0.02,
+                                                    "frequency": 1.5}},
+         "t_span": [0, 5], "t_eval": {"start": 0, "stop": 5, "num": 501}}
+
+    ``params`` and ``initial_conditions`` override the model defaults, and
+    ``t_eval`` is either a list of time points or a linspace specification.
+
+    Args:
+        spec (dict): The job spec.
+
+    Returns:
+        dict: The normalized job spec.
+
+    Raises:
+        ValueError: If the spec is incomplete or names unknown models or fields.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("A job spec must be a JSON object")
+    missing = [key for key in ("model", "road", "t_span") if key not in spec]
+    if missing:
+        raise ValueError(f"Missing job spec fields: {missing}")
+    if spec["model"] not in MODEL_REGISTRY:
+        raise ValueError(f"Unsupported vehicle model: {spec['model']}")
+
+    _, params_class, conditions_class = MODEL_REGISTRY[spec["model"]]
+    for field in ("params", "initial_conditions"):
+        values = spec.get(field, {})
+        if not isinstance(values, dict):
+            raise ValueError(f"{field} must be a JSON object")
+        invalid = [
+            key
+            for key, value in values.items()
+            if not isinstance(value, numbers.Real) or isinstance(value, bool)
+        ]
+        if invalid:
+            raise ValueError(f"Non-numeric {field}: {invalid}")
+    try:
+        params = asdict(params_class(**spec.get("params", {})))
+        initial_conditions = asdict(
+            conditions_class(**spec.get("initial_conditions", {}))
+        )
+    except TypeError as error:
+        raise ValueError(f"Invalid model fields: {error}") from error
+
+    road = spec["road"]
+    if not isinstance(road, dict) or "type" not in road:
+        raise ValueError("The road must be an object with a type")
+    try:
+        road = {"type": road["type"], "params": dict(road.get("params", {}))}
+        RoadProfile(road["type"], **road["params"]).get_profile(0.0)
+    except KeyError as error:
+        raise ValueError(f"Missing road parameter: {error}") from error
+    except TypeError as error:
+        raise ValueError(f"Invalid road parameters: {error}") from error
+
+    try:
+        t_span = [float(value) for value in spec["t_span"]]
+        if len(t_span) != 2:
+            raise ValueError("t_span must hold a start and an end time")
+        t_eval = spec.get("t_eval")
+        if t_eval is None:
+            t_eval = {"start": t_span[0], "stop": t_span[1], "num": 1001}
+        if isinstance(t_eval, dict):
+            t_eval = np.linspace(t_eval["start"], t_eval["stop"], int(t_eval["num"]))
+        t_eval = [float(value) for value in t_eval]
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"Invalid time settings: {error}") from error
+
+    return {
+        "name": str(spec.get("name", "Unnamed Simulation")),
+        "model": spec["model"],
+        "params": params,
+        "initial_conditions": initial_conditions,
+        "road": road,
+        "t_span": t_span,
+        "t_eval": t_eval,
+        "store": bool(spec.get("store", False)),
+    }
+
+
+def batch_key(job):
+    """
+    Return the key under which jobs can be solved together.
+
+    Jobs of one model type on the same road and time grid share one batched
+    solve, whatever their parameters and initial conditions. Every model of a
+    batch keeps its own road input delays.
+
+    Args:
+        job (dict): Normalized job spec.
+
+    Returns:
+        tuple: The batch key.
+    """
+    return (
+        job["model"],
+        job["road"]["type"],
+        tuple(sorted(job["road"]["params"].items())),
+        tuple(job["t_span"]),
+        len(job["t_eval"]),
+        hash(tuple(job["t_eval"])),
+    )
+
+
+def run_jobs(jobs):
+    """
+    Simulate a batch of compatible jobs, in a worker process of the service.
+
+    Args:
+        jobs (list[dict]): Normalized job specs sharing one batch key.
+
+    The result arrays are written to shared memory, so only small handles are
+    returned to the service process.
+
+    Returns:
+        list[dict]: Analysis data of every job with SharedArray handles, see
+            ``SimulationCollector.adopt_shared_analysis``.
+    """
+    first = jobs[0]
+    model_class, params_class, conditions_class = MODEL_REGISTRY[first["model"]]
+    vehicle_models = [
+        model_class(
+            params_class(**job["params"]),
+            conditions_class(**job["initial_conditions"]),
+        )
+        for job in jobs
+    ]
+    road = RoadProfile(first["road"]["type"], **first["road"]["params"])
+    t_eval = np.array(first["t_eval"])
+
+    if all(model.is_linear for model in vehicle_models):
+        results = integrate_batch(
+            vehicle_models, road.get_profile, first["t_span"], t_eval
+        )
+    else:
+        results = [
+            integrate(
+                model,
+                road.get_profile,
+                model.initial_conditions,
+                first["t_span"],
+                t_eval,
+            )
+            for model in vehicle_models
+        ]
+
+    execution_date = datetime.now().isoformat()
+    shared = []
+    analyses = []
+    try:
+        for job, model, result in zip(jobs, vehicle_models, results):
+            arrays = {
+                "t": result.t,
+                "y": result.y,
+                "road_profile": road.get_profile(result.t),
+                "t_eval": t_eval,
+            }
+            handles = {}
+            for key, array in arrays.items():
+                handles[key] = SharedArray.from_array(array)
+                shared.append(handles[key])
+            analyses.append(
+                {
+                    "name": job["name"],
+                    "execution_date": execution_date,
+                    "vehicle_model": {
+                        "type": job["model"],
+                        "params": model.params,
+                        "initial_conditions": model.initial_conditions,
+                    },
+                    "road_profile": job["road"],
+                    "results": {
+                        key: handles[key] for key in ("t", "y", "road_profile")
+                    },
+                    "t_span": job["t_span"],
+                    "t_eval": handles["t_eval"],
+                }
+            )
+    except BaseException:
+        # the blocks are no longer tracked, so free them before failing
+        for handle in shared:
+            handle.unlink()
+        raise
+    return analyses
+
+
+def warm_up():
+    """Import the numerical stack once when a worker process starts."""
+    import scipy.integrate  # noqa: F401
+    import scipy.linalg  # noqa: F401
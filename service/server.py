@@ -0,0 +1,328 @@
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from simulation.collector import SimulationCollector
+from .jobs import batch_key, parse_job, run_jobs, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationService:
+    """
+    Queue of simulation jobs solved in batches on a persistent process pool.
+
+    Jobs that share a batch key (model type, road and time grid) are collected for
+    up to ``batch_window`` seconds and solved together in one worker call. Workers
+    return their result arrays in shared memory. Stored results are kept there by
+    a SimulationCollector and fetched by their handle.
+    """
+
+    def __init__(self, workers=2, max_batch=32, batch_window=0.005, history=1000):
+        """
+        Initialize the SimulationService and start its worker pool.
+
+        Args:
+            workers (int): Number of worker processes.
+            max_batch (int): Maximum number of jobs per batched solve.
+            batch_window (float): Time to wait for further compatible jobs [s].
+            history (int): Number of recent jobs kept for latency statistics.
+        """
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.collector = SimulationCollector()
+        self.started = time.time()
+        self.latencies = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+        self.in_flight = 0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=warm_up)
+        self._running = True
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, spec):
+        """
+        Queue a job for simulation.
+
+        Args:
+            spec (dict): Job spec, see ``parse_job``.
+
+        Returns:
+            Future: Resolves to the analysis data, or to a handle for stored jobs.
+
+        Raises:
+            ValueError: If the job spec is invalid.
+            RuntimeError: If the service is shut down.
+        """
+        return self.submit_many([spec])[0]
+
+    def submit_many(self, specs):
+        """
+        Queue several jobs, after validating all of them.
+
+        Args:
+            specs (list[dict]): Job specs, see ``parse_job``.
+
+        Returns:
+            list[Future]: A future per job, see ``submit``.
+
+        Raises:
+            ValueError: If any job spec is invalid. No job is queued then.
+            RuntimeError: If the service is shut down.
+        """
+        jobs = [parse_job(spec) for spec in specs]
+        futures = []
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("The simulation service is shut down")
+            for job in jobs:
+                futures.append(Future())
+                self._queue.put((job, futures[-1], time.perf_counter()))
+        return futures
+
+    def _dispatch(self):
+        """Collect compatible jobs into batches and hand them to the pool."""
+        while self._running:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+
+            batches = {batch_key(first[0]): [first]}
+            deadline = time.perf_counter() + self.batch_window
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._running = False
+                    break
+                batch = batches.setdefault(batch_key(item[0]), [])
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+
+            for batch in batches.values():
+                for start in range(0, len(batch), self.max_batch):
+                    self._run_batch(batch[start : start + self.max_batch])
+
+    def _run_batch(self, items):
+        with self._lock:
+            self.in_flight += len(items)
+        self.batch_sizes.append(len(items))
+        worker_future = self._executor.submit(run_jobs, [item[0] for item in items])
+        worker_future.add_done_callback(
+            lambda completed: self._complete(items, completed)
+        )
+
+    def _complete(self, items, completed):
+        with self._lock:
+            self.in_flight -= len(items)
+        error = completed.exception()
+        if error is not None:
+            logger.error("Simulation batch failed: %s", error)
+            for _, future, _ in items:
+                future.set_exception(error)
+            return
+
+        for (job, future, submitted), analysis in zip(items, completed.result()):
+            self.latencies.append(time.perf_counter() - submitted)
+            if job["store"]:
+                # stored results stay in the shared buffers written by the worker
+                handle = uuid.uuid4().hex
+                analysis["name"] = handle
+                self.collector.adopt_shared_analysis(analysis)
+                future.set_result({"handle": handle, "url": f"/results/{handle}"})
+            else:
+                future.set_result(_read_shared(analysis))
+
+    def health(self):
+        """Return the service status."""
+        return {
+            "status": "ok" if self._running else "stopping",
+            "workers": self.workers,
+            "uptime": time.time() - self.started,
+        }
+
+    def queue_depth(self):
+        """Return the number of queued and running jobs."""
+        with self._lock:
+            in_flight = self.in_flight
+        return {"queued": self._queue.qsize(), "in_flight": in_flight}
+
+    def latency(self):
+        """Return end-to-end latency statistics of recent jobs [s]."""
+        latencies = np.array(self.latencies)
+        if len(latencies) == 0:
+            return {"count": 0}
+        return {
+            "count": len(latencies),
+            "mean": float(np.mean(latencies)),
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "max": float(np.max(latencies)),
+            "mean_batch_size": float(np.mean(self.batch_sizes)),
+        }
+
+    def shutdown(self):
+        """
+        Stop the dispatcher and the worker pool and free the stored results.
+
+        Running batches are completed, jobs still waiting in the queue fail.
+        """
+        with self._lock:
+            self._running = False
+            self._queue.put(None)
+        self._dispatcher.join()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(
+                    RuntimeError("The simulation service was shut down")
+                )
+        self._executor.shutdown()
+        self.collector.release()
+
+
+def _read_shared(analysis_data):
+    """Return shared analysis data with JSON types and free its shared buffers."""
+    collector = SimulationCollector()
+    collector.adopt_shared_analysis(analysis_data)
+    data = collector.get_analysis(analysis_data["name"]).to_dict()
+    collector.release()
+    return data
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints of the SimulationServer."""
+
+    service = None
+    timeout_seconds = 300
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        elif self.path == "/queue":
+            self._send(200, self.service.queue_depth())
+        elif self.path == "/latency":
+            self._send(200, self.service.latency())
+        elif self.path.startswith("/results/"):
+            analysis = self.service.collector.get_analysis(self.path.split("/")[-1])
+            if analysis is None:
+                self._send(404, {"error": "Unknown result handle"})
+            else:
+                self._send(200, analysis.to_dict())
+        else:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/simulate":
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            spec = json.loads(self.rfile.read(length))
+            specs = spec if isinstance(spec, list) else [spec]
+            futures = self.service.submit_many(specs)
+        except (TypeError, ValueError) as error:
+            self._send(400, {"error": str(error)})
+            return
+        except RuntimeError as error:
+            self._send(503, {"error": str(error)})
+            return
+
+        try:
+            results = [
+                future.result(timeout=self.timeout_seconds) for future in futures
+            ]
+        except Exception as error:
+            self._send(500, {"error": str(error)})
+            return
+        self._send(200, results if isinstance(spec, list) else results[0])
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class SimulationServer:
+    """
+    Local HTTP server in front of a SimulationService.
+
+    Endpoints:
+        ``POST /simulate``: Run a job spec (or a list of them) and return the
+            analysis data, or a result handle for specs with ``"store": true``.
+        ``GET /results/<handle>``: Return a stored result.
+        ``GET /health``, ``GET /queue``, ``GET /latency``: Service status, queue
+            depth and latency statistics.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, **service_options):
+        """
+        Initialize the SimulationServer.
+
+        Args:
+            host (str): Interface to listen on, localhost by default.
+            port (int): Port to listen on, a free port if 0.
+            **service_options: Arguments of the SimulationService.
+        """
+        self.service = SimulationService(**service_options)
+        handler = type("RequestHandler", (_RequestHandler,), {"service": self.service})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Simulation server listening on %s", self.url)
+
+    def serve_forever(self):
+        """Serve requests until interrupted."""
+        logger.info("Simulation server listening on %s", self.url)
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop serving and shut the worker pool down."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self.service.shutdown()
@@ -1,3 +1,32 @@
 from .controller import SimulationControl
 from .visualizer import ResultsVisualization
 from .collector import SimulationCollector
+from .records import AnalysisRecord
+from .convolution import ConvolutionEngine, TransformedRoad
+from .superposition import SuperpositionCache
+from .periodic import periodic_steady_state, steady_state_amplitudes
+from .piecewise import BumpStop, PiecewiseLinearEngine, TireLiftOff
+from .control_loop import (
+    ActuatorGeometry,
+    ControlLoop,
+    GroundhookController,
+    SkyhookController,
+    StateFeedbackController,
+    SuspensionController,
+    actuator_geometry,
+)
+from .asynchronous import AsyncSimulationRunner
+from .shared import SharedArray, run_shared, share_results
+from .index import AnalysisIndex, default_metrics
+from .session import SessionStore
+from .checkpoint import CheckpointedRun, run_sweep
+from .jsonstream import convert_session, iter_session, write_session
+from .storage import (
+    ChannelReport,
+    StoragePolicy,
+    StorageReport,
+    decode_array,
+    encode_array,
+    table_style_policies,
+)
+from .outputs import OutputRecorder, OutputSpec
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .integration import integrate
+from .outputs import OutputRecorder
+
+
+def _run(simulation):
+    """Run a simulation in a worker and return it with its results."""
+    simulation.run_simulation()
+    return simulation
+
+
+class AsyncSimulationRunner:
+    """
+    Asyncio facade running blocking simulations on an executor.
+
+    Every solve is handed to the executor, a process pool by default, so the event
+    loop stays responsive. At most ``max_concurrency`` solves are submitted at a
+    time, the rest wait without occupying the executor. Cancelling a job that has
+    not started frees its slot at once; a solve that is already running finishes in
+    its worker and its result is discarded.
+    """
+
+    def __init__(self, executor=None, max_concurrency=None):
+        """
+        Initialize the AsyncSimulationRunner.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): Executor running the
+                solves. A process pool owned by the runner if None.
+            max_concurrency (int, optional): Maximum number of solves submitted to
+                the executor at a time, the number of CPUs by default.
+        """
+        self._owns_executor = executor is None
+        self.executor = ProcessPoolExecutor() if executor is None else executor
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        """Shut the executor down if it is owned by the runner."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _call(self, function, *args):
+        """Run a blocking function on the executor once a slot is free."""
+        # created here, so the semaphore belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+
+    async def run(self, simulation):
+        """
+        Run a simulation without blocking the event loop.
+
+        Args:
+            simulation (SimulationControl): The simulation to run.
+
+        Returns:
+            SimulationControl: The simulation, with its results set.
+        """
+        completed = await self._call(_run, simulation)
+        # a process pool returns a copy of the simulation
+        simulation.results = completed.results
+        simulation.execution_date = completed.execution_date
+        return simulation
+
+    def submit(self, simulation):
+        """
+        Schedule a simulation on the running event loop.
+
+        Args:
+            simulation (SimulationControl): The simulation to run.
+
+        Returns:
+            asyncio.Task: Task resolving to the simulation, which can be cancelled.
+        """
+        return asyncio.ensure_future(self.run(simulation))
+
+    async def run_all(self, simulations):
+        """
+        Run several simulations and return them in the given order.
+
+        Args:
+            simulations (list[SimulationControl]): The simulations to run.
+
+        Returns:
+            list[SimulationControl]: The simulations with their results.
+        """
+        return await asyncio.gather(*(self.submit(s) for s in simulations))
+
+    async def as_completed(self, simulations):
+        """
+        Run several simulations and yield each one as soon as it has finished.
+
+        Jobs still pending when the generator is closed early are cancelled.
+
+        Args:
+            simulations (Iterable[SimulationControl]): The simulations to run.
+
+        Yields:
+            SimulationControl: Finished simulations in completion order.
+        """
+        tasks = [self.submit(simulation) for simulation in simulations]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                yield await next_completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(self, simulation, chunk_size=1000):
+        """
+        Integrate a simulation in chunks of output samples and yield each chunk.
+
+        Every chunk is a separate solve continuing from the last state of the
+        previous one, so partial results arrive while the simulation proceeds and
+        other jobs can share the executor in between. The equations of motion are
+        always integrated, the engine and cache of the simulation are not used.
+        With an output specification on the simulation, every chunk is reduced
+        to the selected states and derived channels as soon as it is solved.
+
+        Args:
+            simulation (SimulationControl): The simulation to run.
+            chunk_size (int): Number of recorded time points per chunk.
+
+        Yields:
+            OdeResult: Solution of every chunk with ``t``, ``y`` and
+                ``road_profile``, and ``outputs`` with an output specification.
+        """
+        model = simulation.vehicle_model
+        road_input = simulation.road_profile.get_profile
+        t_eval = np.asarray(simulation.t_eval, dtype=float)
+        recorder = None
+        if simulation.output is not None:
+            recorder = OutputRecorder(simulation.output, model, road_input)
+            t_eval = simulation.output.sample_times(t_eval)
+        t_start, t_stop = simulation.t_span
+        state = model.initial_conditions
+
+        for start in range(0, len(t_eval), chunk_size):
+            t_chunk = t_eval[start : start + chunk_size]
+            t_end = t_stop if start + chunk_size >= len(t_eval) else t_chunk[-1]
+            result = await self._call(
+                integrate, model, road_input, state, (t_start, t_end), t_chunk
+            )
+            t_start, state = result.t[-1], result.y[:, -1]
+            if recorder is not None:
+                result = recorder.reduce(result)
+            result.road_profile = road_input(result.t)
+            yield result
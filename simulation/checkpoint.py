@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import numpy as np
+from scipy.optimize import OptimizeResult
+from .collector import SimulationCollector
+from .integration import integrate
+from .records import AnalysisRecord
+from .session import SessionStore
+
+
+def _write_json(path, data):
+    """Replace a JSON file atomically."""
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+class CheckpointedRun:
+    """
+    Simulation integrated in chunks, with a checkpoint after every chunk.
+
+    The integrator restarts at every chunk boundary from the state reached at the
+    end of the previous chunk. The checkpoint holds that time and state, the index
+    of the next output sample (the road cursor) and running sums of the RMS and
+    peak metrics, and the trajectory is appended to a binary file. As chunk
+    boundaries depend only on ``chunk_size``, a run resumed from a checkpoint
+    gives results identical to an uninterrupted run.
+    """
+
+    def __init__(self, simulation, directory, chunk_size=10000):
+        """
+        Initialize the CheckpointedRun.
+
+        Args:
+            simulation (SimulationControl): The simulation to run. Its equations
+                of motion are integrated; an engine or cache is not used.
+            directory (str): Directory of the checkpoint files.
+            chunk_size (int): Number of output samples per chunk.
+        """
+        self.simulation = simulation
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.t_eval = np.asarray(simulation.t_eval, dtype=float)
+        self.n_states = len(simulation.vehicle_model.initial_conditions)
+        os.makedirs(directory, exist_ok=True)
+        self._checkpoint_path = os.path.join(directory, "checkpoint.json")
+        self._trajectory_path = os.path.join(directory, "trajectory.bin")
+
+    def _fingerprint(self):
+        """Return a hash of everything the results depend on."""
+        model = self.simulation.vehicle_model
+        road = self.simulation.road_profile
+        setup = repr(
+            (
+                type(model).__name__,
+                sorted(model.params.items()),
+                list(model.initial_conditions),
+                road.profile_type,
+                sorted(road.params.items()),
+                list(self.simulation.t_span),
+                self.chunk_size,
+            )
+        ).encode()
+        return hashlib.sha1(setup + self.t_eval.tobytes()).hexdigest()
+
+    def _initial_checkpoint(self):
+        return {
+            "fingerprint": self._fingerprint(),
+            "index": 0,
+            "t": float(self.simulation.t_span[0]),
+            "state": [
+                float(x) for x in self.simulation.vehicle_model.initial_conditions
+            ],
+            "sum_squares": [0.0] * self.n_states,
+            "peak": [0.0] * self.n_states,
+        }
+
+    def load_checkpoint(self):
+        """
+        Return the last checkpoint, or the initial state if there is none.
+
+        Returns:
+            dict: Time, state, next sample index and metric accumulators.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different simulation.
+        """
+        if not os.path.exists(self._checkpoint_path):
+            return self._initial_checkpoint()
+        with open(self._checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint["fingerprint"] != self._fingerprint():
+            raise ValueError("The checkpoint belongs to a different simulation")
+        return checkpoint
+
+    @property
+    def completed(self):
+        """True if all output samples have been computed."""
+        return self.load_checkpoint()["index"] >= len(self.t_eval)
+
+    def run(self, max_chunks=None):
+        """
+        Run or resume the simulation from the last checkpoint.
+
+        Args:
+            max_chunks (int, optional): Stop after this many chunks, e.g. to spread
+                a long run over several sessions.
+
+        Returns:
+            OdeResult: The results, also set on the simulation, with ``metrics``
+                holding the RMS and peak of every state, or None if the run stopped
+                before the end.
+        """
+        checkpoint = self.load_checkpoint()
+        index = checkpoint["index"]
+        t_start = checkpoint["t"]
+        state = np.array(checkpoint["state"])
+        sum_squares = np.array(checkpoint["sum_squares"])
+        peak = np.array(checkpoint["peak"])
+        road_input = self.simulation.road_profile.get_profile
+
+        with open(self._trajectory_path, "ab") as trajectory:
+            # drop samples written after the last checkpoint
+            trajectory.truncate(index * self.n_states * 8)
+            chunks = 0
+            while index < len(self.t_eval):
+                if max_chunks is not None and chunks >= max_chunks:
+                    return None
+                t_chunk = self.t_eval[index : index + self.chunk_size]
+                last = index + self.chunk_size >= len(self.t_eval)
+                t_end = self.simulation.t_span[1] if last else t_chunk[-1]
+                result = integrate(
+                    self.simulation.vehicle_model,
+                    road_input,
+                    state,
+                    (t_start, t_end),
+                    t_chunk,
+                )
+                if not result.success:
+                    raise RuntimeError(f"Integration failed: {result.message}")
+
+                trajectory.write(np.ascontiguousarray(result.y.T).tobytes())
+                trajectory.flush()
+                os.fsync(trajectory.fileno())
+                index += len(t_chunk)
+                t_start, state = float(result.t[-1]), result.y[:, -1]
+                sum_squares += np.sum(result.y**2, axis=1)
+                peak = np.maximum(peak, np.max(np.abs(result.y), axis=1))
+                _write_json(
+                    self._checkpoint_path,
+                    {
+                        "fingerprint": checkpoint["fingerprint"],
+                        "index": index,
+                        "t": t_start,
+                        "state": state.tolist(),
+                        "sum_squares": sum_squares.tolist(),
+                        "peak": peak.tolist(),
+                    },
+                )
+                chunks += 1
+
+        y = np.fromfile(self._trajectory_path).reshape(-1, self.n_states).T
+        results = OptimizeResult(
+            t=self.t_eval,
+            y=y,
+            success=True,
+            metrics={
+                "rms": np.sqrt(sum_squares / len(self.t_eval)),
+                "peak": peak,
+            },
+        )
+        results.road_profile = road_input(results.t)
+        self.simulation.results = results
+        self.simulation.execution_date = datetime.now().isoformat()
+        return results
+
+
+def _run_job(simulation, store_path):
+    """Run a sweep job and append its analysis to the session store."""
+    simulation.run_simulation()
+    SessionStore(store_path).append(
+        AnalysisRecord.from_simulation(
+            simulation, SimulationCollector.analysis_metadata(simulation)
+        )
+    )
+    return simulation.name
+
+
+def run_sweep(simulations, store_path, workers=None):
+    """
+    Run a sweep of simulations, resuming after the last completed job.
+
+    Every finished simulation is appended to a SessionStore at once, so the
+    names in the store are the completed job IDs. A restarted sweep skips them.
+
+    Args:
+        simulations (list[SimulationControl]): Jobs with unique names.
+        store_path (str): Directory of the SessionStore.
+        workers (int, optional): Number of worker processes, serial if None.
+
+    Returns:
+        list[str]: Names of the simulations run by this call.
+
+    Raises:
+        ValueError: If simulation names are not unique.
+    """
+    names = [simulation.name for simulation in simulations]
+    if len(set(names)) != len(names):
+        raise ValueError("Sweep jobs need unique simulation names")
+    completed = set(SessionStore(store_path).names())
+    pending = [s for s in simulations if s.name not in completed]
+
+    if workers is None:
+        return [_run_job(simulation, store_path) for simulation in pending]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_job, s, store_path) for s in pending]
+        return [future.result() for future in as_completed(futures)]
@@ -1,5 +1,34 @@
-import json
+import weakref
 from datetime import datetime
+import numpy as np
+from .jsonstream import iter_session, write_session
+from .records import AnalysisRecord
+
+
+def _to_json(value):
+    """Convert NumPy arrays and scalars of adopted analyses for JSON export."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _release_buffers(handles, blocks):
+    for handle, block in zip(handles, blocks):
+        if block is None:
+            handle.unlink()
+            continue
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            # arrays still in use keep the mapping until they are collected
+            pass
+
+
+def _release_all(shared):
+    for handles, blocks in shared.values():
+        _release_buffers(handles, blocks)
+    shared.clear()
 
 
 class SimulationCollector:
@@ -8,15 +37,21 @@ class SimulationCollector:
     def __init__(self):
         """Initialize the SimulationCollector with an empty analyses dictionary."""
         self.analyses = {}
+        self._shared = {}
+        weakref.finalize(self, _release_all, self._shared)
 
-    def add_analysis(self, simulation_control):
+    @staticmethod
+    def analysis_metadata(simulation_control):
         """
-        Add a simulation analysis to the collector.
+        Return the analysis data of a simulation without its result arrays.
 
         Args:
-            simulation_control (SimulationControl): The simulation control object containing analysis data.
+            simulation_control (SimulationControl): The simulation control object.
+
+        Returns:
+            dict: Name, execution date, vehicle model, road profile and time span.
         """
-        analysis_data = {
+        return {
             "name": simulation_control.name,
             "execution_date": simulation_control.execution_date
             or datetime.now().isoformat(),
@@ -29,16 +64,84 @@ def add_analysis(self, simulation_control):
                 "type": simulation_control.road_profile.profile_type,
                 "params": simulation_control.road_profile.params,
             },
-            "results": {
-                "t": simulation_control.results.t.tolist(),
-                "y": simulation_control.results.y.tolist(),
-                "road_profile": simulation_control.results.road_profile.tolist(),
-            },
             "t_span": simulation_control.t_span,
-            "t_eval": simulation_control.t_eval.tolist(),
         }
 
-        self.analyses[simulation_control.name] = analysis_data
+    def add_analysis(self, simulation_control):
+        """
+        Add a simulation analysis to the collector.
+
+        Args:
+            simulation_control (SimulationControl): The simulation control object containing analysis data.
+        """
+        self.analyses[simulation_control.name] = AnalysisRecord.from_simulation(
+            simulation_control, self.analysis_metadata(simulation_control)
+        )
+
+    def adopt_shared_analysis(self, analysis_data):
+        """
+        Add analysis data whose result arrays live in shared buffers, without copying.
+
+        The arrays are mapped into this process and stay valid until the analysis
+        is released. Shared buffers are owned by the collector from now on.
+
+        Args:
+            analysis_data (dict): Analysis data with SharedArray handles, as
+                returned by ``run_shared`` or ``share_results``.
+        """
+        name = analysis_data["name"]
+        self.release(name)
+        results = dict(analysis_data["results"])
+        outputs = results.pop("outputs", None) or {}
+        handles = {key: results[key] for key in ("t", "y", "road_profile")}
+        handles.update({f"outputs.{key}": value for key, value in outputs.items()})
+        if analysis_data.get("t_eval") is not None:
+            handles["t_eval"] = analysis_data["t_eval"]
+        arrays = {}
+        blocks = []
+        for key, handle in handles.items():
+            arrays[key], block = handle.attach()
+            blocks.append(block)
+
+        results.update((key, arrays[key]) for key in ("t", "y", "road_profile"))
+        if outputs:
+            results["outputs"] = {key: arrays[f"outputs.{key}"] for key in outputs}
+        analysis_data = dict(analysis_data, t_eval=arrays.get("t_eval"))
+        analysis_data["results"] = results
+        self.analyses[name] = AnalysisRecord.from_dict(analysis_data)
+        self._shared[name] = (list(handles.values()), blocks)
+
+    def release(self, name=None):
+        """
+        Remove shared analyses and free their shared buffers.
+
+        Args:
+            name (str, optional): Name of the analysis, all shared analyses if None.
+        """
+        names = list(self._shared) if name is None else [name]
+        for name in names:
+            if name not in self._shared:
+                continue
+            self.analyses.pop(name, None)
+            handles, blocks = self._shared.pop(name)
+            _release_buffers(handles, blocks)
+
+    def index_analyses(self, index, names=None, storage=None):
+        """
+        Add analyses to an AnalysisIndex in one transaction.
+
+        Args:
+            index (AnalysisIndex): The index to update.
+            names (list[str], optional): Names of the indexed analyses, all
+                analyses if None.
+            storage (str, optional): Pointer to the stored arrays, e.g. the file
+                the collector is exported to.
+        """
+        names = self.list_analyses() if names is None else names
+        index.add_many(
+            [self.analyses[name] for name in names],
+            storage=None if storage is None else [storage] * len(names),
+        )
 
     def get_analysis(self, name):
         """
@@ -48,7 +151,7 @@ def get_analysis(self, name):
             name (str): The name of the analysis.
 
         Returns:
-            dict: The analysis data, or None if not found.
+            AnalysisRecord: The analysis data, or None if not found.
         """
         return self.analyses.get(name)
 
@@ -63,37 +166,81 @@ def list_analyses(self):
 
     def export_results(self, filename):
         """
-        Export all analyses to a JSON file.
+        Export all analyses to a JSON file, writing one analysis at a time.
 
         Args:
             filename (str): The filename to export the results to.
         """
-        with open(filename, "w") as f:
-            json.dump(self.analyses, f, indent=2)
+        write_session(
+            filename,
+            ((name, record.to_dict()) for name, record in self.analyses.items()),
+            indent=2,
+            default=_to_json,
+        )
 
     def import_results(self, filename):
         """
         Import results from a JSON file and add them to the current collector.
 
+        The file is parsed incrementally, one analysis at a time.
+
         Args:
             filename (str): The filename to import results from.
         """
-        with open(filename, "r") as f:
-            data = json.load(f)
+        for name, analysis in iter_session(filename):
+            self.analyses[name] = AnalysisRecord.from_dict(analysis)
 
-        for name, analysis in data.items():
-            self.analyses[name] = analysis
+    def save_session(self, store, names=None):
+        """
+        Append analyses to a SessionStore, without rewriting stored analyses.
+
+        Args:
+            store (SessionStore): The session store.
+            names (list[str], optional): Names of the saved analyses, all analyses
+                if None.
+        """
+        names = self.list_analyses() if names is None else names
+        store.append_many([self.analyses[name] for name in names])
+
+    def load_session(self, store):
+        """
+        Add all analyses of a SessionStore to the collector.
 
-    def compare_analyses(self, analysis_names):
+        Args:
+            store (SessionStore): The session store.
+        """
+        store.refresh()
+        for name in store.names():
+            self.analyses[name] = store.load(name)
+
+    def compare_analyses(self, analysis_names=None, index=None, **conditions):
         """
-        Compare multiple analyses by their names.
+        Compare multiple analyses by their names or by an index query.
 
         Args:
-            analysis_names (list): List of analysis names to compare.
+            analysis_names (list, optional): List of analysis names to compare, all
+                analyses matching the index query if None.
+            index (AnalysisIndex, optional): Index selecting the analyses, e.g.
+                ``compare_analyses(index=index, model_type="HalfCarModel",
+                metrics={"rms_acc_ms": (None, 1.5)})``.
+            **conditions: Arguments of ``AnalysisIndex.query``.
 
         Returns:
             dict: A dictionary of the selected analyses.
+
+        Raises:
+            ValueError: If neither names nor an index are given, or query
+                conditions are given without an index.
         """
+        if index is None:
+            if analysis_names is None or conditions:
+                raise ValueError("Query conditions need an analysis index")
+        else:
+            matches = [entry["name"] for entry in index.query(**conditions)]
+            if analysis_names is not None:
+                selected = set(analysis_names)
+                matches = [name for name in matches if name in selected]
+            analysis_names = matches
         return {
             name: self.analyses[name]
             for name in analysis_names
@@ -105,15 +252,13 @@ def add_analysis_from_data(self, analysis_data):
         Add analysis directly from a data dictionary.
 
         Args:
-            analysis_data (dict): The analysis data dictionary.
+            analysis_data (dict or AnalysisRecord): The analysis data.
 
         Raises:
             ValueError: If the analysis data format is invalid.
         """
-        if not isinstance(analysis_data, dict) or "name" not in analysis_data:
-            raise ValueError("Invalid analysis data format")
-
-        self.analyses[analysis_data["name"]] = analysis_data
+        record = AnalysisRecord.from_dict(analysis_data)
+        self.analyses[record.name] = record
 
     def get_analyses(self, name=None):
         """
@@ -123,8 +268,9 @@ def get_analyses(self, name=None):
             name (str, optional): The name of the analysis. Defaults to None.
 
         Returns:
-            dict: The analysis data. Returns the last added analysis if name is None,
-                 or None if no analyses exist or the specified name is not found.
+            AnalysisRecord: The analysis data. Returns the last added analysis if
+                name is None, or None if no analyses exist or the specified name is
+                not found.
         """
         if name is None:
             # Return the last added analysis if exists
@@ -0,0 +1,373 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from scipy.linalg import expm
+from scipy.optimize import OptimizeResult
+
+
+@dataclass
+class ActuatorGeometry:
+    """
+    Rows of the measured quantities of every actuator, batched over vehicles.
+
+    Actuators act along suspension travel channels. A positive force extends the
+    suspension, pushing the sprung side up and the unsprung side down.
+    """
+
+    travel: np.ndarray  # Suspension travel rows (n_vehicles, n_actuators, n_states)
+    travel_rate: np.ndarray  # Suspension travel rate rows [m/s]
+    sprung_velocity: np.ndarray  # Absolute velocity rows of the sprung side [m/s]
+    unsprung_velocity: np.ndarray  # Absolute velocity rows of the unsprung side [m/s]
+    input_matrix: np.ndarray  # State derivative per actuator force [1/kg]
+
+
+def actuator_geometry(vehicle_models, channels):
+    """
+    Return the actuator geometry of a batch of vehicle models.
+
+    Degrees of freedom with road stiffness are unsprung, all others sprung.
+
+    Args:
+        vehicle_models (list[VehicleModel]): Linear vehicle models of one type.
+        channels (list[str]): Suspension travel channel of every actuator.
+
+    Returns:
+        ActuatorGeometry: The batched actuator rows.
+
+    Raises:
+        ValueError: If a channel is unsupported or depends on the road input.
+    """
+    rows = {name: [] for name in ActuatorGeometry.__dataclass_fields__}
+    for vehicle_model in vehicle_models:
+        M, _, _, K_road = vehicle_model.second_order_matrices()
+        outputs = vehicle_model.output_channels()
+        unsprung = np.any(K_road != 0, axis=1)
+        n_states = 2 * M.shape[0]
+
+        geometry = {name: np.zeros((len(channels), n_states)) for name in rows}
+        geometry["input_matrix"] = np.zeros((n_states, len(channels)))
+        for i, channel in enumerate(channels):
+            if channel not in outputs:
+                raise ValueError(f"Unsupported output channel: {channel}")
+            C_row, D_row = outputs[channel]
+            if np.any(D_row):
+                raise ValueError("Actuator channels must not depend on the road")
+            travel = C_row[0::2]
+            geometry["travel"][i] = C_row
+            geometry["travel_rate"][i, 1::2] = travel
+            geometry["sprung_velocity"][i, 1::2] = np.where(unsprung, 0, travel)
+            geometry["unsprung_velocity"][i, 1::2] = np.where(unsprung, -travel, 0)
+            geometry["input_matrix"][1::2, i] = np.linalg.solve(M, travel)
+        for name in rows:
+            rows[name].append(geometry[name])
+    return ActuatorGeometry(**{name: np.array(value) for name, value in rows.items()})
+
+
+class SuspensionController(ABC):
+    """
+    Abstract base class for suspension control laws.
+
+    Control laws compute the forces of all actuators of a batch of vehicles at
+    once. Semi-active controllers emulate a variable damper: the desired force is
+    only delivered as far as a damping coefficient between ``c_min`` and ``c_max``
+    can produce it.
+    """
+
+    def __init__(self, semi_active=False, c_min=0.0, c_max=5000.0, max_force=None):
+        """
+        Initialize the SuspensionController.
+
+        Args:
+            semi_active (bool): Restrict forces to those of a variable damper.
+            c_min (float): Minimum damping of the variable damper [Ns/m].
+            c_max (float): Maximum damping of the variable damper [Ns/m].
+            max_force (float, optional): Actuator force limit [N].
+        """
+        self.semi_active = semi_active
+        self.c_min = c_min
+        self.c_max = c_max
+        self.max_force = max_force
+        self.geometry = None
+
+    def setup(self, vehicle_models, geometry):
+        """
+        Prepare the control law for a batch of vehicles.
+
+        Args:
+            vehicle_models (list[VehicleModel]): The controlled vehicle models.
+            geometry (ActuatorGeometry): Actuator rows of the batch.
+        """
+        self.geometry = geometry
+
+    def measure(self, rows, x):
+        """Evaluate batched measurement rows for the states x (n_vehicles, n_states)."""
+        return np.matmul(rows, x[:, :, None])[:, :, 0]
+
+    @abstractmethod
+    def desired_force(self, x, t):
+        """
+        Compute the desired actuator forces.
+
+        Args:
+            x (np.ndarray): Measured states (n_vehicles, n_states).
+            t (float): Time [s].
+
+        Returns:
+            np.ndarray: Desired forces (n_vehicles, n_actuators) [N].
+        """
+        pass
+
+    def force(self, x, t):
+        """
+        Compute the delivered actuator forces.
+
+        Args:
+            x (np.ndarray): Measured states (n_vehicles, n_states).
+            t (float): Time [s].
+
+        Returns:
+            np.ndarray: Forces (n_vehicles, n_actuators) [N].
+        """
+        force = self.desired_force(x, t)
+        if self.semi_active:
+            # a damper delivers -c * travel_rate with c_min <= c <= c_max
+            rate = self.measure(self.geometry.travel_rate, x)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                damping = np.where(rate != 0, -force / rate, self.c_min)
+            force = -np.clip(damping, self.c_min, self.c_max) * rate
+        if self.max_force is not None:
+            force = np.clip(force, -self.max_force, self.max_force)
+        return force
+
+
+class SkyhookController(SuspensionController):
+    """Skyhook control, a damper between the sprung side and the sky."""
+
+    def __init__(self, c_sky=2500.0, semi_active=True, **kwargs):
+        """
+        Initialize the SkyhookController.
+
+        Args:
+            c_sky (float or np.ndarray): Skyhook damping [Ns/m], or one value
+                per vehicle as an array (n_vehicles, 1).
+            semi_active (bool): Restrict forces to those of a variable damper.
+            **kwargs: Further SuspensionController arguments.
+        """
+        super().__init__(semi_active=semi_active, **kwargs)
+        self.c_sky = c_sky
+
+    def desired_force(self, x, t):
+        return -self.c_sky * self.measure(self.geometry.sprung_velocity, x)
+
+
+class GroundhookController(SuspensionController):
+    """Groundhook control, a damper between the unsprung side and the ground."""
+
+    def __init__(self, c_ground=2500.0, semi_active=True, **kwargs):
+        """
+        Initialize the GroundhookController.
+
+        Args:
+            c_ground (float or np.ndarray): Groundhook damping [Ns/m], or one
+                value per vehicle as an array (n_vehicles, 1).
+            semi_active (bool): Restrict forces to those of a variable damper.
+            **kwargs: Further SuspensionController arguments.
+        """
+        super().__init__(semi_active=semi_active, **kwargs)
+        self.c_ground = c_ground
+
+    def desired_force(self, x, t):
+        # the actuator pushes the unsprung side with the negative force
+        return self.c_ground * self.measure(self.geometry.unsprung_velocity, x)
+
+
+class StateFeedbackController(SuspensionController):
+    """Linear state feedback ``F = -K x``, e.g. with LQR gains."""
+
+    def __init__(self, gains, **kwargs):
+        """
+        Initialize the StateFeedbackController.
+
+        Args:
+            gains (np.ndarray): Gain matrix (n_actuators, n_states), or one gain
+                matrix per vehicle (n_vehicles, n_actuators, n_states).
+            **kwargs: Further SuspensionController arguments.
+        """
+        super().__init__(**kwargs)
+        self.gains = np.asarray(gains, dtype=float)
+
+    def desired_force(self, x, t):
+        gains = self.gains
+        if gains.ndim == 2:
+            gains = np.broadcast_to(gains, (len(x),) + gains.shape)
+        return -self.measure(gains, x)
+
+
+class ControlLoop:
+    """
+    Fixed-step simulation of vehicle models with a suspension controller.
+
+    The plant is discretized exactly for the step size, with first-order hold road
+    input and zero-order hold actuator forces, so every step costs the same few
+    batched matrix products. The controller samples the states every
+    ``control_period`` plant steps and each force acts ``latency`` plant steps
+    after its measurement, held until the next force arrives.
+    """
+
+    def __init__(
+        self,
+        controller,
+        actuators=("suspension_travel",),
+        control_period=1,
+        latency=0,
+    ):
+        """
+        Initialize the ControlLoop.
+
+        Args:
+            controller (SuspensionController): The control law.
+            actuators (tuple[str]): Suspension travel channel of every actuator.
+            control_period (int): Plant steps per controller update.
+            latency (int): Plant steps between measurement and actuation.
+        """
+        self.controller = controller
+        self.actuators = list(actuators)
+        self.control_period = control_period
+        self.latency = latency
+
+    @staticmethod
+    def discretize(vehicle_model, input_matrix, dt):
+        """
+        Return the exact step matrices of a vehicle model with actuators.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            input_matrix (np.ndarray): State derivative per actuator force.
+            dt (float): Step size [s].
+
+        Returns:
+            tuple[np.ndarray, ...]: Phi, G0, G1 and H with
+                ``x[k+1] = Phi x[k] + G0 r[k] + G1 (r[k+1] - r[k]) / dt + H F[k]``.
+        """
+        A, B = vehicle_model.state_space()
+        n, m = B.shape
+        k = input_matrix.shape[1]
+        # augmented state [x, r, r_dot, F] with constant slope and force
+        Z = np.zeros((n + 2 * m + k, n + 2 * m + k))
+        Z[:n, :n] = A
+        Z[:n, n : n + m] = B
+        Z[:n, n + 2 * m :] = input_matrix
+        Z[n : n + m, n + m : n + 2 * m] = np.eye(m)
+        F = expm(Z * dt)
+        return (
+            F[:n, :n],
+            F[:n, n : n + m],
+            F[:n, n + m : n + 2 * m],
+            F[:n, n + 2 * m :],
+        )
+
+    def run_batch(self, vehicle_models, road, t_eval):
+        """
+        Simulate a batch of vehicle models of one type on the same road.
+
+        Args:
+            vehicle_models (list[VehicleModel]): Linear vehicle models of one type.
+            road (RoadProfile or callable): Road profile.
+            t_eval (np.ndarray): Equally spaced time points [s].
+
+        Returns:
+            OptimizeResult: Results with ``t``, states ``y`` (n_vehicles, n_states,
+                n_time), actuator ``forces`` (n_vehicles, n_actuators, n_time) and
+                the wall-clock ``step_times`` of every step [s].
+
+        Raises:
+            ValueError: If the models differ in type or t_eval is not equally spaced.
+        """
+        if len({type(model).__name__ for model in vehicle_models}) != 1:
+            raise ValueError("All vehicle models must be of the same type")
+        t_eval = np.asarray(t_eval, dtype=float)
+        steps = np.diff(t_eval)
+        dt = steps[0]
+        if not np.allclose(steps, dt, rtol=1e-9, atol=0):
+            raise ValueError("The control loop needs equally spaced time points")
+
+        geometry = actuator_geometry(vehicle_models, self.actuators)
+        self.controller.setup(vehicle_models, geometry)
+        Phi, G0, G1, H = (
+            np.array(matrices)
+            for matrices in zip(
+                *(
+                    self.discretize(model, input_matrix, dt)
+                    for model, input_matrix in zip(
+                        vehicle_models, geometry.input_matrix
+                    )
+                )
+            )
+        )
+
+        get_profile = getattr(road, "get_profile", road)
+        # road inputs (n_vehicles, n_inputs, n_time) with the delays of every model
+        delays = np.array([model.input_delays() for model in vehicle_models])
+        unique_delays, inverse = np.unique(delays.ravel(), return_inverse=True)
+        r = np.array(
+            [
+                np.broadcast_to(get_profile(np.maximum(0, t_eval - d)), t_eval.shape)
+                for d in unique_delays
+            ]
+        )[inverse].reshape(delays.shape + t_eval.shape)
+        slopes = np.diff(r, axis=2) / dt
+
+        n_vehicles, n_time = len(vehicle_models), len(t_eval)
+        x = np.array([model.initial_conditions for model in vehicle_models], float)
+        y = np.zeros((n_vehicles, x.shape[1], n_time))
+        forces = np.zeros((n_vehicles, len(self.actuators), n_time))
+        step_times = np.zeros(n_time - 1)
+        pending = deque()  # (step of actuation, force) of measured forces
+        force = np.zeros(forces.shape[:2])
+        y[:, :, 0] = x
+
+        for k in range(n_time - 1):
+            start = perf_counter()
+            if k % self.control_period == 0:
+                pending.append((k + self.latency, self.controller.force(x, t_eval[k])))
+            while pending and pending[0][0] <= k:
+                force = pending.popleft()[1]
+            forces[:, :, k] = force
+            x = (
+                np.matmul(Phi, x[:, :, None])
+                + np.matmul(G0, r[:, :, k, None])
+                + np.matmul(G1, slopes[:, :, k, None])
+                + np.matmul(H, force[:, :, None])
+            )[:, :, 0]
+            y[:, :, k + 1] = x
+            step_times[k] = perf_counter() - start
+        forces[:, :, -1] = force
+
+        return OptimizeResult(
+            t=t_eval,
+            y=y,
+            forces=forces,
+            step_times=step_times,
+            success=True,
+            status=0,
+            message="Fixed-step simulation with suspension control.",
+        )
+
+    def simulate(self, vehicle_model, road, t_eval):
+        """
+        Simulate a single vehicle model, e.g. as the engine of SimulationControl.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road (RoadProfile or callable): Road profile.
+            t_eval (np.ndarray): Equally spaced time points [s].
+
+        Returns:
+            OptimizeResult: Results with ``t``, ``y``, ``forces`` and ``step_times``.
+        """
+        results = self.run_batch([vehicle_model], road, t_eval)
+        results.y = results.y[0]
+        results.forces = results.forces[0]
+        return results
@@ -1,12 +1,22 @@
-from scipy.integrate import solve_ivp
 from datetime import datetime
+from .integration import integrate
+from .outputs import OutputRecorder
+from .periodic import periodic_steady_state
 
 
 class SimulationControl:
     """Class for controlling and running vehicle model simulations."""
 
     def __init__(
-        self, vehicle_model, road_profile, t_span, t_eval, name="Unnamed Simulation"
+        self,
+        vehicle_model,
+        road_profile,
+        t_span,
+        t_eval,
+        name="Unnamed Simulation",
+        cache=None,
+        engine=None,
+        output=None,
     ):
         """
         Initialize the SimulationControl with a vehicle model, road profile, and time settings.
@@ -17,6 +27,12 @@ def __init__(
             t_span (tuple): The time span for the simulation.
             t_eval (np.ndarray): The time points at which to evaluate the solution.
             name (str): The name of the simulation.
+            cache (SuperpositionCache, optional): Cache of unit responses used for
+                linear vehicle models.
+            engine (PiecewiseLinearEngine, optional): Engine simulating tire lift-off
+                and bump stops of linear vehicle models.
+            output (OutputSpec, optional): The states and derived channels to
+                record and their rate. All states at every time point if None.
         """
         self.vehicle_model = vehicle_model
         self.road_profile = road_profile
@@ -25,28 +41,68 @@ def __init__(
         self.results = None
         self.name = name
         self.execution_date = None
+        self.cache = cache
+        self.engine = engine
+        self.output = output
 
     def run_simulation(self):
-        """Run the simulation using the specified vehicle model and road profile."""
+        """
+        Run the simulation using the specified vehicle model and road profile.
 
-        def ode_wrapper(t, y):
-            return self.vehicle_model.equations_of_motion(
-                y, t, self.road_profile.get_profile
+        With an output specification, the equations of motion are only evaluated
+        at the recorded time points and the results hold only the selected states
+        (``y``, with their indices in ``states``) and derived channels
+        (``outputs``). Results of an engine or cache are reduced after the run.
+        """
+        recorder = None
+        if self.output is not None:
+            recorder = OutputRecorder(
+                self.output,
+                self.vehicle_model,
+                self.road_profile.get_profile,
+                engine=self.engine,
             )
-
-        self.results = solve_ivp(
-            ode_wrapper,
-            self.t_span,
-            self.vehicle_model.initial_conditions,
-            t_eval=self.t_eval,
-            method="DOP853",
-            max_step=0.01,
-            rtol=1e-8,
-            atol=1e-8,
-        )
+        t_eval = self.t_eval
+        if self.engine is not None:
+            self.results = self.engine.simulate(
+                self.vehicle_model, self.road_profile, self.t_eval
+            )
+        elif self.cache is not None and self.vehicle_model.is_linear:
+            self.results = self.cache.response(
+                self.vehicle_model, self.road_profile, self.t_span, self.t_eval
+            )
+        else:
+            if recorder is not None:
+                # integrate only at the recorded time points
+                t_eval = self.output.sample_times(self.t_eval)
+            self.results = integrate(
+                self.vehicle_model,
+                self.road_profile.get_profile,
+                self.vehicle_model.initial_conditions,
+                self.t_span,
+                t_eval,
+            )
+        if recorder is not None:
+            self.results = recorder.reduce(self.results, decimate=t_eval is self.t_eval)
 
         # Add road profile to the results
         self.results.road_profile = self.road_profile.get_profile(self.results.t)
 
         # Update execution date
         self.execution_date = datetime.now().isoformat()
+
+    def run_steady_state(self, include_transient=False):
+        """
+        Compute the periodic steady state for a sinusoidal road profile directly.
+
+        Args:
+            include_transient (bool): Add the transient from the initial conditions.
+        """
+        self.results = periodic_steady_state(
+            self.vehicle_model,
+            self.road_profile,
+            self.t_eval,
+            include_transient=include_transient,
+        )
+        self.results.road_profile = self.road_profile.get_profile(self.results.t)
+        self.execution_date = datetime.now().isoformat()
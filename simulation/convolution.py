@@ -0,0 +1,325 @@
+import numpy as np
+from scipy.linalg import expm
+from scipy.signal import cont2discrete
+
+
+class TransformedRoad:
+    """Block spectra of a sampled road, shared by every vehicle variant."""
+
+    def __init__(self, spectra, blocks, length, initial=0.0):
+        """
+        Initialize the TransformedRoad with the spectra of its blocks.
+
+        Args:
+            spectra (np.ndarray): Real FFT of every zero padded block
+                (n_blocks, n_freq).
+            blocks (list[int]): Number of road samples in every block.
+            length (int): Total number of road samples.
+            initial (float): First road sample, held by delayed inputs before it.
+        """
+        self.spectra = spectra
+        self.blocks = blocks
+        self.length = length
+        self.initial = initial
+
+
+class ConvolutionEngine:
+    """
+    Response engine for linear vehicle models driven by long sampled roads.
+
+    The impulse response of every parameter set is computed once from the exactly
+    discretized state-space model (first order hold on the road samples) and the
+    output channels follow by overlap-add FFT convolution, one block at a time.
+    Like the equations of motion, the road starts at the first road sample at
+    t=0 and delayed road inputs hold it until their delay has passed.
+    """
+
+    def __init__(
+        self, dt, channels=None, fft_size=2**18, block_size=None, tolerance=1e-9
+    ):
+        """
+        Initialize the ConvolutionEngine with the sampling and block settings.
+
+        Args:
+            dt (float): Sampling time of the road signal [s].
+            channels (list[str], optional): Output channels, all channels by default.
+            fft_size (int): FFT length of every block convolution.
+            block_size (int, optional): Road samples per block, half of fft_size by
+                default. The impulse response may be fft_size - block_size + 1 long.
+            tolerance (float): Relative decay at which impulse responses are cut off.
+
+        Raises:
+            ValueError: If the block size does not fit into the FFT length.
+        """
+        if block_size is None:
+            block_size = fft_size // 2
+        if not 0 < block_size < fft_size:
+            raise ValueError("block_size must be positive and smaller than fft_size")
+
+        self.dt = dt
+        self.channels = channels
+        self.fft_size = fft_size
+        self.block_size = block_size
+        self.tolerance = tolerance
+        self.max_impulse_length = fft_size - block_size + 1
+        self._impulse_cache = {}
+        self._initial_cache = {}
+        self._spectrum_cache = {}
+
+    def _cache_key(self, vehicle_model):
+        return (
+            type(vehicle_model).__name__,
+            tuple(sorted(vehicle_model.params.items())),
+        )
+
+    def _channels(self, vehicle_model):
+        if self.channels is None:
+            return list(vehicle_model.output_channels())
+        return list(self.channels)
+
+    def impulse_response(self, vehicle_model):
+        """
+        Return the sampled impulse response of every output channel.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+
+        Returns:
+            dict[str, np.ndarray]: Response of every channel to a unit road sample.
+
+        Raises:
+            ValueError: If a channel is unsupported, the model is not
+                asymptotically stable or the impulse response is longer than the
+                engine's block settings allow.
+        """
+        key = self._cache_key(vehicle_model)
+        if key in self._impulse_cache:
+            return self._impulse_cache[key]
+
+        A, B = vehicle_model.state_space()
+        delays = vehicle_model.input_delays() / self.dt
+        outputs = vehicle_model.output_channels()
+        channels = self._channels(vehicle_model)
+        unsupported = [channel for channel in channels if channel not in outputs]
+        if unsupported:
+            raise ValueError(f"Unsupported output channels: {unsupported}")
+        C = np.array([outputs[channel][0] for channel in channels])
+        D = np.array([outputs[channel][1] for channel in channels])
+
+        Ad, Bd, Cd, Dd, _ = cont2discrete((A, B, C, D), self.dt, method="foh")
+        eigenvalues, V = np.linalg.eig(Ad)
+        radius = np.max(np.abs(eigenvalues))
+        if radius >= 1.0 - 1e-12:
+            raise ValueError(
+                "The impulse response does not decay, the convolution engine "
+                "needs an asymptotically stable (damped) vehicle model"
+            )
+        length = int(np.ceil(np.log(self.tolerance) / np.log(radius))) + 2
+        length += int(np.ceil(np.max(delays)))
+        if length > self.max_impulse_length:
+            raise ValueError(
+                f"Impulse response needs {length} samples, increase fft_size to fit"
+            )
+
+        # h[0] = Dd and h[k] = Cd Ad^(k-1) Bd through the modal decomposition
+        powers = eigenvalues[None, :] ** np.arange(length - 1)[:, None]
+        modal_C = Cd @ V
+        modal_B = np.linalg.solve(V, Bd)
+        h_inputs = np.zeros((length, len(channels), B.shape[1]))
+        h_inputs[0] = Dd
+        h_inputs[1:] = np.real(
+            np.einsum("ci,ki,ij->kcj", modal_C, powers, modal_B, optimize=True)
+        )
+
+        # delayed road inputs are shifted with linear interpolation, and hold
+        # the first road sample until the delay has passed
+        h = np.zeros((length, len(channels)))
+        hold = np.zeros((length, len(channels)))
+        for j, delay in enumerate(delays):
+            whole = int(np.floor(delay))
+            fraction = delay - whole
+            shifted = h_inputs[: length - whole, :, j]
+            h[whole:] += (1 - fraction) * shifted
+            h[whole + 1 :] += fraction * shifted[:-1]
+            weights = np.ones(whole + 1)
+            weights[-1] = fraction
+            for i, weight in enumerate(weights):
+                hold[i:] += weight * h_inputs[: length - i, :, j]
+
+        # the first order hold ramps every input up to the first road sample over
+        # the step before t=0, which the road starting at t=0 does not do
+        n, m = B.shape
+        Z = np.zeros((n + 2 * m, n + 2 * m))
+        Z[:n, :n] = A
+        Z[:n, n : n + m] = B
+        Z[n : n + m, n + m :] = np.eye(m)
+        ramp_state = expm(Z * self.dt)[:n, n + m :] @ np.full(m, 1.0 / self.dt)
+        self._initial_cache[key] = hold.T - self._free_response(
+            vehicle_model, channels, ramp_state, length
+        )
+
+        impulse_response = {channel: h[:, i] for i, channel in enumerate(channels)}
+        self._impulse_cache[key] = impulse_response
+        return impulse_response
+
+    def _spectrum(self, vehicle_model):
+        key = self._cache_key(vehicle_model)
+        if key not in self._spectrum_cache:
+            h = np.array(list(self.impulse_response(vehicle_model).values()))
+            self._spectrum_cache[key] = np.fft.rfft(h, self.fft_size)
+        return self._spectrum_cache[key]
+
+    def _free_response(self, vehicle_model, channels, x0, length):
+        """Return the decaying response of the channels to an initial state."""
+        A, _ = vehicle_model.state_space()
+        outputs = vehicle_model.output_channels()
+        C = np.array([outputs[channel][0] for channel in channels])
+        eigenvalues, V = np.linalg.eig(A)
+        t = np.arange(length) * self.dt
+        modes = np.exp(eigenvalues[None, :] * t[:, None]) * np.linalg.solve(V, x0)
+        return np.real(modes @ (C @ V).T).T
+
+    def _road_blocks(self, road):
+        """Yield road blocks of block_size samples from an array or iterable."""
+        if isinstance(road, np.ndarray):
+            for start in range(0, len(road), self.block_size):
+                yield road[start : start + self.block_size]
+            return
+
+        buffer = np.empty(0)
+        for chunk in road:
+            buffer = np.concatenate([buffer, np.asarray(chunk, dtype=float)])
+            while len(buffer) >= self.block_size:
+                yield buffer[: self.block_size]
+                buffer = buffer[self.block_size :]
+        if len(buffer):
+            yield buffer
+
+    def _road_spectra(self, road):
+        """Yield the length, spectrum and first sample of every road block."""
+        if isinstance(road, TransformedRoad):
+            for length, spectrum in zip(road.blocks, road.spectra):
+                yield length, spectrum, road.initial
+            return
+        for block in self._road_blocks(road):
+            yield len(block), np.fft.rfft(block, self.fft_size), block[0]
+
+    def transform_road(self, road):
+        """
+        Transform a sampled road once, so many vehicle variants can reuse it.
+
+        Args:
+            road (np.ndarray or Iterable[np.ndarray]): Road samples or chunks of them.
+
+        Returns:
+            TransformedRoad: Spectra of the zero padded road blocks.
+        """
+        blocks, spectra, initial = [], [], 0.0
+        for length, spectrum, first in self._road_spectra(road):
+            if not blocks:
+                initial = first
+            blocks.append(length)
+            spectra.append(spectrum)
+        return TransformedRoad(np.array(spectra), blocks, sum(blocks), initial)
+
+    def iter_response_batch(self, vehicle_models, road):
+        """
+        Yield the output blocks of several vehicle variants for one road.
+
+        Only one road block and the overlap tails are held in memory, so roads of
+        any length can be streamed from an iterable of chunks.
+
+        Args:
+            vehicle_models (list[VehicleModel]): Linear vehicle models.
+            road (np.ndarray, TransformedRoad or Iterable[np.ndarray]): Road samples.
+
+        Yields:
+            list[dict[str, np.ndarray]]: Output block of every channel per model.
+        """
+        channels = [self._channels(model) for model in vehicle_models]
+        spectra = [self._spectrum(model) for model in vehicle_models]
+        free = []
+        for model, model_channels in zip(vehicle_models, channels):
+            x0 = np.asarray(model.initial_conditions, dtype=float)
+            length = len(next(iter(self.impulse_response(model).values())))
+            free.append(
+                self._free_response(model, model_channels, x0, length)
+                if np.any(x0)
+                else 0.0
+            )
+        initial = [self._initial_cache[self._cache_key(m)] for m in vehicle_models]
+        tails = [np.zeros((len(c), self.fft_size)) for c in channels]
+        position = 0
+
+        for length, road_spectrum, first in self._road_spectra(road):
+            if position == 0:
+                # response to the first road sample at t=0
+                free = [
+                    response + first * response_first
+                    for response, response_first in zip(free, initial)
+                ]
+            blocks = []
+            for i, spectrum in enumerate(spectra):
+                y = np.fft.irfft(spectrum * road_spectrum, self.fft_size)
+                tails[i] += y
+                output = tails[i][:, :length].copy()
+                if position < free[i].shape[1]:
+                    overlap = free[i][:, position : position + length]
+                    output[:, : overlap.shape[1]] += overlap
+                tails[i] = np.concatenate(
+                    [tails[i][:, length:], np.zeros((len(channels[i]), length))],
+                    axis=1,
+                )
+                blocks.append(
+                    {channel: output[c] for c, channel in enumerate(channels[i])}
+                )
+            position += length
+            yield blocks
+
+    def iter_response(self, vehicle_model, road):
+        """
+        Yield the output blocks of one vehicle model for a road.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road (np.ndarray, TransformedRoad or Iterable[np.ndarray]): Road samples.
+
+        Yields:
+            dict[str, np.ndarray]: Output block of every channel.
+        """
+        for blocks in self.iter_response_batch([vehicle_model], road):
+            yield blocks[0]
+
+    def response_batch(self, vehicle_models, road):
+        """
+        Compute the full responses of several vehicle variants for one road.
+
+        Args:
+            vehicle_models (list[VehicleModel]): Linear vehicle models.
+            road (np.ndarray, TransformedRoad or Iterable[np.ndarray]): Road samples.
+
+        Returns:
+            list[dict[str, np.ndarray]]: Output of every channel per model.
+        """
+        collected = [dict() for _ in vehicle_models]
+        for blocks in self.iter_response_batch(vehicle_models, road):
+            for outputs, block in zip(collected, blocks):
+                for channel, values in block.items():
+                    outputs.setdefault(channel, []).append(values)
+        return [
+            {channel: np.concatenate(values) for channel, values in outputs.items()}
+            for outputs in collected
+        ]
+
+    def response(self, vehicle_model, road):
+        """
+        Compute the full response of one vehicle model for a road.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road (np.ndarray, TransformedRoad or Iterable[np.ndarray]): Road samples.
+
+        Returns:
+            dict[str, np.ndarray]: Output of every channel at the road samples.
+        """
+        return self.response_batch([vehicle_model], road)[0]
@@ -0,0 +1,300 @@
+import numbers
+import sqlite3
+from .visualizer import ResultsVisualization
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    model_type TEXT,
+    road_type TEXT,
+    execution_date TEXT,
+    n_samples INTEGER,
+    storage TEXT
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value
+);
+CREATE INDEX IF NOT EXISTS analyses_model ON analyses (model_type, execution_date);
+CREATE INDEX IF NOT EXISTS attributes_value ON attributes (kind, key, value);
+CREATE INDEX IF NOT EXISTS attributes_analysis ON attributes (analysis_id);
+"""
+
+#: Filter argument of ``AnalysisIndex.query`` per attribute kind.
+_KINDS = {"params": "param", "road": "road", "metrics": "metric"}
+
+_COLUMNS = ("name", "model_type", "road_type", "execution_date", "n_samples")
+
+
+def _flatten(values, prefix=""):
+    """Return nested dictionaries as {"a.b": value} pairs of scalar values."""
+    flat = {}
+    for key, value in (values or {}).items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (numbers.Number, str)):
+            flat[f"{prefix}{key}"] = (
+                float(value) if isinstance(value, numbers.Real) else value
+            )
+    return flat
+
+
+def default_metrics(analysis_data):
+    """
+    Return the performance metrics of an analysis, e.g. ``rms_acc_ms``.
+
+    Args:
+        analysis_data (AnalysisRecord): The analysis data.
+
+    Returns:
+        dict: Value of every performance metric of the vehicle model.
+    """
+    return ResultsVisualization(analysis_data).compute_performance_metrics()
+
+
+class AnalysisIndex:
+    """
+    Persistent SQLite index of analyses for metadata and metric queries.
+
+    The index stores the model type, the flattened model and road parameters, the
+    execution date, scalar metrics and a pointer to the array storage of every
+    analysis, but no trajectories. Attribute ranges are answered from an index
+    on (kind, key, value), so queries do not scan the stored analyses.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        Open or create the AnalysisIndex.
+
+        Args:
+            path (str): Path of the SQLite database file, in memory by default.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def add(self, analysis_data, metrics=None, storage=None):
+        """
+        Index one analysis, replacing an indexed analysis of the same name.
+
+        Args:
+            analysis_data (AnalysisRecord or dict): The analysis data.
+            metrics (dict, optional): Scalar metrics, the performance metrics of the
+                vehicle model (see ``default_metrics``) if None.
+            storage (str, optional): Pointer to the stored arrays, e.g. a file path.
+        """
+        self.add_many(
+            [analysis_data],
+            None if metrics is None else [metrics],
+            None if storage is None else [storage],
+        )
+
+    def add_many(self, analyses, metrics=None, storage=None):
+        """
+        Index many analyses in one transaction.
+
+        Args:
+            analyses (list[AnalysisRecord or dict]): The analysis data.
+            metrics (list[dict], optional): Scalar metrics per analysis, the
+                performance metrics of the vehicle models if None.
+            storage (list[str], optional): Pointer to the stored arrays per analysis.
+        """
+        analyses = list(analyses)
+        if metrics is None:
+            metrics = [default_metrics(analysis) for analysis in analyses]
+        if storage is None:
+            storage = [None] * len(analyses)
+
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM analyses WHERE name = ?",
+                [(analysis["name"],) for analysis in analyses],
+            )
+            attributes = []
+            for analysis, values, location in zip(analyses, metrics, storage):
+                vehicle_model = analysis["vehicle_model"] or {}
+                road_profile = analysis["road_profile"] or {}
+                cursor = self.connection.execute(
+                    "INSERT INTO analyses (name, model_type, road_type, "
+                    "execution_date, n_samples, storage) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        analysis["name"],
+                        vehicle_model.get("type"),
+                        road_profile.get("type"),
+                        analysis["execution_date"],
+                        len(analysis["results"]["t"]),
+                        location,
+                    ),
+                )
+                for kind, items in (
+                    ("param", vehicle_model.get("params")),
+                    ("road", road_profile.get("params")),
+                    ("metric", values),
+                ):
+                    attributes.extend(
+                        (cursor.lastrowid, kind, key, value)
+                        for key, value in _flatten(items).items()
+                    )
+            self.connection.executemany(
+                "INSERT INTO attributes VALUES (?, ?, ?, ?)", attributes
+            )
+
+    def remove(self, name):
+        """
+        Remove an analysis from the index.
+
+        Args:
+            name (str): The name of the analysis.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM analyses WHERE name = ?", (name,))
+
+    def _where(self, model_type, road_type, executed, filters):
+        clauses = []
+        arguments = []
+        for column, value in (("model_type", model_type), ("road_type", road_type)):
+            if value is not None:
+                clauses.append(f"a.{column} = ?")
+                arguments.append(value)
+        if executed is not None:
+            for operator, bound in zip((">=", "<="), executed):
+                if bound is not None:
+                    clauses.append(f"a.execution_date {operator} ?")
+                    arguments.append(bound)
+
+        for argument, kind in _KINDS.items():
+            for key, condition in (filters.get(argument) or {}).items():
+                subquery = (
+                    "a.id IN (SELECT analysis_id FROM attributes "
+                    "WHERE kind = ? AND key = ?"
+                )
+                arguments.extend([kind, key])
+                if isinstance(condition, tuple):
+                    for operator, bound in zip((">=", "<="), condition):
+                        if bound is not None:
+                            subquery += f" AND value {operator} ?"
+                            arguments.append(bound)
+                else:
+                    subquery += " AND value = ?"
+                    arguments.append(condition)
+                clauses.append(subquery + ")")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), arguments
+
+    def query(
+        self,
+        model_type=None,
+        road_type=None,
+        executed=None,
+        order_by="name",
+        descending=False,
+        limit=None,
+        offset=0,
+        **filters,
+    ):
+        """
+        Return indexed analyses matching metadata, parameter and metric conditions.
+
+        Attribute conditions are given per kind as ``params``, ``road`` and
+        ``metrics`` dictionaries, mapping a key to a value or an inclusive
+        (lower, upper) range with None for an open end, e.g.
+        ``query("HalfCarModel", params={"cs_r": (None, 1000)},
+        metrics={"rms_acc_ms": (1.5, None)})``.
+
+        Args:
+            model_type (str, optional): Vehicle model type.
+            road_type (str, optional): Road profile type.
+            executed (tuple, optional): (start, end) ISO range of execution dates.
+            order_by (str): A column, or an attribute such as "metrics.rms_acc_ms".
+            descending (bool): Sort in descending order.
+            limit (int, optional): Maximum number of analyses, for pagination.
+            offset (int): Number of matching analyses skipped, for pagination.
+            **filters: ``params``, ``road`` and ``metrics`` conditions.
+
+        Returns:
+            list[dict]: Name, model type, road type, execution date, number of
+                samples and storage pointer of every matching analysis.
+
+        Raises:
+            ValueError: If a filter or the sort key is not supported.
+        """
+        unsupported = [argument for argument in filters if argument not in _KINDS]
+        if unsupported:
+            raise ValueError(f"Unsupported query filters: {unsupported}")
+        where, arguments = self._where(model_type, road_type, executed, filters)
+
+        if order_by in _COLUMNS:
+            order = f"a.{order_by}"
+        elif order_by.split(".", 1)[0] in _KINDS and "." in order_by:
+            kind, key = order_by.split(".", 1)
+            order = (
+                "(SELECT value FROM attributes WHERE analysis_id = a.id "
+                "AND kind = ? AND key = ?)"
+            )
+            arguments.extend([_KINDS[kind], key])
+        else:
+            raise ValueError(f"Unsupported sort key: {order_by}")
+        order += " DESC" if descending else ""
+
+        sql = f"SELECT a.* FROM analyses a{where} ORDER BY {order}, a.id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            arguments.extend([limit, offset])
+        rows = self.connection.execute(sql, arguments).fetchall()
+        return [{key: row[key] for key in _COLUMNS + ("storage",)} for row in rows]
+
+    def count(self, model_type=None, road_type=None, executed=None, **filters):
+        """
+        Return the number of analyses matching the conditions of ``query``.
+
+        Returns:
+            int: The number of matching analyses.
+        """
+        where, arguments = self._where(model_type, road_type, executed, filters)
+        sql = f"SELECT COUNT(*) FROM analyses a{where}"
+        return self.connection.execute(sql, arguments).fetchone()[0]
+
+    def get(self, name):
+        """
+        Return the indexed metadata, parameters and metrics of an analysis.
+
+        Args:
+            name (str): The name of the analysis.
+
+        Returns:
+            dict: The indexed data with ``params``, ``road`` and ``metrics``
+                dictionaries, or None if the analysis is not indexed.
+        """
+        row = self.connection.execute(
+            "SELECT * FROM analyses WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = {key: row[key] for key in _COLUMNS + ("storage",)}
+        entry.update({argument: {} for argument in _KINDS})
+        kinds = {kind: argument for argument, kind in _KINDS.items()}
+        for kind, key, value in self.connection.execute(
+            "SELECT kind, key, value FROM attributes WHERE analysis_id = ?",
+            (row["id"],),
+        ):
+            entry[kinds[kind]][key] = value
+        return entry
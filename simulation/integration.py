@@ -0,0 +1,99 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
+
+
+def integrate(vehicle_model, road_input, initial_conditions, t_span, t_eval):
+    """
+    Integrate the equations of motion of a vehicle model.
+
+    Args:
+        vehicle_model (VehicleModel): The vehicle model to simulate.
+        road_input (callable): Road displacement as a function of time.
+        initial_conditions (list[float]): Initial state of the model.
+        t_span (tuple): The time span for the simulation.
+        t_eval (np.ndarray): The time points at which to evaluate the solution.
+
+    Returns:
+        OdeResult: The solution returned by scipy's solve_ivp.
+    """
+
+    def ode_wrapper(t, y):
+        return vehicle_model.equations_of_motion(y, t, road_input)
+
+    return solve_ivp(
+        ode_wrapper,
+        t_span,
+        initial_conditions,
+        t_eval=t_eval,
+        method="DOP853",
+        max_step=0.01,
+        rtol=1e-8,
+        atol=1e-8,
+    )
+
+
+def integrate_batch(vehicle_models, road_input, t_span, t_eval):
+    """
+    Integrate several linear vehicle models of one type in a single solve.
+
+    The state-space systems are stacked into one block diagonal system, so the
+    integrator's overhead is shared by all models of the batch. Every model keeps
+    its own road input delays, e.g. the wheelbase delay of a half car.
+
+    Args:
+        vehicle_models (list[VehicleModel]): Linear vehicle models of one type.
+        road_input (callable): Road displacement as a function of time.
+        t_span (tuple): The time span for the simulation.
+        t_eval (np.ndarray): The time points at which to evaluate the solution.
+
+    Returns:
+        list[OptimizeResult]: Results with ``t`` and ``y`` per model, like
+            scipy's solve_ivp.
+
+    Raises:
+        ValueError: If a model is not linear or the models differ in type.
+    """
+    if len({type(model).__name__ for model in vehicle_models}) != 1:
+        raise ValueError("All vehicle models must have the same type")
+    if not all(model.is_linear for model in vehicle_models):
+        raise ValueError("Batched integration needs linear vehicle models")
+
+    systems = [model.state_space() for model in vehicle_models]
+    A = np.stack([system[0] for system in systems])
+    B = np.stack([system[1] for system in systems])
+    delays = np.array([model.input_delays() for model in vehicle_models])
+    # the road is evaluated once per distinct delay of the batch
+    unique_delays, inverse = np.unique(delays.ravel(), return_inverse=True)
+    shape = (len(vehicle_models), A.shape[1])
+
+    def ode_wrapper(t, y):
+        values = np.array([road_input(max(0, t - delay)) for delay in unique_delays])
+        road = values[inverse].reshape(delays.shape)
+        x = y.reshape(shape)
+        return (np.matmul(A, x[:, :, None]) + np.matmul(B, road[:, :, None])).ravel()
+
+    initial_conditions = np.concatenate(
+        [np.asarray(model.initial_conditions, dtype=float) for model in vehicle_models]
+    )
+    solution = solve_ivp(
+        ode_wrapper,
+        t_span,
+        initial_conditions,
+        t_eval=t_eval,
+        method="DOP853",
+        max_step=0.01,
+        rtol=1e-8,
+        atol=1e-8,
+    )
+    y = solution.y.reshape(shape + (len(solution.t),))
+    return [
+        OptimizeResult(
+            t=solution.t,
+            y=y[i],
+            success=solution.success,
+            status=solution.status,
+            message=solution.message,
+        )
+        for i in range(len(vehicle_models))
+    ]
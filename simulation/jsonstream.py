@@ -0,0 +1,182 @@
+import json
+import re
+
+#: Characters that change the nesting depth or the string state of JSON text.
+_STRUCTURE = re.compile(r'[\[\]{}"\\]')
+_STRING_END = re.compile(r'["\\]')
+_PRIMITIVE_END = re.compile(r"[,}\]\s]")
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _Reader:
+    """Buffered JSON text of a file, consumed value by value."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+    def _read(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            raise ValueError("Unexpected end of the JSON session file")
+        # drop consumed text, so only the current value is held in memory
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Skip whitespace and return the next character."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self._read()
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError(
+                f"Expected {character!r} in the JSON session file, "
+                f"found {self.buffer[self.pos]!r}"
+            )
+        self.pos += 1
+
+    def value(self):
+        """Parse the next JSON value, reading until it is complete."""
+        first = self.peek()
+        start = self.pos
+        scan = start + 1
+        depth = 1 if first in "[{" else 0
+        in_string = first == '"'
+        if not in_string and depth == 0:
+            # number or literal, ends at the next delimiter
+            while True:
+                match = _PRIMITIVE_END.search(self.buffer, scan)
+                if match:
+                    end = match.start()
+                    break
+                scan = len(self.buffer)
+                start, scan = self._refill(start, scan)
+        else:
+            while True:
+                pattern = _STRING_END if in_string else _STRUCTURE
+                match = pattern.search(self.buffer, scan)
+                if match is None or (
+                    match.group() == "\\" and match.end() >= len(self.buffer)
+                ):
+                    scan = len(self.buffer) if match is None else match.start()
+                    start, scan = self._refill(start, scan)
+                    continue
+                character = match.group()
+                scan = match.end()
+                if character == "\\":
+                    scan += 1  # skip the escaped character
+                elif character == '"':
+                    in_string = not in_string
+                elif character in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                if depth == 0 and not in_string:
+                    end = scan
+                    break
+
+        self.pos = end
+        return json.loads(self.buffer[start:end])
+
+    def _refill(self, start, scan):
+        """Read more text, keeping the value from ``start`` on."""
+        self.pos = start
+        self._read()
+        return 0, scan - start
+
+
+def iter_session(f, chunk_size=2**20):
+    """
+    Parse a JSON session file incrementally and yield one analysis at a time.
+
+    Only the analysis being parsed is held in memory, so sessions larger than the
+    available memory can be inspected or converted.
+
+    Args:
+        f (str or file): Path or text file of a session exported as a JSON object
+            of analyses by name.
+        chunk_size (int): Number of characters read at a time.
+
+    Yields:
+        tuple[str, dict]: Name and analysis data of every analysis.
+
+    Raises:
+        ValueError: If the file is not a JSON object.
+    """
+    if isinstance(f, str):
+        with open(f, "r") as file:
+            yield from iter_session(file, chunk_size)
+        return
+
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        yield name, reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def write_session(f, analyses, indent=2, default=None):
+    """
+    Write analyses as a JSON session file, one analysis at a time.
+
+    The output is the same as ``json.dump`` of the whole dictionary of analyses,
+    but only one serialized analysis is held in memory.
+
+    Args:
+        f (str or file): Path or text file to write to.
+        analyses (Iterable[tuple[str, dict]]): Name and JSON-compatible analysis
+            data of every analysis.
+        indent (int, optional): Indentation of the JSON output.
+        default (callable, optional): Conversion of objects JSON cannot encode.
+    """
+    if isinstance(f, str):
+        with open(f, "w") as file:
+            write_session(file, analyses, indent, default)
+        return
+
+    if indent is None:
+        opening, separator, closing, newline = "{", ", ", "}", None
+    else:
+        newline = "\n" + " " * indent
+        opening, separator, closing = "{" + newline, "," + newline, "\n}"
+
+    empty = True
+    for name, analysis in analyses:
+        f.write(opening if empty else separator)
+        empty = False
+        text = json.dumps(analysis, indent=indent, default=default)
+        if newline is not None:
+            text = text.replace("\n", newline)
+        f.write(json.dumps(name) + ": " + text)
+    f.write("{}" if empty else closing)
+
+
+def convert_session(filename, store, chunk_size=2**20):
+    """
+    Convert a JSON session file into a SessionStore, one analysis at a time.
+
+    Args:
+        filename (str): Path of the JSON session file.
+        store (SessionStore): The session store to append to.
+        chunk_size (int): Number of characters read at a time.
+
+    Returns:
+        int: The number of converted analyses.
+    """
+    count = 0
+    for _, analysis in iter_session(filename, chunk_size):
+        store.append(analysis)
+        count += 1
+    return count
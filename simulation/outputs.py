@@ -0,0 +1,180 @@
+import numpy as np
+from dataclasses import dataclass, field
+from scipy.optimize import OptimizeResult
+
+
+@dataclass
+class OutputSpec:
+    """
+    Declarative selection of the recorded states and derived channels.
+
+    Only the selected quantities are kept in the results, at every
+    ``decimation``-th time point of ``t_eval``. Derived channels are the linear
+    output channels of the vehicle model (e.g. ``"suspension_travel_front"`` or
+    ``"tire_force_rear"``), ``"damper_power"`` and the pitch-induced vertical
+    displacement at named points of the body.
+    """
+
+    states: list = field(default_factory=list)  # Indices of the recorded states
+    channels: list = field(default_factory=list)  # Output channels of the model
+    points: dict = field(default_factory=dict)  # Position ahead of the CG by name [m]
+    decimation: int = 1  # Record every n-th time point of t_eval
+
+    def __post_init__(self):
+        if int(self.decimation) != self.decimation or self.decimation < 1:
+            raise ValueError("The decimation must be a positive integer")
+        names = list(self.channels) + list(self.points)
+        if len(set(names)) != len(names):
+            raise ValueError("Output channel names must be unique")
+
+    def sample_times(self, t_eval):
+        """
+        Return the recorded time points.
+
+        Args:
+            t_eval (np.ndarray): The time points of the simulation.
+
+        Returns:
+            np.ndarray: Every ``decimation``-th time point [s].
+        """
+        return np.asarray(t_eval, dtype=float)[:: self.decimation]
+
+
+class OutputRecorder:
+    """
+    Compute the selected states and channels of an OutputSpec from blocks of states.
+
+    The linear channels are stacked into one output matrix per vehicle model, so a
+    block of samples, e.g. a whole result or one chunk of a streamed simulation,
+    is reduced with two matrix products.
+    """
+
+    def __init__(self, spec, vehicle_model, road_input, engine=None):
+        """
+        Initialize the OutputRecorder.
+
+        Args:
+            spec (OutputSpec): The selected quantities.
+            vehicle_model (VehicleModel): The simulated vehicle model.
+            road_input (callable): Road displacement as a function of time.
+            engine (PiecewiseLinearEngine, optional): Engine of the simulation,
+                whose engaged contact elements change the derived channels.
+
+        Raises:
+            ValueError: If a state, channel or point is not supported by the model.
+        """
+        self.spec = spec
+        self.road_input = road_input
+        n_states = len(vehicle_model.initial_conditions)
+        self.states = [int(state) for state in spec.states]
+        invalid = [state for state in self.states if not 0 <= state < n_states]
+        if invalid:
+            raise ValueError(f"Unsupported states: {invalid}")
+
+        linear = [name for name in spec.channels if name != "damper_power"]
+        rows = {}
+        if linear or spec.points:
+            try:
+                outputs = vehicle_model.output_channels()
+            except NotImplementedError:
+                raise ValueError(
+                    f"{type(vehicle_model).__name__} has no derived output channels"
+                )
+            unsupported = [name for name in linear if name not in outputs]
+            if unsupported:
+                raise ValueError(f"Unsupported output channels: {unsupported}")
+            rows = {name: outputs[name] for name in linear}
+            if spec.points:
+                if "pitch" not in outputs:
+                    raise ValueError("Point displacements need a pitching body")
+                body, pitch = outputs["body_disp"], outputs["pitch"]
+                for name, position in spec.points.items():
+                    rows[name] = (
+                        body[0] + position * pitch[0],
+                        body[1] + position * pitch[1],
+                    )
+
+        self.names = list(rows)
+        if rows:
+            self.C = np.array([C_row for C_row, _ in rows.values()])
+            self.D = np.array([D_row for _, D_row in rows.values()])
+            self.delays = vehicle_model.input_delays()
+        self.contacts = None
+        if rows and engine is not None:
+            self.contacts = engine.output_contacts(vehicle_model, self.names)
+        self.damping = None
+        if "damper_power" in spec.channels:
+            # power dissipated in all dampers, q_dot^T C q_dot
+            try:
+                self.damping = vehicle_model.second_order_matrices()[1]
+            except NotImplementedError:
+                raise ValueError(
+                    f"{type(vehicle_model).__name__} has no linear damping matrix"
+                )
+
+    def record(self, t, y, contact_state=None):
+        """
+        Reduce a block of states to the selected states and channels.
+
+        Args:
+            t (np.ndarray): Recorded time points [s].
+            y (np.ndarray): Full states at these time points (n_states, n_samples).
+            contact_state (np.ndarray, optional): Engaged state of every contact
+                element of the engine at these time points.
+
+        Returns:
+            tuple[np.ndarray, dict]: The selected states and the value of every
+                derived channel per name.
+        """
+        t = np.asarray(t, dtype=float)
+        y = np.asarray(y, dtype=float)
+        outputs = {}
+        if self.names:
+            road = np.array(
+                [
+                    np.broadcast_to(self.road_input(np.maximum(0, t - d)), t.shape)
+                    for d in self.delays
+                ]
+            )
+            values = self.C @ y + self.D @ road
+            if self.contacts is not None and contact_state is not None:
+                C, D, offset, F = self.contacts
+                gap = C @ y + D @ road + offset[:, None]
+                values += F @ (contact_state * gap)
+            outputs = dict(zip(self.names, values))
+        if self.damping is not None:
+            velocities = y[1::2]
+            outputs["damper_power"] = np.einsum(
+                "in,ij,jn->n", velocities, self.damping, velocities
+            )
+        # keep the order of the spec
+        order = list(self.spec.channels) + list(self.spec.points)
+        return y[self.states], {name: outputs[name] for name in order}
+
+    def reduce(self, results, decimate=False):
+        """
+        Return results holding only the selected quantities at the recorded times.
+
+        Args:
+            results (OdeResult): Results with full states, and the
+                ``contact_state`` of the elements for results of an engine.
+            decimate (bool): Keep every ``decimation``-th time point of the
+                results, for results computed at every time point of ``t_eval``.
+
+        Returns:
+            OdeResult: Results with ``t``, the selected states ``y``, their indices
+                ``states`` and the derived channels ``outputs``.
+        """
+        step = self.spec.decimation if decimate else 1
+        t = np.asarray(results.t, dtype=float)[::step]
+        contact_state = results.get("contact_state")
+        if contact_state is not None:
+            contact_state = np.asarray(contact_state)[:, ::step]
+        y, outputs = self.record(t, np.asarray(results.y)[:, ::step], contact_state)
+        return OptimizeResult(
+            t=t,
+            y=y,
+            states=self.states,
+            outputs=outputs,
+            success=results.get("success", True),
+        )
@@ -0,0 +1,172 @@
+import numpy as np
+from scipy.optimize import OptimizeResult, fsolve
+from analysis.frequency import frequency_response
+from .integration import integrate
+
+
+def _sinusoid(road_profile):
+    """Return amplitude and angular frequency of a sinusoidal road profile."""
+    if road_profile.profile_type != "sinusoidal":
+        raise ValueError("Periodic steady state requires a sinusoidal road profile")
+    return (
+        road_profile.params["amplitude"],
+        2 * np.pi * road_profile.params["frequency"],
+    )
+
+
+def _analytic_response(vehicle_model, amplitude, omega, t, include_transient):
+    """
+    Return the exact response of a linear model to a sinusoidal road.
+
+    Delayed road inputs start at their delay, as in the equations of motion, so the
+    transient is propagated piecewise between the input switching times.
+    """
+    A, B = vehicle_model.state_space()
+    delays = vehicle_model.input_delays()
+    n = A.shape[0]
+
+    # complex amplitudes of the steady state state vector per road input
+    resolvent_B = np.linalg.solve(1j * omega * np.eye(n) - A, B)
+    phasors = amplitude * np.exp(-1j * omega * delays)
+    oscillation = np.exp(1j * omega * t)
+
+    if not include_transient:
+        return np.imag(np.outer(resolvent_B @ phasors, oscillation))
+
+    eigenvalues, V = np.linalg.eig(A)
+    switches = np.unique(np.concatenate([[0.0], delays]))
+    y = np.empty((n, len(t)))
+    x_start = np.asarray(vehicle_model.initial_conditions, dtype=float)
+
+    for k, start in enumerate(switches):
+        stop = switches[k + 1] if k + 1 < len(switches) else np.inf
+        active = delays <= start
+        X = resolvent_B[:, active] @ phasors[active]
+        deviation = np.linalg.solve(
+            V, x_start - np.imag(X * np.exp(1j * omega * start))
+        )
+
+        segment = (t >= start) & (t < stop)
+        decay = np.exp(np.outer(eigenvalues, t[segment] - start))
+        y[:, segment] = np.imag(np.outer(X, oscillation[segment])) + np.real(
+            V @ (decay * deviation[:, None])
+        )
+
+        if np.isfinite(stop):
+            x_start = np.imag(X * np.exp(1j * omega * stop)) + np.real(
+                V @ (np.exp(eigenvalues * (stop - start)) * deviation)
+            )
+    return y
+
+
+def _shooting_response(vehicle_model, road_profile, omega, t, start_time):
+    """
+    Return the periodic response of any model found by the shooting method.
+
+    The initial state x0 of one road period is solved from Φ_T(x0) = x0, where
+    Φ_T integrates the equations of motion over the period.
+    """
+    period = 2 * np.pi / omega
+
+    def period_map(x0):
+        return integrate(
+            vehicle_model,
+            road_profile.get_profile,
+            x0,
+            (start_time, start_time + period),
+            [start_time + period],
+        ).y[:, -1]
+
+    x_periodic = fsolve(
+        lambda x0: period_map(x0) - x0,
+        np.asarray(vehicle_model.initial_conditions, dtype=float),
+        xtol=1e-10,
+    )
+
+    phases, inverse = np.unique(np.mod(t - start_time, period), return_inverse=True)
+    one_period = integrate(
+        vehicle_model,
+        road_profile.get_profile,
+        x_periodic,
+        (start_time, start_time + period),
+        start_time + phases,
+    )
+    return one_period.y[:, inverse]
+
+
+def periodic_steady_state(
+    vehicle_model, road_profile, t_eval, include_transient=False, method=None
+):
+    """
+    Compute the periodic steady-state response to a sinusoidal road directly.
+
+    Linear models are solved analytically from their state-space form, other
+    models with the shooting method. The analytic solution can include the
+    transient from the model's initial conditions, so it reproduces a full time
+    integration without the settling time.
+
+    Args:
+        vehicle_model (VehicleModel): The vehicle model to simulate.
+        road_profile (RoadProfile): Sinusoidal road profile.
+        t_eval (np.ndarray): The time points at which to evaluate the solution.
+        include_transient (bool): Add the transient from the initial conditions.
+        method (str, optional): "analytic" or "shooting", chosen from the model's
+            linearity by default.
+
+    Returns:
+        OptimizeResult: Results with ``t`` and ``y`` like scipy's solve_ivp.
+
+    Raises:
+        ValueError: If the road profile is not sinusoidal, the method is
+            unsupported or the transient is requested for the shooting method.
+    """
+    amplitude, omega = _sinusoid(road_profile)
+    t = np.asarray(t_eval, dtype=float)
+    if method is None:
+        method = "analytic" if vehicle_model.is_linear else "shooting"
+
+    if method == "analytic":
+        y = _analytic_response(vehicle_model, amplitude, omega, t, include_transient)
+    elif method == "shooting":
+        if include_transient:
+            raise ValueError("The shooting method only computes the steady state")
+        delays = vehicle_model.input_delays() if vehicle_model.is_linear else [0.0]
+        period = 2 * np.pi / omega
+        start_time = period * np.ceil(np.max(delays) / period)
+        y = _shooting_response(vehicle_model, road_profile, omega, t, start_time)
+    else:
+        raise ValueError(f"Unsupported periodic steady state method: {method}")
+
+    return OptimizeResult(
+        t=t,
+        y=y,
+        success=True,
+        status=0,
+        message=f"Periodic steady state ({method}).",
+    )
+
+
+def steady_state_amplitudes(vehicle_models, frequencies, amplitude, channels=None):
+    """
+    Return steady-state output amplitudes for a sweep of sinusoidal roads.
+
+    Args:
+        vehicle_models (VehicleModel or list[VehicleModel]): Linear models, e.g. one
+            per vehicle speed.
+        frequencies (np.ndarray): Road excitation frequencies [Hz].
+        amplitude (float): Road amplitude [m].
+        channels (list[str], optional): Output channels, all channels by default.
+
+    Returns:
+        dict[str, np.ndarray]: Output amplitudes (n_models, n_frequencies) per channel.
+    """
+    if not isinstance(vehicle_models, (list, tuple)):
+        vehicle_models = [vehicle_models]
+    responses = [
+        frequency_response(model, frequencies, channels) for model in vehicle_models
+    ]
+    return {
+        channel: amplitude
+        * np.array([response.magnitude(channel) for response in responses])
+        for channel in responses[0].responses
+    }
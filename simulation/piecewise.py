@@ -0,0 +1,320 @@
+import numpy as np
+from dataclasses import dataclass
+from scipy.linalg import expm
+from scipy.optimize import OptimizeResult, brentq
+
+
+@dataclass
+class TireLiftOff:
+    """
+    Tire that cannot pull the wheel to the road.
+
+    The model's tire force channel is the deviation from the static tire load, so
+    the tire lifts off once the channel drops below ``-preload``.
+    """
+
+    channel: str = "tire_force"  # Tire force output channel
+    preload: float = 2943.0  # Static tire load [N]
+
+
+@dataclass
+class BumpStop:
+    """
+    Stiff stop limiting a suspension travel channel.
+
+    A negative clearance limits compression (travel below the clearance), a
+    positive clearance limits rebound (travel above the clearance).
+    """
+
+    channel: str = "suspension_travel"  # Suspension travel output channel
+    clearance: float = -0.05  # Travel at which the stop engages [m]
+    stiffness: float = 200000.0  # Bump stop stiffness [N/m]
+
+
+class PiecewiseLinearEngine:
+    """
+    Exact simulation of linear models with tire lift-off and bump stops.
+
+    Every combination of engaged contact elements is a linear system. Between the
+    sample times the road input is linear (first-order hold) and the state is
+    propagated with the exact matrix exponential of the active system. A switch
+    within a step is located by root finding on the exact solution and the step is
+    continued with the new system. Propagators are cached per contact state.
+
+    Contact switches are detected by the contact state at the end of every one of
+    ``substeps`` equal parts of a step, so a contact that engages and releases
+    within one part is missed. Use more substeps for short impacts.
+    """
+
+    def __init__(self, elements, max_switches=16, substeps=1):
+        """
+        Initialize the PiecewiseLinearEngine.
+
+        Args:
+            elements (list): TireLiftOff and BumpStop elements.
+            max_switches (int): Contact switches allowed within one time step.
+            substeps (int): Parts of a time step at whose ends contact switches
+                are detected.
+
+        Raises:
+            ValueError: If max_switches or substeps is not positive.
+        """
+        if max_switches < 1 or substeps < 1:
+            raise ValueError("max_switches and substeps must be positive")
+        self.elements = list(elements)
+        self.max_switches = max_switches
+        self.substeps = substeps
+        self._propagator_cache = {}
+        self._system_cache = {}
+
+    def _cache_key(self, vehicle_model):
+        return (
+            type(vehicle_model).__name__,
+            tuple(sorted(vehicle_model.params.items())),
+        )
+
+    def _element_matrices(self, vehicle_model):
+        """
+        Return the gap rows and the force each element adds when engaged.
+
+        Element i is engaged when ``sign[i] * gap[i] > 0`` with
+        ``gap = C x + D r + offset`` and then adds ``gap[i] * E[:, i]`` to x'.
+        """
+        M, _, _, K_road = vehicle_model.second_order_matrices()
+        M_inv = np.linalg.inv(M)
+        outputs = vehicle_model.output_channels()
+        n_states = 2 * M.shape[0]
+
+        C, D, offset, sign, E = [], [], [], [], []
+        for element in self.elements:
+            if element.channel not in outputs:
+                raise ValueError(f"Unsupported output channel: {element.channel}")
+            C_row, D_row = outputs[element.channel]
+            force = np.zeros(n_states)
+            if isinstance(element, TireLiftOff):
+                # the tire force acts along its road stiffness column
+                j = np.argmax(np.abs(D_row))
+                force[1::2] = -M_inv @ K_road[:, j] / D_row[j]
+                C.append(C_row)
+                D.append(D_row)
+                offset.append(element.preload)
+                sign.append(-1.0)
+            elif isinstance(element, BumpStop):
+                if np.any(D_row):
+                    raise ValueError("Bump stop channels must not depend on the road")
+                force[1::2] = -element.stiffness * M_inv @ C_row[0::2]
+                C.append(C_row)
+                D.append(D_row)
+                offset.append(-element.clearance)
+                sign.append(np.sign(element.clearance))
+            else:
+                raise ValueError(f"Unsupported contact element: {element}")
+            E.append(force)
+
+        return (
+            np.array(C),
+            np.array(D),
+            np.array(offset),
+            np.array(sign),
+            np.array(E).T,
+        )
+
+    def output_contacts(self, vehicle_model, channels):
+        """
+        Return the change of output channels by the engaged contact elements.
+
+        An engaged element adds ``F[:, i] * gap[i]`` to the linear channels
+        ``C x + D r``: channels derived from the state derivative pick up the
+        element's force, and a lifted-off tire carries no tensile force.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            channels (list[str]): Names of the output channels.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Gap rows C and D,
+                gap offset and the change F of every channel per gap of an engaged
+                element.
+        """
+        C, D, offset, _, E = self._element_matrices(vehicle_model)
+        # the element forces enter like further inputs with columns E
+        outputs = vehicle_model.output_channels(E)
+        n_inputs = D.shape[1]
+        F = np.zeros((len(channels), len(self.elements)))
+        for k, channel in enumerate(channels):
+            if channel in outputs:
+                F[k] = outputs[channel][1][n_inputs:]
+            for i, element in enumerate(self.elements):
+                if isinstance(element, TireLiftOff) and element.channel == channel:
+                    F[k, i] -= 1.0
+        return C, D, offset, F
+
+    def _system(self, vehicle_model, state):
+        """Return A, B and the constant term of one contact state."""
+        key = (self._cache_key(vehicle_model), state)
+        if key not in self._system_cache:
+            A, B = vehicle_model.state_space()
+            C, D, offset, _, E = self._element_matrices(vehicle_model)
+            active = np.array(state, dtype=bool)
+            E = E[:, active]
+            self._system_cache[key] = (
+                A + E @ C[active],
+                B + E @ D[active],
+                E @ offset[active],
+            )
+        return self._system_cache[key]
+
+    def _propagator(self, vehicle_model, state, h, cache):
+        """
+        Return the exact propagator of one contact state over a step of length h.
+
+        The state after the step is ``Phi x + G0 r0 + G1 r_dot + g`` for the road
+        input ``r0 + r_dot * t``.
+        """
+        key = (self._cache_key(vehicle_model), state, h)
+        if key in self._propagator_cache:
+            return self._propagator_cache[key]
+
+        A, B, c = self._system(vehicle_model, state)
+        n, m = B.shape
+        # augmented state [x, r, 1, r_dot] with constant input slope
+        Z = np.zeros((n + 2 * m + 1, n + 2 * m + 1))
+        Z[:n, :n] = A
+        Z[:n, n : n + m] = B
+        Z[:n, n + m] = c
+        Z[n : n + m, n + m + 1 :] = np.eye(m)
+        F = expm(Z * h)
+        propagator = (F[:n, :n], F[:n, n : n + m], F[:n, n + m + 1 :], F[:n, n + m])
+        if cache:
+            self._propagator_cache[key] = propagator
+        return propagator
+
+    def _advance(self, vehicle_model, state, x, r0, slope, h, cache=False):
+        """Propagate the state by h with the road starting at r0."""
+        Phi, G0, G1, g = self._propagator(vehicle_model, state, h, cache)
+        return Phi @ x + G0 @ r0 + G1 @ slope + g
+
+    def simulate(self, vehicle_model, road, t_eval):
+        """
+        Simulate the vehicle model with contact nonlinearities.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road (RoadProfile, callable or np.ndarray): Road profile, or road
+                displacement sampled at t_eval.
+            t_eval (np.ndarray): Increasing time points [s].
+
+        Returns:
+            OptimizeResult: Results with ``t`` and ``y`` like scipy's solve_ivp, the
+                engaged state of every element ``contact_state`` and the
+                ``switch_times``.
+
+        Raises:
+            ValueError: If the model is not linear or an element is unsupported.
+            RuntimeError: If a time step needs more than ``max_switches`` contact
+                switches.
+        """
+        if not vehicle_model.is_linear:
+            raise ValueError(
+                f"{type(vehicle_model).__name__} does not provide a linear form"
+            )
+        t_eval = np.asarray(t_eval, dtype=float)
+        delays = vehicle_model.input_delays()
+        if isinstance(road, np.ndarray):
+            r = np.array(
+                [np.interp(np.maximum(0, t_eval - d), t_eval, road) for d in delays]
+            )
+        else:
+            get_profile = getattr(road, "get_profile", road)
+            r = np.array(
+                [
+                    np.broadcast_to(
+                        get_profile(np.maximum(0, t_eval - d)), t_eval.shape
+                    )
+                    for d in delays
+                ]
+            )
+
+        C, D, offset, sign, _ = self._element_matrices(vehicle_model)
+        steps = np.diff(t_eval)
+
+        def engaged(x, r_now):
+            return tuple(bool(v) for v in sign * (C @ x + D @ r_now + offset) > 0)
+
+        x = np.asarray(vehicle_model.initial_conditions, dtype=float)
+        y = np.zeros((len(x), len(t_eval)))
+        y[:, 0] = x
+        contact_state = np.zeros((len(self.elements), len(t_eval)), dtype=bool)
+        state = engaged(x, r[:, 0])
+        contact_state[:, 0] = state
+        switch_times = []
+
+        for k, h in enumerate(steps):
+            r0, slope = r[:, k], (r[:, k + 1] - r[:, k]) / h
+            start = 0.0
+            for _ in range(self.max_switches):
+                remaining = h - start
+                r_start = r0 + slope * start
+                # contact state at the end of every substep, propagators of
+                # whole steps are cached
+                lower = 0.0
+                for j in range(1, self.substeps + 1):
+                    upper = remaining * j / self.substeps
+                    x_end = self._advance(
+                        vehicle_model, state, x, r_start, slope, upper, start == 0
+                    )
+                    end_state = engaged(x_end, r_start + slope * upper)
+                    changed = [i for i in range(len(state)) if state[i] != end_state[i]]
+                    if changed:
+                        break
+                    lower = upper
+                if not changed:
+                    break
+
+                def margin(tau, i):
+                    """Gap of element i, positive on the side of its state."""
+                    x_tau = self._advance(vehicle_model, state, x, r_start, slope, tau)
+                    gap = C[i] @ x_tau + D[i] @ (r_start + slope * tau) + offset[i]
+                    return sign[i] * gap * (1 if state[i] else -1)
+
+                # earliest switch among the elements changing within the substep
+                times = {}
+                for i in changed:
+                    # right after a switch the margin is zero up to rounding, so
+                    # find a point where the element is on the side of its state
+                    inside = lower
+                    for j in range(1, 41):
+                        if margin(inside, i) > 0:
+                            break
+                        inside = lower + (upper - lower) * 2.0**-j
+                    if margin(inside, i) > 0:
+                        times[i] = brentq(
+                            margin, inside, upper, args=(i,), xtol=1e-12 * h
+                        )
+                    else:
+                        times[i] = lower
+                i = min(times, key=times.get)
+                tau = times[i]
+
+                x = self._advance(vehicle_model, state, x, r_start, slope, tau)
+                start += tau
+                state = state[:i] + (not state[i],) + state[i + 1 :]
+                switch_times.append(t_eval[k] + start)
+            else:
+                raise RuntimeError(
+                    f"More than {self.max_switches} contact switches in the step "
+                    f"at t={t_eval[k]}, increase max_switches or refine t_eval"
+                )
+            x = x_end
+            y[:, k + 1] = x
+            contact_state[:, k + 1] = state
+
+        return OptimizeResult(
+            t=t_eval,
+            y=y,
+            contact_state=contact_state,
+            switch_times=np.array(switch_times),
+            success=True,
+            status=0,
+            message="Piecewise-linear propagation between contact switches.",
+        )
@@ -0,0 +1,232 @@
+import numpy as np
+
+
+def _array(values):
+    """Return values as a float array, without copying float arrays."""
+    return np.asarray(values, dtype=float)
+
+
+class AnalysisRecord:
+    """
+    Compact analysis of one simulation, holding its time series as NumPy arrays.
+
+    The record keeps the dictionary interface of earlier analysis data, so
+    ``record["results"]["y"]`` or ``record["vehicle_model"]["type"]`` still work,
+    while conversion to JSON types only happens at the export boundary
+    (``to_dict``). The evaluation times are stored only if they differ from the
+    result times. Results recorded with an output specification hold only the
+    selected states, whose indices are kept in ``states``, and the derived
+    channels in ``outputs``.
+    """
+
+    __slots__ = (
+        "name",
+        "execution_date",
+        "vehicle_model",
+        "road_profile",
+        "t_span",
+        "t",
+        "y",
+        "road",
+        "_t_eval",
+        "states",
+        "outputs",
+    )
+
+    KEYS = (
+        "name",
+        "execution_date",
+        "vehicle_model",
+        "road_profile",
+        "results",
+        "t_span",
+        "t_eval",
+    )
+
+    def __init__(
+        self,
+        name,
+        execution_date,
+        vehicle_model,
+        road_profile,
+        t,
+        y,
+        road,
+        t_span,
+        t_eval=None,
+        states=None,
+        outputs=None,
+    ):
+        """
+        Initialize the AnalysisRecord.
+
+        Args:
+            name (str): The name of the analysis.
+            execution_date (str): ISO timestamp of the simulation run.
+            vehicle_model (dict): Model type, params and initial conditions.
+            road_profile (dict): Road profile type and params.
+            t (np.ndarray): Result time points [s].
+            y (np.ndarray): Result states (n_states, n_samples).
+            road (np.ndarray): Road displacement at the result time points [m].
+            t_span (tuple): The time span of the simulation.
+            t_eval (np.ndarray, optional): Requested evaluation times, the result
+                time points if None.
+            states (list[int], optional): Indices of the recorded states, all
+                states if None.
+            outputs (dict, optional): Derived channels (n_samples,) by name.
+        """
+        self.name = name
+        self.execution_date = execution_date
+        self.vehicle_model = vehicle_model
+        self.road_profile = road_profile
+        self.t_span = t_span
+        self.t = _array(t)
+        self.y = _array(y)
+        self.road = _array(road)
+        self.t_eval = t_eval
+        self.states = None if states is None else [int(state) for state in states]
+        self.outputs = {name: _array(value) for name, value in (outputs or {}).items()}
+
+    @property
+    def t_eval(self):
+        """Requested evaluation times [s]."""
+        return self.t if self._t_eval is None else self._t_eval
+
+    @t_eval.setter
+    def t_eval(self, t_eval):
+        if t_eval is not None:
+            t_eval = _array(t_eval)
+            if t_eval is self.t or np.array_equal(t_eval, self.t):
+                t_eval = None
+        self._t_eval = t_eval
+
+    @classmethod
+    def from_simulation(cls, simulation_control, metadata):
+        """
+        Create a record from a finished simulation, sharing its result arrays.
+
+        Args:
+            simulation_control (SimulationControl): Simulation with results.
+            metadata (dict): Name, execution date, vehicle model, road profile and
+                time span of the analysis.
+
+        Returns:
+            AnalysisRecord: The analysis record.
+        """
+        results = simulation_control.results
+        states = results.get("states")
+        return cls(
+            t=results.t,
+            y=results.y,
+            road=results.road_profile,
+            # reduced results are evaluated at the recorded time points only
+            t_eval=simulation_control.t_eval if states is None else None,
+            states=states,
+            outputs=results.get("outputs"),
+            **metadata,
+        )
+
+    @classmethod
+    def from_dict(cls, analysis_data):
+        """
+        Create a record from analysis data in the dictionary format of JSON exports.
+
+        Args:
+            analysis_data (dict): The analysis data dictionary.
+
+        Returns:
+            AnalysisRecord: The analysis record.
+
+        Raises:
+            ValueError: If the analysis data lacks a name or results.
+        """
+        if isinstance(analysis_data, cls):
+            return analysis_data
+        if not isinstance(analysis_data, dict) or "name" not in analysis_data:
+            raise ValueError("Invalid analysis data format")
+        if "results" not in analysis_data:
+            raise ValueError("Invalid analysis data format")
+
+        results = analysis_data["results"]
+        return cls(
+            name=analysis_data["name"],
+            execution_date=analysis_data.get("execution_date"),
+            vehicle_model=analysis_data.get("vehicle_model"),
+            road_profile=analysis_data.get("road_profile"),
+            t=results["t"],
+            y=results["y"],
+            road=results["road_profile"],
+            t_span=analysis_data.get("t_span"),
+            t_eval=analysis_data.get("t_eval"),
+            states=results.get("states"),
+            outputs=results.get("outputs"),
+        )
+
+    def to_dict(self):
+        """
+        Return the analysis data with JSON types, for exports.
+
+        Returns:
+            dict: The analysis data dictionary.
+        """
+        results = {
+            "t": self.t.tolist(),
+            "y": self.y.tolist(),
+            "road_profile": self.road.tolist(),
+        }
+        if self.states is not None:
+            results["states"] = self.states
+        if self.outputs:
+            results["outputs"] = {
+                name: value.tolist() for name, value in self.outputs.items()
+            }
+        return {
+            "name": self.name,
+            "execution_date": self.execution_date,
+            "vehicle_model": self.vehicle_model,
+            "road_profile": self.road_profile,
+            "results": results,
+            "t_span": list(self.t_span) if self.t_span is not None else None,
+            "t_eval": self.t_eval.tolist(),
+        }
+
+    @property
+    def nbytes(self):
+        """Memory of the result arrays [bytes]."""
+        t_eval = 0 if self._t_eval is None else self._t_eval.nbytes
+        outputs = sum(value.nbytes for value in self.outputs.values())
+        return self.t.nbytes + self.y.nbytes + self.road.nbytes + t_eval + outputs
+
+    def __getitem__(self, key):
+        if key == "results":
+            results = {"t": self.t, "y": self.y, "road_profile": self.road}
+            if self.states is not None:
+                results["states"] = self.states
+            if self.outputs:
+                results["outputs"] = self.outputs
+            return results
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def keys(self):
+        return list(self.KEYS)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def __repr__(self):
+        return (
+            f"AnalysisRecord(name={self.name!r}, "
+            f"model={(self.vehicle_model or {}).get('type')!r}, "
+            f"samples={len(self.t)})"
+        )
@@ -0,0 +1,439 @@
+import argparse
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from .index import AnalysisIndex
+from .records import AnalysisRecord
+from .storage import decode_array, encode_arrays
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_MAGIC = b"VCSR"
+_FRAME = struct.Struct("<4sQI")  # magic, payload length, CRC-32 of the payload
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+class _FileLock:
+    """Exclusive lock on a file, shared by all processes using the store."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+
+
+def _encode(analysis_data, policies=None):
+    """Return the log entry and the storage report of an analysis."""
+    record = AnalysisRecord.from_dict(analysis_data)
+    arrays = {"t": record.t, "y": record.y, "road": record.road}
+    if record._t_eval is not None:
+        arrays["t_eval"] = record._t_eval
+    for name, value in record.outputs.items():
+        arrays[f"outputs.{name}"] = value
+    if callable(policies):
+        policies = policies(record)
+    blobs, metadata, report = encode_arrays(arrays, policies)
+    header = {
+        "name": record.name,
+        "execution_date": record.execution_date,
+        "vehicle_model": record.vehicle_model,
+        "road_profile": record.road_profile,
+        "t_span": list(record.t_span) if record.t_span is not None else None,
+        "states": record.states,
+        "arrays": [[key, metadata[key], len(blobs[key])] for key in arrays],
+    }
+    return _frame(header, blobs.values()), report
+
+
+def _frame(header, blobs=()):
+    header = json.dumps(header, default=float).encode()
+    payload = b"".join([_HEADER_LENGTH.pack(len(header)), header, *blobs])
+    return _FRAME.pack(_MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode(payload):
+    """Return the analysis record of an entry payload."""
+    (length,) = _HEADER_LENGTH.unpack_from(payload)
+    offset = _HEADER_LENGTH.size + length
+    header = json.loads(bytes(payload[_HEADER_LENGTH.size : offset]))
+    arrays = {}
+    for key, metadata, size in header["arrays"]:
+        data = memoryview(payload)[offset : offset + size]
+        if metadata.get("dtype") == "<f8" and metadata["compression"] is None:
+            # raw float64 samples are used in place
+            arrays[key] = np.frombuffer(data, "<f8").reshape(metadata["shape"])
+        else:
+            arrays[key] = decode_array(data, metadata)
+        offset += size
+    outputs = {
+        key.split(".", 1)[1]: arrays.pop(key)
+        for key in list(arrays)
+        if key.startswith("outputs.")
+    }
+    return AnalysisRecord(
+        name=header["name"],
+        execution_date=header["execution_date"],
+        vehicle_model=header["vehicle_model"],
+        road_profile=header["road_profile"],
+        t_span=header["t_span"],
+        states=header.get("states"),
+        outputs=outputs,
+        **arrays,
+    )
+
+
+class SessionStore:
+    """
+    Append-only session store of analyses in a segment log.
+
+    Every analysis is appended to the newest log segment as one framed entry
+    (length and CRC-32 of a JSON header followed by the arrays, encoded with the
+    storage policies of the store), so saving a result costs only the size of that
+    result. Writers hold an exclusive file lock
+    while appending, which lets several processes, e.g. the workers of a parameter
+    sweep, checkpoint into the same store. An entry that was not completely
+    written is ignored by readers and cut off by the next writer.
+
+    Each process keeps an in-memory index of the latest entry per name and only
+    reads entries written since its last refresh. Later entries replace earlier
+    ones with the same name, and ``compact`` rewrites the live entries into new
+    segments.
+    """
+
+    def __init__(self, path, segment_size=64 * 2**20, policies=None):
+        """
+        Open or create the SessionStore.
+
+        Args:
+            path (str): Directory of the store.
+            segment_size (int): Size after which a new log segment is started
+                [bytes].
+            policies (dict or callable, optional): StoragePolicy per channel
+                (``t``, ``y``, ``road``, ``t_eval`` and ``outputs.<name>`` for
+                derived channels) of appended analyses, or a
+                function returning them for an analysis record, e.g. based on
+                ``table_style_policies``. Raw float64 if None.
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.policies = policies
+        os.makedirs(path, exist_ok=True)
+        self._lock_path = os.path.join(path, "LOCK")
+        self._index = {}  # name -> (segment, offset, length) of the latest entry
+        self._position = (0, 0)  # segment and offset scanned so far
+        self.refresh()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f"{segment:08d}.log")
+
+    def _segments(self):
+        return sorted(
+            int(name[:-4])
+            for name in os.listdir(self.path)
+            if name.endswith(".log") and name[:-4].isdigit()
+        )
+
+    def refresh(self, repair=False):
+        """
+        Read the entries appended since the last refresh, e.g. by other processes.
+
+        Args:
+            repair (bool): Cut off an incompletely written entry at the end of the
+                newest segment. Only safe while holding the write lock.
+        """
+        segments = self._segments()
+        segment, offset = self._position
+        if segment and segment not in segments:
+            # the segments were compacted by another process
+            self._index = {}
+            segment, offset = 0, 0
+
+        for number in [s for s in segments if s >= segment]:
+            if number != segment:
+                offset = 0
+            with open(self._segment_path(number), "r+b" if repair else "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                while offset + _FRAME.size <= size:
+                    f.seek(offset)
+                    magic, length, crc = _FRAME.unpack(f.read(_FRAME.size))
+                    end = offset + _FRAME.size + length
+                    if magic != _MAGIC or end > size or length < _HEADER_LENGTH.size:
+                        break
+                    (header_length,) = _HEADER_LENGTH.unpack(
+                        f.read(_HEADER_LENGTH.size)
+                    )
+                    if end == size:
+                        # only the last entry of a segment can be torn
+                        f.seek(offset + _FRAME.size)
+                        if zlib.crc32(f.read(length)) != crc:
+                            break
+                        f.seek(offset + _FRAME.size + _HEADER_LENGTH.size)
+                    try:
+                        header = json.loads(f.read(header_length))
+                    except ValueError:
+                        break
+                    if header.get("deleted"):
+                        self._index.pop(header["name"], None)
+                    else:
+                        self._index[header["name"]] = (number, offset, length)
+                    offset = end
+                if repair and offset < size and number == segments[-1]:
+                    f.truncate(offset)
+            segment = number
+        self._position = (segment, offset)
+
+    def names(self):
+        """
+        List the names of all stored analyses.
+
+        Returns:
+            list[str]: Analysis names in the order they were stored.
+        """
+        return list(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def load(self, name):
+        """
+        Load an analysis.
+
+        Args:
+            name (str): The name of the analysis.
+
+        Returns:
+            AnalysisRecord: The stored analysis.
+
+        Raises:
+            KeyError: If no analysis of that name is stored.
+        """
+        if name not in self._index:
+            raise KeyError(name)
+        segment, offset, length = self._index[name]
+        try:
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(offset + _FRAME.size)
+                payload = bytearray(length)
+                f.readinto(payload)
+        except FileNotFoundError:
+            # compacted by another process since the last refresh
+            self.refresh()
+            return self.load(name)
+        return _decode(payload)
+
+    def _append(self, entries):
+        """Append encoded entries under the write lock and make them durable."""
+        with _FileLock(self._lock_path):
+            self.refresh(repair=True)
+            segments = self._segments()
+            segment = segments[-1] if segments else 1
+            path = self._segment_path(segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_size:
+                segment += 1
+                path = self._segment_path(segment)
+            with open(path, "ab") as f:
+                f.write(b"".join(entries))
+                f.flush()
+                os.fsync(f.fileno())
+            self.refresh()
+
+    def append(self, analysis_data):
+        """
+        Store an analysis, replacing a stored analysis of the same name.
+
+        Args:
+            analysis_data (AnalysisRecord or dict): The analysis data.
+
+        Returns:
+            StorageReport: Compression ratio and reconstruction error per channel.
+        """
+        return self.append_many([analysis_data])[0]
+
+    def append_many(self, analyses):
+        """
+        Store several analyses with a single lock and sync.
+
+        Args:
+            analyses (list[AnalysisRecord or dict]): The analysis data.
+
+        Returns:
+            list[StorageReport]: Storage report of every analysis.
+        """
+        encoded = [_encode(analysis, self.policies) for analysis in analyses]
+        if encoded:
+            self._append([entry for entry, _ in encoded])
+        return [report for _, report in encoded]
+
+    def delete(self, name):
+        """
+        Remove an analysis from the store. The space is freed by ``compact``.
+
+        Args:
+            name (str): The name of the analysis.
+        """
+        self._append([_frame({"name": name, "deleted": True})])
+
+    def stats(self):
+        """
+        Return the size of the store and of its live entries.
+
+        Returns:
+            dict: Number of live analyses, total and live size in bytes.
+        """
+        total = sum(
+            os.path.getsize(self._segment_path(segment)) for segment in self._segments()
+        )
+        live = sum(_FRAME.size + length for _, _, length in self._index.values())
+        return {"analyses": len(self._index), "bytes": total, "live_bytes": live}
+
+    def compact(self):
+        """
+        Rewrite the live analyses into new segments and delete the old ones.
+
+        Readers always see either the old or the new segments with the same live
+        analyses, and other processes pick up the new segments on refresh.
+        """
+        with _FileLock(self._lock_path):
+            self.refresh(repair=True)
+            old_segments = self._segments()
+            segment = (old_segments[-1] if old_segments else 0) + 1
+            index = {}
+            f = None
+            for name, (number, offset, length) in self._index.items():
+                with open(self._segment_path(number), "rb") as source:
+                    source.seek(offset)
+                    entry = source.read(_FRAME.size + length)
+                if f is None or f.tell() >= self.segment_size:
+                    if f is not None:
+                        self._finish_segment(f, segment)
+                        segment += 1
+                    f = open(self._segment_path(segment) + ".tmp", "wb")
+                index[name] = (segment, f.tell(), length)
+                f.write(entry)
+            if f is None:
+                # an empty successor keeps segment numbers from being reused, so
+                # readers of the old segments notice the compaction
+                f = open(self._segment_path(segment) + ".tmp", "wb")
+            self._finish_segment(f, segment)
+
+            for number in old_segments:
+                os.remove(self._segment_path(number))
+            self._index = index
+            self._position = (segment, 0)
+            self.refresh()
+
+    def _finish_segment(self, f, segment):
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        os.replace(self._segment_path(segment) + ".tmp", self._segment_path(segment))
+
+
+def _condition(text):
+    """Parse a ``key=value`` or ``key=lower:upper`` query condition."""
+
+    def value(item):
+        try:
+            return float(item)
+        except ValueError:
+            return item
+
+    key, separator, condition = text.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Expected key=value, got {text!r}")
+    if ":" in condition:
+        lower, upper = condition.split(":", 1)
+        return key, (value(lower) if lower else None, value(upper) if upper else None)
+    return key, value(condition)
+
+
+def main(argv=None):
+    """
+    Command line interface, e.g. ``python -m simulation compact <path>``.
+
+    ``index`` adds the analyses of a store to its AnalysisIndex and ``query`` lists
+    indexed analyses, e.g. ``python -m simulation query <path> --model
+    HalfCarModel --metric rms_acc_ms=:1.5 --order-by metrics.rms_acc_ms``.
+    """
+    parser = argparse.ArgumentParser(description="Manage a simulation session store")
+    parser.add_argument(
+        "command", choices=["list", "stats", "compact", "index", "query"]
+    )
+    parser.add_argument("path", help="Directory of the session store")
+    parser.add_argument(
+        "--index", help="SQLite file of the analysis index, index.sqlite in the store"
+    )
+    parser.add_argument("--model", help="Vehicle model type")
+    parser.add_argument("--road", help="Road profile type")
+    for name in ("param", "road-param", "metric"):
+        parser.add_argument(
+            f"--{name}",
+            type=_condition,
+            action="append",
+            default=[],
+            help="Condition key=value or key=lower:upper, ends may be empty",
+        )
+    parser.add_argument("--order-by", default="name")
+    parser.add_argument("--descending", action="store_true")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    store = SessionStore(args.path)
+    if args.command == "list":
+        print("\n".join(store.names()))
+    elif args.command == "stats":
+        print(json.dumps(store.stats()))
+    elif args.command == "compact":
+        before = store.stats()["bytes"]
+        store.compact()
+        print(f"Compacted {before} to {store.stats()['bytes']} bytes")
+    else:
+        path = args.index or os.path.join(args.path, "index.sqlite")
+        with AnalysisIndex(path) as index:
+            if args.command == "index":
+                names = store.names()
+                index.add_many(
+                    [store.load(name) for name in names],
+                    storage=[args.path] * len(names),
+                )
+                print(f"Indexed {len(names)} analyses")
+                return
+            try:
+                entries = index.query(
+                    args.model,
+                    args.road,
+                    order_by=args.order_by,
+                    descending=args.descending,
+                    limit=args.limit,
+                    params=dict(args.param),
+                    road=dict(args.road_param),
+                    metrics=dict(args.metric),
+                )
+            except ValueError as error:
+                parser.error(str(error))
+            for entry in entries:
+                print(json.dumps(entry))
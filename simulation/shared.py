@@ -0,0 +1,129 @@
+import os
+import uuid
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from .collector import SimulationCollector
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """
+    Small, picklable handle of an array in shared memory or a memory-mapped file.
+
+    Worker processes write result arrays into shared buffers and return only these
+    handles, so the transfer cost does not grow with the result size.
+    """
+
+    name: str  # Name of the shared memory block, or path of the .npy file
+    shape: tuple
+    dtype: str
+    memmap: bool = False  # True for a memory-mapped .npy file
+
+    @classmethod
+    def from_array(cls, array, directory=None):
+        """
+        Copy an array into a new shared memory block or memory-mapped file.
+
+        Args:
+            array (np.ndarray): The array to share.
+            directory (str, optional): Directory of memory-mapped .npy files.
+                Shared memory is used if None.
+
+        Returns:
+            SharedArray: Handle of the shared copy.
+        """
+        array = np.ascontiguousarray(array)
+        if directory is not None:
+            path = os.path.join(directory, f"{uuid.uuid4().hex}.npy")
+            target = np.lib.format.open_memmap(
+                path, mode="w+", dtype=array.dtype, shape=array.shape
+            )
+            target[...] = array
+            target.flush()
+            del target
+            return cls(path, array.shape, array.dtype.str, memmap=True)
+
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        block.close()
+        if os.name == "posix":
+            # the attaching process takes ownership, so the block outlives this
+            # worker; the tracker registers POSIX names with their leading slash
+            resource_tracker.unregister("/" + block.name, "shared_memory")
+        return cls(block.name, array.shape, array.dtype.str)
+
+    def attach(self):
+        """
+        Map the shared array into the calling process without copying it.
+
+        Returns:
+            tuple[np.ndarray, SharedMemory]: The array and its shared memory block,
+                which is None for memory-mapped files.
+        """
+        if self.memmap:
+            return np.load(self.name, mmap_mode="r+"), None
+        block = shared_memory.SharedMemory(name=self.name)
+        return np.ndarray(self.shape, np.dtype(self.dtype), buffer=block.buf), block
+
+    def unlink(self):
+        """Free the shared memory block or delete the memory-mapped file."""
+        if self.memmap:
+            if os.path.exists(self.name):
+                os.remove(self.name)
+            return
+        block = shared_memory.SharedMemory(name=self.name)
+        block.close()
+        block.unlink()
+
+
+def share_results(simulation_control, directory=None):
+    """
+    Return the analysis data of a finished simulation with shared result arrays.
+
+    The analysis data has the format of ``SimulationCollector.add_analysis``, with
+    the time, state, road, derived channel and t_eval arrays replaced by
+    SharedArray handles. Reduced results have no t_eval.
+
+    Args:
+        simulation_control (SimulationControl): Simulation with results.
+        directory (str, optional): Directory of memory-mapped .npy files, shared
+            memory is used if None.
+
+    Returns:
+        dict: Analysis data to pass to ``SimulationCollector.adopt_shared_analysis``.
+    """
+    results = simulation_control.results
+    analysis_data = SimulationCollector.analysis_metadata(simulation_control)
+    analysis_data["results"] = {
+        key: SharedArray.from_array(getattr(results, key), directory)
+        for key in ("t", "y", "road_profile")
+    }
+    analysis_data["t_eval"] = None
+    if results.get("states") is None:
+        analysis_data["t_eval"] = SharedArray.from_array(
+            simulation_control.t_eval, directory
+        )
+    else:
+        analysis_data["results"]["states"] = list(results.states)
+        analysis_data["results"]["outputs"] = {
+            name: SharedArray.from_array(value, directory)
+            for name, value in results.get("outputs", {}).items()
+        }
+    return analysis_data
+
+
+def run_shared(simulation_control, directory=None):
+    """
+    Run a simulation, typically in a worker process, and share its results.
+
+    Args:
+        simulation_control (SimulationControl): The simulation to run.
+        directory (str, optional): Directory of memory-mapped .npy files, shared
+            memory is used if None.
+
+    Returns:
+        dict: Analysis data with SharedArray handles, see ``share_results``.
+    """
+    simulation_control.run_simulation()
+    return share_results(simulation_control, directory)
@@ -0,0 +1,230 @@
+import lzma
+import zlib
+from dataclasses import dataclass, field
+import numpy as np
+import configuration
+
+_COMPRESSORS = {
+    None: (lambda data, level: data, lambda data: data),
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.decompress,
+    ),
+}
+
+_INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+@dataclass
+class StoragePolicy:
+    """How the samples of one stored channel are encoded."""
+
+    dtype: str = "float64"  # "float64", "float32" or "quantized"
+    tolerance: float = None  # Maximum reconstruction error of quantized samples
+    delta: bool = False  # Store differences of successive quantized samples
+    compression: str = None  # None, "zlib" or "lzma"
+    level: int = 6  # Compression level
+
+    def __post_init__(self):
+        if self.dtype not in ("float64", "float32", "quantized"):
+            raise ValueError(f"Unsupported storage dtype: {self.dtype}")
+        if self.dtype == "quantized" and not (self.tolerance and self.tolerance > 0):
+            raise ValueError("Quantized storage needs a positive tolerance")
+        if self.delta and self.dtype != "quantized":
+            raise ValueError("Delta encoding needs quantized samples")
+        if self.compression not in _COMPRESSORS:
+            raise ValueError(f"Unsupported compression: {self.compression}")
+
+
+@dataclass
+class ChannelReport:
+    """Size and accuracy of one stored channel."""
+
+    raw_bytes: int  # Size as float64 [bytes]
+    stored_bytes: int  # Encoded size [bytes]
+    max_error: float  # Maximum absolute reconstruction error
+
+    @property
+    def ratio(self):
+        """Compression ratio, raw size over stored size."""
+        return self.raw_bytes / max(self.stored_bytes, 1)
+
+
+@dataclass
+class StorageReport:
+    """Compression ratios and reconstruction errors of a stored analysis."""
+
+    channels: dict = field(default_factory=dict)  # ChannelReport per channel
+
+    @property
+    def raw_bytes(self):
+        return sum(channel.raw_bytes for channel in self.channels.values())
+
+    @property
+    def stored_bytes(self):
+        return sum(channel.stored_bytes for channel in self.channels.values())
+
+    @property
+    def ratio(self):
+        """Compression ratio of all channels."""
+        return self.raw_bytes / max(self.stored_bytes, 1)
+
+    @property
+    def max_error(self):
+        """Maximum absolute reconstruction error per channel."""
+        return {name: channel.max_error for name, channel in self.channels.items()}
+
+
+def encode_array(array, policy=None):
+    """
+    Encode an array with a storage policy.
+
+    Quantized samples are rounded to multiples of twice the tolerance and stored in
+    the smallest integer type that holds them (or their differences), so every
+    sample is reconstructed within the tolerance.
+
+    Args:
+        array (np.ndarray): Samples, a row per channel for 2-D arrays.
+        policy (StoragePolicy or list[StoragePolicy], optional): Policy of the
+            array, or one policy per row. Raw float64 if None.
+
+    Returns:
+        tuple[bytes, dict]: The encoded bytes and the metadata to decode them.
+    """
+    array = np.asarray(array, dtype=float)
+    if isinstance(policy, (list, tuple)):
+        if array.ndim != 2 or len(policy) != len(array):
+            raise ValueError("Row policies need one policy per row of a 2-D array")
+        encoded = [
+            encode_array(row, row_policy) for row, row_policy in zip(array, policy)
+        ]
+        metadata = {
+            "rows": [meta for _, meta in encoded],
+            "sizes": [len(data) for data, _ in encoded],
+        }
+        return b"".join(data for data, _ in encoded), metadata
+
+    policy = policy or StoragePolicy()
+    metadata = {"shape": list(array.shape), "compression": policy.compression}
+    if policy.dtype == "quantized":
+        step = 2 * policy.tolerance
+        values = np.round(array / step).astype(np.int64)
+        if policy.delta:
+            values = np.diff(values, axis=-1, prepend=0)
+        limit = max(np.max(np.abs(values), initial=0), 1)
+        dtype = next(t for t in _INTEGER_TYPES if limit <= np.iinfo(t).max)
+        values = values.astype(dtype)
+        metadata.update(step=step, delta=policy.delta)
+    else:
+        values = array.astype(policy.dtype)
+    metadata["dtype"] = values.dtype.str
+
+    compress, _ = _COMPRESSORS[policy.compression]
+    return compress(np.ascontiguousarray(values).tobytes(), policy.level), metadata
+
+
+def decode_array(data, metadata):
+    """
+    Decode an array encoded by ``encode_array``.
+
+    Args:
+        data (bytes): The encoded bytes.
+        metadata (dict): The metadata returned by ``encode_array``.
+
+    Returns:
+        np.ndarray: The reconstructed float64 samples.
+    """
+    if "rows" in metadata:
+        offsets = np.cumsum([0] + metadata["sizes"])
+        return np.array(
+            [
+                decode_array(data[start:end], meta)
+                for start, end, meta in zip(offsets[:-1], offsets[1:], metadata["rows"])
+            ]
+        )
+
+    _, decompress = _COMPRESSORS[metadata["compression"]]
+    values = np.frombuffer(decompress(bytes(data)), metadata["dtype"])
+    values = values.reshape(metadata["shape"])
+    if "step" in metadata:
+        if metadata["delta"]:
+            values = np.cumsum(values, axis=-1, dtype=np.int64)
+        return values * metadata["step"]
+    return values.astype(float)
+
+
+def encode_arrays(arrays, policies=None):
+    """
+    Encode the arrays of an analysis and report the achieved compression.
+
+    Args:
+        arrays (dict[str, np.ndarray]): Arrays by channel name.
+        policies (dict, optional): StoragePolicy, or a list of row policies, per
+            channel name. Channels without a policy are stored as raw float64.
+
+    Returns:
+        tuple[dict, dict, StorageReport]: Encoded bytes and metadata per channel,
+            and the storage report.
+    """
+    policies = policies or {}
+    blobs, metadata, report = {}, {}, StorageReport()
+    for name, array in arrays.items():
+        array = np.asarray(array, dtype=float)
+        blobs[name], metadata[name] = encode_array(array, policies.get(name))
+        error = np.max(
+            np.abs(decode_array(blobs[name], metadata[name]) - array), initial=0.0
+        )
+        report.channels[name] = ChannelReport(
+            raw_bytes=array.size * 8,
+            stored_bytes=len(blobs[name]),
+            max_error=float(error),
+        )
+    return blobs, metadata, report
+
+
+def table_style_policies(states, dt, compression="zlib", outputs=None):
+    """
+    Return storage policies with the precision of the result tables.
+
+    Model states alternate between displacements and velocities. Displacements and
+    the road keep the displayed displacement decimals of
+    ``TABLE_STYLE["significant_figures"]``. Velocities keep the displayed velocity
+    decimals and enough precision that accelerations derived by differentiation
+    keep the displayed acceleration decimals. All channels are delta encoded.
+
+    Args:
+        states (int or list[int]): Number of model states, or the indices of the
+            recorded states of reduced results (``record.states``).
+        dt (float): Sampling time of the results [s].
+        compression (str): "zlib", "lzma" or None.
+        outputs (dict, optional): Absolute tolerance per derived output channel.
+
+    Returns:
+        dict: Policies for the channels ``t``, ``y``, ``road``, ``t_eval`` and
+            ``outputs.<name>``.
+    """
+    decimals = configuration.TABLE_STYLE["significant_figures"]
+
+    def policy(tolerance):
+        return StoragePolicy("quantized", tolerance, True, compression)
+
+    if isinstance(states, (int, np.integer)):
+        states = range(states)
+    displacement = policy(0.5 * 10.0 ** -decimals["displacement"])
+    velocity = policy(
+        min(
+            0.5 * 10.0 ** -decimals["velocity"],
+            0.5 * 10.0 ** -decimals["acceleration"] * dt,
+        )
+    )
+    time = policy(1e-6 * dt)
+    policies = {
+        "t": time,
+        "t_eval": time,
+        "y": [displacement if i % 2 == 0 else velocity for i in states],
+        "road": displacement,
+    }
+    for name, tolerance in (outputs or {}).items():
+        policies[f"outputs.{name}"] = policy(tolerance)
+    return policies
@@ -0,0 +1,196 @@
+import numpy as np
+from collections import OrderedDict
+from scipy.optimize import OptimizeResult
+from road.profiles import RoadProfile
+from .integration import integrate
+
+
+class SuperpositionCache:
+    """
+    Cache of unit amplitude responses of linear vehicle models.
+
+    Linear models respond to ``amplitude * shape`` with ``amplitude`` times the
+    response to the unit shape, and to a sum of road profiles with the sum of the
+    single responses. The cache therefore integrates every road shape and the
+    initial condition response once, and answers further requests by scaling and
+    adding the stored components.
+    """
+
+    def __init__(self, max_entries=128):
+        """
+        Initialize the SuperpositionCache.
+
+        Args:
+            max_entries (int): Number of cached responses kept, least recently used
+                responses are dropped first.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._responses = OrderedDict()
+
+    @staticmethod
+    def _model_key(vehicle_model):
+        return (
+            type(vehicle_model).__name__,
+            tuple(sorted(vehicle_model.params.items())),
+        )
+
+    @staticmethod
+    def _grid_key(t_span, t_eval):
+        t_eval = np.asarray(t_eval, dtype=float)
+        return (tuple(t_span), t_eval.shape, hash(t_eval.tobytes()))
+
+    @staticmethod
+    def _shape_key(road_profile):
+        return (
+            road_profile.profile_type,
+            tuple(
+                sorted(
+                    (key, value)
+                    for key, value in road_profile.params.items()
+                    if key != "amplitude"
+                )
+            ),
+        )
+
+    def _cached(self, key, compute):
+        if key in self._responses:
+            self.hits += 1
+            self._responses.move_to_end(key)
+            return self._responses[key]
+
+        self.misses += 1
+        response = compute()
+        self._responses[key] = response
+        if len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+        return response
+
+    def unit_response(self, vehicle_model, road_profile, t_span, t_eval):
+        """
+        Return the response to a road profile scaled to unit amplitude.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road_profile (RoadProfile): Single road profile with an amplitude.
+            t_span (tuple): The time span for the simulation.
+            t_eval (np.ndarray): The time points at which to evaluate the solution.
+
+        Returns:
+            np.ndarray: State trajectories for zero initial conditions.
+
+        Raises:
+            ValueError: If the road profile is combined or has no amplitude.
+        """
+        if len(road_profile.components()) != 1 or "amplitude" not in (
+            road_profile.params
+        ):
+            raise ValueError(
+                "Unit responses need a single road profile with an amplitude, "
+                f"got a {road_profile.profile_type} profile"
+            )
+        unit_profile = RoadProfile(
+            road_profile.profile_type, **{**road_profile.params, "amplitude": 1.0}
+        )
+        key = (
+            self._model_key(vehicle_model),
+            self._grid_key(t_span, t_eval),
+            self._shape_key(road_profile),
+        )
+        n_states = len(vehicle_model.initial_conditions)
+        return self._cached(
+            key,
+            lambda: integrate(
+                vehicle_model,
+                unit_profile.get_profile,
+                np.zeros(n_states),
+                t_span,
+                t_eval,
+            ).y,
+        )
+
+    def free_response(self, vehicle_model, t_span, t_eval):
+        """
+        Return the response to the model's initial conditions on a flat road.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            t_span (tuple): The time span for the simulation.
+            t_eval (np.ndarray): The time points at which to evaluate the solution.
+
+        Returns:
+            np.ndarray: State trajectories, or None for zero initial conditions.
+        """
+        initial_conditions = tuple(vehicle_model.initial_conditions)
+        if not any(initial_conditions):
+            return None
+
+        key = (
+            self._model_key(vehicle_model),
+            self._grid_key(t_span, t_eval),
+            ("initial_conditions", initial_conditions),
+        )
+        return self._cached(
+            key,
+            lambda: integrate(
+                vehicle_model, lambda t: 0.0, initial_conditions, t_span, t_eval
+            ).y,
+        )
+
+    def response(self, vehicle_model, road_profile, t_span, t_eval):
+        """
+        Return the response to a (combined) road profile from cached components.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road_profile (RoadProfile): Road profile, possibly a sum of profiles.
+            t_span (tuple): The time span for the simulation.
+            t_eval (np.ndarray): The time points at which to evaluate the solution.
+
+        Returns:
+            OptimizeResult: Results with ``t`` and ``y`` like scipy's solve_ivp.
+        """
+        free = self.free_response(vehicle_model, t_span, t_eval)
+        if free is None:
+            y = np.zeros((len(vehicle_model.initial_conditions), len(t_eval)))
+        else:
+            y = free.copy()
+        for profile in road_profile.components():
+            y += profile.params["amplitude"] * self.unit_response(
+                vehicle_model, profile, t_span, t_eval
+            )
+
+        return OptimizeResult(
+            t=np.asarray(t_eval, dtype=float),
+            y=y,
+            success=True,
+            status=0,
+            message="Superposition of cached unit responses.",
+        )
+
+    def amplitude_sweep(self, vehicle_model, road_profile, t_span, t_eval, amplitudes):
+        """
+        Return the responses to a single road profile for many amplitudes at once.
+
+        Args:
+            vehicle_model (VehicleModel): Linear vehicle model.
+            road_profile (RoadProfile): Single road profile, its amplitude is ignored.
+            t_span (tuple): The time span for the simulation.
+            t_eval (np.ndarray): The time points at which to evaluate the solution.
+            amplitudes (np.ndarray): Road amplitudes [m].
+
+        Returns:
+            np.ndarray: State trajectories (n_amplitudes, n_states, n_time).
+
+        Raises:
+            ValueError: If the road profile is combined or has no amplitude.
+        """
+        unit = self.unit_response(vehicle_model, road_profile, t_span, t_eval)
+        free = self.free_response(vehicle_model, t_span, t_eval)
+        sweep = np.asarray(amplitudes, dtype=float)[:, None, None] * unit
+        return sweep if free is None else sweep + free
+
+    def clear(self):
+        """Remove all cached responses."""
+        self._responses.clear()
@@ -4,6 +4,7 @@
     HalfCarPlottingStrategy,
 )
 import numpy as np
+from dataclasses import asdict
 from plotting.strategies import (
     QuarterCarPerformanceMetricsStrategy,
     SeatAddedQuarterCarPerformanceMetricsStrategy,
@@ -67,12 +68,63 @@ def _get_metrics_strategy(self):
                 "Unsupported vehicle model for performance metrics calculation"
             )
 
+    @property
+    def is_reduced(self):
+        """True if the results hold only the states and channels of an OutputSpec."""
+        return self.analysis_data["results"].get("states") is not None
+
+    def _require_all_states(self):
+        if self.is_reduced:
+            raise ValueError(
+                "The results were recorded with an output specification and lack "
+                "the states needed for plots and model metrics"
+            )
+
     def plot_results(self):
-        """Plot the results using the selected plotting strategy."""
+        """
+        Plot the results using the selected plotting strategy.
+
+        Raises:
+            ValueError: If the results do not hold all states.
+        """
+        self._require_all_states()
         self.plotting_strategy.plot(self.analysis_data)
 
     def calculate_performance_metrics(self):
-        """Calculate performance metrics for the simulation results."""
+        """
+        Calculate performance metrics for the simulation results.
+
+        Raises:
+            ValueError: If the results do not hold all states.
+        """
+        self._require_all_states()
         self.performance_metric_strategy.calculate_performance_metrics(
             self.analysis_data
         )
+
+    def compute_performance_metrics(self):
+        """
+        Calculate performance metrics for the simulation results without printing.
+
+        Results recorded with an output specification give the RMS and peak of
+        every recorded state (``rms_state_<index>``) and derived channel
+        (``rms_<name>``, ``peak_<name>``) instead of the model metrics.
+
+        Returns:
+            dict: Value of every performance metric by name.
+        """
+        if self.is_reduced:
+            results = self.analysis_data["results"]
+            channels = {
+                f"state_{state}": values
+                for state, values in zip(results["states"], results["y"])
+            }
+            channels.update(results.get("outputs", {}))
+            metrics = {}
+            for name, values in channels.items():
+                values = np.asarray(values, dtype=float)
+                metrics[f"rms_{name}"] = float(np.sqrt(np.mean(values**2)))
+                metrics[f"peak_{name}"] = float(np.max(np.abs(values)))
+            return metrics
+        metrics = self.performance_metric_strategy.compute_metrics(self.analysis_data)
+        return {name: float(value) for name, value in asdict(metrics).items()}
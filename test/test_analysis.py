@@ -0,0 +1,560 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from scipy import signal, stats
+from scipy.integrate import trapezoid
+from scipy.linalg import solve_continuous_are, solve_continuous_lyapunov
+from models import *
+from road import *
+from analysis import *
+from simulation import ConvolutionEngine
+
+
+def _models():
+    return [
+        QuarterCarModel(QuarterCarParams(), QuarterCarInitialConditions()),
+        SeatAddedQuarterCarModel(),
+        HalfCarModel(),
+    ]
+
+
+class TestStateSpace(unittest.TestCase):
+    def test_state_space_matches_equations_of_motion(self):
+        rng = np.random.default_rng(0)
+
+        def road(t):
+            return 0.3 * t + 0.1
+
+        for model in _models():
+            A, B = model.state_space()
+            delays = model.input_delays()
+            for _ in range(3):
+                y = rng.normal(size=A.shape[0])
+                r = np.array([road(2.0 - delay) for delay in delays])
+                np.testing.assert_allclose(
+                    A @ y + B @ r,
+                    model.equations_of_motion(y, 2.0, road),
+                    atol=1e-9,
+                )
+
+
+class TestFrequencyResponse(unittest.TestCase):
+    def test_static_transmissibility(self):
+        for model in _models():
+            response = frequency_response(model, [1e-6], ["body_disp"])
+            self.assertAlmostEqual(response.magnitude("body_disp")[0], 1.0, places=6)
+
+    def test_matches_scipy_freqresp(self):
+        model = SeatAddedQuarterCarModel()
+        frequencies = np.logspace(-1, 2, 200)
+        response = frequency_response(model, frequencies)
+
+        A, B = model.state_space()
+        C, D = model.output_channels()["seat_acc"]
+        _, expected = signal.freqresp(
+            (A, B, C[None, :], D[None, :]), w=2 * np.pi * frequencies
+        )
+        np.testing.assert_allclose(response.responses["seat_acc"], expected)
+
+    def test_half_car_wheelbase_delay(self):
+        model = HalfCarModel()
+        delay = model.input_delays()[1]
+        # the rear tire sees the front input again after one wheelbase delay, so
+        # symmetric vehicles do not pitch when the delay is a whole period
+        response = frequency_response(model, [1 / delay], ["pitch", "body_disp"])
+        self.assertLess(response.magnitude("pitch")[0], 1e-12)
+        self.assertGreater(response.magnitude("body_disp")[0], 1e-3)
+
+    def test_unsupported_channel(self):
+        with self.assertRaises(ValueError):
+            frequency_response(HalfCarModel(), [1.0], ["seat_acc"])
+
+
+class TestCovarianceAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.road = ISO8608Road(road_class="C", velocity=12)
+
+    def _spectral_rms(self, model, channel):
+        frequencies = np.logspace(-4, 3, 200000)
+        response = frequency_response(model, frequencies, [channel])
+        psd = response.magnitude(channel) ** 2 * self.road.psd(frequencies)
+        return np.sqrt(trapezoid(psd, frequencies))
+
+    def test_matches_spectral_integration(self):
+        for model, channel in [
+            (_models()[0], "body_acc"),
+            (_models()[1], "seat_acc"),
+            (_models()[1], "suspension_travel"),
+            (_models()[2], "body_acc"),
+            (_models()[2], "pitch"),
+        ]:
+            result = covariance_analysis(model, self.road, [channel])
+            self.assertAlmostEqual(
+                result.rms[channel][0] / self._spectral_rms(model, channel),
+                1.0,
+                places=4,
+            )
+
+    def test_parameter_sweep(self):
+        dampings = [500, 1000, 2000, 4000]
+        models = [
+            QuarterCarModel(QuarterCarParams(cs=cs), QuarterCarInitialConditions())
+            for cs in dampings
+        ]
+        result = covariance_analysis(models, self.road, ["suspension_travel"])
+        self.assertEqual(result.rms["suspension_travel"].shape, (4,))
+        # more damping always reduces the suspension travel on a random road
+        self.assertTrue(np.all(np.diff(result.rms["suspension_travel"]) < 0))
+
+        single = covariance_analysis(models[2], self.road, ["suspension_travel"])
+        self.assertAlmostEqual(
+            single.rms["suspension_travel"][0], result.rms["suspension_travel"][2]
+        )
+
+    def test_solve_lyapunov_batch(self):
+        A, _ = HalfCarModel().state_space()
+        Q = np.diag(np.arange(1.0, 9.0))
+        P = solve_lyapunov_batch(A[None], Q[None])[0]
+        np.testing.assert_allclose(P, solve_continuous_lyapunov(A, -Q), atol=1e-12)
+
+    def test_generated_road_variance(self):
+        alpha, q = self.road.shaping_filter()
+        road = self.road.generate(np.arange(0, 5000, 0.01), seed=1)
+        self.assertAlmostEqual(road.std() / (q / np.sqrt(2 * alpha)), 1.0, places=1)
+
+
+class TestSuspensionOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.road = ISO8608Road(road_class="C", velocity=20)
+
+    def test_finds_grid_optimum(self):
+        objective = ComfortObjective(weights={"body_acc": 1.0})
+        optimizer = SuspensionOptimizer(
+            QuarterCarModel,
+            QuarterCarParams(),
+            {"cs": (200, 5000)},
+            self.road,
+            objective,
+            seed=0,
+        )
+        result = optimizer.optimize()
+
+        grid = np.linspace(200, 5000, 2001)
+        models = build_models(
+            QuarterCarModel, QuarterCarParams(), ["cs"], grid[:, None]
+        )
+        rms = covariance_analysis(models, self.road, ["body_acc"]).rms["body_acc"]
+        self.assertLessEqual(result.objective, rms.min() + 1e-9)
+        self.assertAlmostEqual(result.params["cs"], grid[np.argmin(rms)], delta=5)
+        self.assertEqual(result.evaluations, len(optimizer.history))
+
+    def test_limits_and_early_termination(self):
+        objective = ComfortObjective(
+            weights={"seat_acc": 1.0}, limits={"suspension_travel": 0.01}
+        )
+        optimizer = SuspensionOptimizer(
+            SeatAddedQuarterCarModel,
+            SeatAddedQuarterCarParams(),
+            {"cs": (300, 4000), "c_seat": (100, 2000)},
+            self.road,
+            objective,
+            seed=0,
+        )
+        result = optimizer.optimize(callback=lambda generation, *_: generation == 3)
+        self.assertEqual(result.generations, 3)
+        self.assertEqual(result.message, "Stopped by callback.")
+        self.assertTrue(result.feasible)
+        self.assertLessEqual(result.rms["suspension_travel"], 0.01)
+
+    def test_deterministic_road_in_worker_processes(self):
+        road_profile = RoadProfile(
+            profile_type="step", amplitude=0.05, activation_time=1
+        )
+        models = build_models(
+            QuarterCarModel, QuarterCarParams(), ["cs"], np.array([[1000], [2000]])
+        )
+        t_eval = np.linspace(0, 3, 3000)
+        serial = evaluate_rms(models, road_profile, ["body_acc"], t_eval)
+        parallel = evaluate_rms(models, road_profile, ["body_acc"], t_eval, workers=2)
+        np.testing.assert_allclose(parallel["body_acc"], serial["body_acc"])
+
+        # one worker pool serves every generation of the optimizer
+        with SuspensionOptimizer(
+            QuarterCarModel,
+            QuarterCarParams(),
+            {"cs": (1000, 2000)},
+            road_profile,
+            ComfortObjective(weights={"body_acc": 1.0}),
+            t_eval=t_eval[::10],
+            workers=2,
+            population_size=4,
+            seed=0,
+        ) as optimizer:
+            optimizer.optimize(max_generations=2)
+            pool = optimizer._executor
+            self.assertIsNotNone(pool)
+            objective, _ = optimizer.evaluate(np.array([[1000.0], [2000.0]]))
+            self.assertIs(optimizer._executor, pool)
+        self.assertIsNone(optimizer._executor)
+        np.testing.assert_allclose(objective, serial["body_acc"], rtol=1e-3)
+
+
+class TestDesignOfExperiments(unittest.TestCase):
+    def setUp(self):
+        self.bounds = {"cs": (500, 4000), "c_seat": (100, 2000)}
+
+    def test_samples_within_bounds(self):
+        for method in ["latin_hypercube", "sobol"]:
+            samples = sample_parameter_space(self.bounds, 64, method, seed=0)
+            self.assertEqual(samples.shape, (64, 2))
+            self.assertTrue(np.all(samples >= [500, 100]))
+            self.assertTrue(np.all(samples <= [4000, 2000]))
+
+    def test_surrogate_reproduces_quadratic(self):
+        samples = sample_parameter_space(self.bounds, 50, seed=0)
+        metrics = {"metric": 1 + samples[:, 0] * samples[:, 1] * 1e-6}
+        surrogate = PolynomialSurrogate("QuarterCarModel", self.bounds, degree=2)
+        surrogate.fit(samples, metrics)
+
+        prediction, error = surrogate.predict({"cs": 1000, "c_seat": 1500})
+        self.assertAlmostEqual(prediction["metric"][0], 2.5, places=6)
+        self.assertLess(error["metric"][0], 1e-6)
+
+    def test_design_and_persisted_surrogate(self):
+        design = run_design(
+            SeatAddedQuarterCarModel,
+            SeatAddedQuarterCarParams(),
+            self.bounds,
+            ISO8608Road(),
+            ["seat_acc"],
+            64,
+            seed=0,
+        )
+        surrogate = design.fit_surrogate()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "surrogate.json")
+            surrogate.save(filename)
+            loaded = PolynomialSurrogate.load(filename)
+
+        params = {"cs": 2000, "c_seat": 600}
+        expected = covariance_analysis(
+            SeatAddedQuarterCarModel(SeatAddedQuarterCarParams(**params)),
+            ISO8608Road(),
+            ["seat_acc"],
+        ).rms["seat_acc"][0]
+        prediction, error = loaded.predict(params)
+        self.assertAlmostEqual(prediction["seat_acc"][0], expected, delta=0.05)
+        self.assertAlmostEqual(
+            surrogate.predict(params)[0]["seat_acc"][0], prediction["seat_acc"][0]
+        )
+
+
+class TestSensitivity(unittest.TestCase):
+    def setUp(self):
+        self.road = ISO8608Road()
+
+    def test_local_gradients(self):
+        tables = local_sensitivity(
+            QuarterCarModel, QuarterCarParams(), self.road, ["body_acc"]
+        )
+        rows = {row["parameter"]: row for row in tables["body_acc"].rows}
+        self.assertEqual(set(rows), {"ms", "mu", "ks", "cs", "ku"})
+
+        def rms(ks):
+            model = QuarterCarModel(QuarterCarParams(ks=ks))
+            return covariance_analysis(model, self.road, ["body_acc"]).rms["body_acc"]
+
+        expected = (rms(15015.0) - rms(14985.0))[0] / 30.0
+        self.assertAlmostEqual(rows["ks"]["gradient"] / expected, 1.0, places=4)
+
+        ranking = [abs(row["normalized"]) for row in tables["body_acc"].rows]
+        self.assertEqual(ranking, sorted(ranking, reverse=True))
+        self.assertIn("body_acc", tables["body_acc"].format())
+
+    def test_sobol_indices(self):
+        # the pitch inertia of a symmetric half car does not affect bounce
+        tables = sobol_indices(
+            HalfCarModel,
+            HalfCarModelParams(),
+            {"ms": (400, 600), "ks_f": (8000, 12000), "I": (800, 1200)},
+            self.road,
+            ["body_acc"],
+            n_samples=256,
+            seed=0,
+        )
+        rows = {row["parameter"]: row for row in tables["body_acc"].rows}
+        self.assertEqual(tables["body_acc"].rows[-1]["parameter"], "I")
+        self.assertLess(abs(rows["I"]["total"]), 1e-6)
+        self.assertGreater(rows["ms"]["total"], 0.1)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.analysis = MonteCarloAnalysis(
+            QuarterCarModel,
+            QuarterCarParams(),
+            {"ms": stats.uniform(225, 50), "ks": stats.norm(15000, 1000)},
+            ISO8608Road(),
+            ["body_acc", "suspension_travel"],
+            road_distributions={"velocity": stats.uniform(15, 10)},
+            chunk_size=64,
+            seed=3,
+        )
+
+    def test_statistics(self):
+        result = self.analysis.run(200, percentiles=(5, 50, 95), bins=10)
+        values = result.values["body_acc"]
+        self.assertEqual(len(values), 200)
+        self.assertAlmostEqual(result.mean["body_acc"], np.mean(values))
+        self.assertAlmostEqual(result.std["body_acc"], np.std(values, ddof=1))
+        self.assertAlmostEqual(
+            result.percentiles["body_acc"][95], np.percentile(values, 95)
+        )
+        self.assertEqual(np.sum(result.histograms["body_acc"][0]), 200)
+
+        # first sample evaluated directly
+        rng = np.random.default_rng(np.random.SeedSequence(3).spawn(4)[0])
+        ms = stats.uniform(225, 50).rvs(size=64, random_state=rng)[0]
+        ks = stats.norm(15000, 1000).rvs(size=64, random_state=rng)[0]
+        velocity = stats.uniform(15, 10).rvs(size=64, random_state=rng)[0]
+        model = QuarterCarModel(QuarterCarParams(ms=ms, ks=ks))
+        road = ISO8608Road(velocity=velocity)
+        rms = covariance_analysis(model, road, ["body_acc"]).rms["body_acc"][0]
+        self.assertAlmostEqual(values[0] / rms, 1.0)
+
+    def test_reproducible_across_workers(self):
+        serial = self.analysis.run(150)
+        parallel = self.analysis.run(150, workers=2)
+        np.testing.assert_array_equal(
+            serial.values["suspension_travel"], parallel.values["suspension_travel"]
+        )
+
+
+class TestLQRDesign(unittest.TestCase):
+    def setUp(self):
+        self.model = QuarterCarModel()
+        self.road = ISO8608Road()
+
+    def test_closed_loop_covariance(self):
+        design = lqr_design(
+            self.model,
+            self.road,
+            {"body_acc": 1.0, "suspension_travel": 0.5},
+            channels=["body_acc", "suspension_travel", "tire_force"],
+        )
+        K = design.gains[0]
+
+        # closed loop with the road shaping filter, assembled by hand
+        p = QuarterCarParams()
+        A, B = self.model.state_space()
+        Bu = np.array([0, 1 / p.ms, 0, -1 / p.mu])[:, None]
+        alpha, q = self.road.shaping_filter()
+        A_cl = np.zeros((5, 5))
+        A_cl[:4, :4] = A - Bu @ K
+        A_cl[:4, 4] = B[:, 0]
+        A_cl[4, 4] = -alpha
+        G = np.array([0, 0, 0, 0, q])
+        P = solve_continuous_lyapunov(A_cl, -np.outer(G, G))
+
+        body_acc = np.append(A_cl[1, :4], B[1, 0])
+        self.assertAlmostEqual(
+            design.rms["body_acc"][0] / np.sqrt(body_acc @ P @ body_acc), 1.0
+        )
+        force = np.append(-K[0], 0.0)
+        self.assertAlmostEqual(design.force_rms[0, 0] / np.sqrt(force @ P @ force), 1.0)
+        self.assertLess(design.rms["body_acc"][0], design.passive_rms["body_acc"])
+
+    def test_batched_riccati_solution(self):
+        model = HalfCarModel()
+        input_matrix = np.zeros((8, 2))
+        input_matrix[1, :] = 1 / 1200.0
+        input_matrix[3, :] = [0.2, -0.25]
+        input_matrix[5, 0] = -1 / 50.0
+        input_matrix[7, 1] = -1 / 50.0
+        A, _ = model.state_space()
+        rng = np.random.default_rng(0)
+        C = rng.normal(size=(3, 8))
+        Q = np.array([C.T @ np.diag(rng.uniform(0.1, 10, 3)) @ C for _ in range(5)])
+        N = rng.normal(size=(5, 8, 2)) * 1e-3
+        R = np.array([np.eye(2) * r for r in (1e-2, 1e-1, 1.0, 10.0, 100.0)])
+        P = solve_riccati_batch(A, input_matrix, Q, R, N)
+        for i in range(5):
+            expected = solve_continuous_are(A, input_matrix, Q[i], R[i], s=N[i])
+            np.testing.assert_allclose(P[i], expected, rtol=1e-7, atol=1e-9)
+
+    def test_weight_grid_pareto_front(self):
+        weights = weight_grid(
+            body_acc=[1.0], suspension_travel=np.logspace(-2, 2, 5), tire_force=[0.1]
+        )
+        self.assertEqual(len(weights), 5)
+        design = lqr_design(self.model, self.road, weights)
+        self.assertEqual(design.gains.shape, (5, 1, 4))
+
+        # more travel weight trades comfort for travel
+        travel, comfort = design.rms["suspension_travel"], design.rms["body_acc"]
+        self.assertLess(travel[-1], travel[0])
+        self.assertGreater(comfort[-1], comfort[0])
+
+        front = design.pareto_front(["body_acc", "suspension_travel"])
+        for i in range(5):
+            dominated = any(
+                comfort[j] <= comfort[i]
+                and travel[j] <= travel[i]
+                and (comfort[j] < comfort[i] or travel[j] < travel[i])
+                for j in range(5)
+            )
+            self.assertEqual(i in front, not dominated)
+
+        expensive = lqr_design(self.model, self.road, weights[0], control_weight=1e6)
+        self.assertAlmostEqual(
+            expensive.rms["body_acc"][0] / expensive.passive_rms["body_acc"], 1.0
+        )
+
+    def test_actuated_output_channels(self):
+        for model in _models():
+            A, B = model.state_space()
+            n_inputs = B.shape[1]
+            input_matrix = np.arange(2 * len(A), dtype=float).reshape(-1, 2)
+            channels = actuated_output_channels(model, input_matrix)
+            for name, (C, D) in model.output_channels().items():
+                C_act, D_act, E = channels[name]
+                np.testing.assert_array_equal(C_act, C)
+                np.testing.assert_array_equal(D_act, D)
+                self.assertEqual(E.shape, (2,))
+                # only channels derived from the state derivative see the forces
+                derivative = [i for i in range(len(A)) if np.array_equal(A[i], C)]
+                expected = input_matrix[derivative[0]] if derivative else np.zeros(2)
+                np.testing.assert_array_equal(E, expected)
+            self.assertEqual(len(D_act), n_inputs)
+        with self.assertRaises(ValueError):
+            self.model.output_channels(np.zeros((3, 1)))
+
+
+class TestIdentification(unittest.TestCase):
+    def setUp(self):
+        self.true_params = QuarterCarParams(ms=270, ks=16500, cs=1150)
+        self.road = RoadProfile("step", amplitude=0.05, activation_time=1.0)
+        self.t = np.arange(20000) * 1e-3
+        engine = ConvolutionEngine(1e-3, ["body_acc", "wheel_acc"], fft_size=2**16)
+        self.response = engine.response(
+            QuarterCarModel(self.true_params), self.road.get_profile(self.t)
+        )
+
+    def test_fit_recovers_parameters(self):
+        rng = np.random.default_rng(0)
+        channels = {
+            channel: values + 0.02 * np.std(values) * rng.standard_normal(len(values))
+            for channel, values in self.response.items()
+        }
+        measurement = Measurement(self.t, channels, self.road.get_profile(self.t))
+        result = identify_parameters(
+            QuarterCarModel,
+            QuarterCarParams(),
+            measurement,
+            ["ms", "ks", "cs"],
+            bounds={"ms": (100, 500)},
+        )
+        for name in ["ms", "ks", "cs"]:
+            lower, upper = result.confidence_intervals[name]
+            self.assertLess(lower, getattr(self.true_params, name))
+            self.assertGreater(upper, getattr(self.true_params, name))
+            self.assertAlmostEqual(
+                result.values[name] / getattr(self.true_params, name), 1.0, places=2
+            )
+        self.assertIsInstance(result.params, QuarterCarParams)
+        self.assertAlmostEqual(
+            result.residual_rms["body_acc"]
+            / (0.02 * np.std(self.response["body_acc"])),
+            1.0,
+            places=1,
+        )
+
+    def test_load_measurement(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "log.csv")
+            data = np.column_stack([self.t, self.response["body_acc"]])
+            np.savetxt(filename, data, delimiter=",", header="t,body_acc", comments="")
+            measurement = Measurement.from_file(filename, road=self.road)
+        self.assertEqual(list(measurement.channels), ["body_acc"])
+        self.assertAlmostEqual(measurement.dt, 1e-3)
+        np.testing.assert_allclose(measurement.road, self.road.get_profile(self.t))
+        with self.assertRaises(ValueError):
+            Measurement(self.t**2, {}, 0.0)
+
+
+class TestKalmanEstimator(unittest.TestCase):
+    def setUp(self):
+        self.dt = 1e-3
+        t = np.arange(20000) * self.dt
+        self.road = ISO8608Road()
+        self.model = QuarterCarModel()
+        self.road_input = self.road.generate(t, seed=1)
+        engine = ConvolutionEngine(self.dt, fft_size=2**16)
+        self.response = engine.response(self.model, self.road_input)
+        self.sensors = ["body_acc", "wheel_acc"]
+        self.noise = [0.05, 0.5]
+        rng = np.random.default_rng(2)
+        self.y = np.array(
+            [
+                self.response[sensor] + noise * rng.standard_normal(len(t))
+                for sensor, noise in zip(self.sensors, self.noise)
+            ]
+        )
+
+    def estimator(self, models=None):
+        return KalmanEstimator(
+            models or self.model,
+            self.road,
+            self.sensors,
+            self.noise,
+            self.dt,
+            outputs=["suspension_travel", "road"],
+        )
+
+    def test_streaming_filter(self):
+        estimator = self.estimator()
+        whole = estimator.filter(self.y)["suspension_travel"][0]
+        estimator.reset()
+        chunks = [self.y[:, i : i + 3000] for i in range(0, self.y.shape[1], 3000)]
+        streamed = np.concatenate(
+            [chunk["suspension_travel"][0] for chunk in estimator.iter_filter(chunks)]
+        )
+        np.testing.assert_allclose(streamed, whole)
+
+        travel = self.response["suspension_travel"]
+        error = np.std(whole[2000:] - travel[2000:]) / np.std(travel)
+        self.assertLess(error, 0.05)
+
+        estimator.reset()
+        smoothed = np.concatenate(
+            [
+                chunk["suspension_travel"][0]
+                for chunk in estimator.iter_smooth(chunks, lag=300)
+            ]
+        )
+        self.assertEqual(len(smoothed), len(travel))
+        self.assertLess(np.std(smoothed[2000:] - travel[2000:]) / np.std(travel), error)
+
+    def test_batched_vehicles_and_gain_cache(self):
+        KalmanEstimator.clear_cache()
+        single = self.estimator()
+        self.assertEqual(len(KalmanEstimator._gain_cache), 1)
+        other = QuarterCarModel(QuarterCarParams(ms=300))
+        batch = self.estimator([self.model, other])
+        self.assertEqual(len(KalmanEstimator._gain_cache), 2)
+
+        y = self.y[:, :2000]
+        expected = single.filter(y)["suspension_travel"][0]
+        estimates = batch.filter(np.stack([y, y]))["suspension_travel"]
+        np.testing.assert_allclose(estimates[0], expected)
+        self.assertFalse(np.allclose(estimates[1], expected))
+
+        with mock.patch.object(KalmanEstimator, "max_cached_filters", 1):
+            self.estimator(QuarterCarModel(QuarterCarParams(ms=350)))
+            self.assertEqual(len(KalmanEstimator._gain_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
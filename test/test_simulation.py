@@ -1,9 +1,25 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+import urllib.error
+import urllib.request
 import numpy as np
+from scipy.integrate import solve_ivp
 from models import *
 from simulation import *
+from simulation.session import main as session_main
 from road import *
 from plotting import *
+from service import SimulationServer, SimulationService, parse_job, run_jobs
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 
 
 class TestQuarterCar(unittest.TestCase):
@@ -404,5 +420,1438 @@ def test_seat_added_quarter_car_chirp_road(self):
         )
 
 
+class TestConvolutionEngine(unittest.TestCase):
+    def setUp(self):
+        self.dt = 1e-3
+        self.t = np.arange(0, 5, self.dt)
+        self.road_profile = RoadProfile(
+            profile_type="sinusoidal", amplitude=0.01, frequency=2
+        )
+        self.engine = ConvolutionEngine(self.dt, fft_size=2**15)
+
+    def test_matches_time_integration(self):
+        quarter_car = QuarterCarModel(
+            QuarterCarParams(ms=270, mu=60, ks=27000, ku=200000, cs=2000),
+            QuarterCarInitialConditions(z_s=0.01),
+        )
+        simulation_control = SimulationControl(
+            quarter_car, self.road_profile, (0, self.t[-1]), self.t
+        )
+        simulation_control.run_simulation()
+
+        response = self.engine.response(
+            quarter_car, self.road_profile.get_profile(self.t)
+        )
+        for channel, row in [("body_disp", 0), ("wheel_disp", 2)]:
+            expected = simulation_control.results.y[row]
+            np.testing.assert_allclose(
+                response[channel], expected, atol=1e-4 * np.max(np.abs(expected))
+            )
+
+    def test_streamed_and_transformed_roads(self):
+        road = self.road_profile.get_profile(self.t)
+        models = [
+            SeatAddedQuarterCarModel(SeatAddedQuarterCarParams(c_seat=c_seat))
+            for c_seat in (300, 500)
+        ]
+        engine = ConvolutionEngine(self.dt, ["seat_acc"], fft_size=2**15)
+        expected = engine.response(models[1], road)["seat_acc"]
+
+        streamed = engine.response(models[1], iter(np.array_split(road, 7)))
+        transformed = engine.response_batch(models, engine.transform_road(road))
+        np.testing.assert_allclose(streamed["seat_acc"], expected, atol=1e-12)
+        np.testing.assert_allclose(transformed[1]["seat_acc"], expected, atol=1e-12)
+        self.assertIs(
+            engine.impulse_response(models[0]), engine.impulse_response(models[0])
+        )
+
+    def test_impulse_response_too_long(self):
+        engine = ConvolutionEngine(self.dt, fft_size=2**10)
+        with self.assertRaises(ValueError):
+            engine.impulse_response(HalfCarModel())
+        with self.assertRaises(ValueError):
+            self.engine.impulse_response(QuarterCarModel(QuarterCarParams(cs=0.0)))
+
+    def test_road_starting_above_zero(self):
+        # both wheels of the half car stand on the raised road from t=0
+        t = np.arange(0, 6, self.dt)
+        road = RoadProfile("step", amplitude=0.02, activation_time=0.0)
+        model = HalfCarModel()
+        simulation_control = SimulationControl(model, road, (0, t[-1]), t)
+        simulation_control.run_simulation()
+
+        engine = ConvolutionEngine(self.dt, ["body_disp", "pitch"], fft_size=2**18)
+        samples = road.get_profile(t)
+        expected = simulation_control.results.y
+        for response in (
+            engine.response(model, samples),
+            engine.response(model, iter(np.array_split(samples, 5))),
+            engine.response(model, engine.transform_road(samples)),
+        ):
+            np.testing.assert_allclose(response["body_disp"], expected[0], atol=1e-8)
+            np.testing.assert_allclose(response["pitch"], expected[2], atol=1e-8)
+
+
+class TestSuperpositionCache(unittest.TestCase):
+    def setUp(self):
+        self.quarter_car = QuarterCarModel(
+            QuarterCarParams(ms=270, mu=60, ks=27000, ku=200000, cs=2000),
+            QuarterCarInitialConditions(z_s=0.01),
+        )
+        self.t_eval = np.linspace(0, 3, 3000)
+        self.step = RoadProfile(profile_type="step", amplitude=0.05, activation_time=1)
+        self.sinusoidal = RoadProfile(
+            profile_type="sinusoidal", amplitude=0.02, frequency=1.5
+        )
+        self.cache = SuperpositionCache()
+
+    def _run(self, road_profile, cache=None):
+        simulation_control = SimulationControl(
+            self.quarter_car, road_profile, (0, 3), self.t_eval, cache=cache
+        )
+        simulation_control.run_simulation()
+        return simulation_control.results
+
+    def test_matches_direct_integration(self):
+        for road_profile in [self.step, self.step + self.sinusoidal]:
+            expected = self._run(road_profile)
+            cached = self._run(road_profile, self.cache)
+            np.testing.assert_allclose(cached.y, expected.y, atol=1e-6)
+            np.testing.assert_allclose(cached.road_profile, expected.road_profile)
+
+    def test_amplitude_changes_reuse_components(self):
+        self._run(self.step, self.cache)
+        misses = self.cache.misses
+
+        smaller = RoadProfile(profile_type="step", amplitude=0.01, activation_time=1)
+        results = self._run(smaller, self.cache)
+        self.assertEqual(self.cache.misses, misses)
+        np.testing.assert_allclose(results.y, self._run(smaller).y, atol=1e-6)
+
+        sweep = self.cache.amplitude_sweep(
+            self.quarter_car, self.step, (0, 3), self.t_eval, [0.01, 0.05]
+        )
+        self.assertEqual(sweep.shape, (2, 4, 3000))
+        np.testing.assert_allclose(sweep[0], results.y)
+        self.assertEqual(self.cache.misses, misses)
+
+        combined = CombinedRoadProfile([self.step, smaller])
+        with self.assertRaises(ValueError):
+            self.cache.amplitude_sweep(
+                self.quarter_car, combined, (0, 3), self.t_eval, [0.01, 0.05]
+            )
+
+
+class TestPeriodicSteadyState(unittest.TestCase):
+    def setUp(self):
+        self.half_car = HalfCarModel(
+            initial_conditions=HalfCarModelInitialConditions(theta=0.01)
+        )
+        self.road_profile = RoadProfile(
+            profile_type="sinusoidal", amplitude=0.05, frequency=1.3
+        )
+        self.t_eval = np.linspace(0, 3, 3000)
+
+    def test_transient_matches_time_integration(self):
+        integrated = SimulationControl(
+            self.half_car, self.road_profile, (0, 3), self.t_eval
+        )
+        integrated.run_simulation()
+        direct = SimulationControl(
+            self.half_car, self.road_profile, (0, 3), self.t_eval
+        )
+        direct.run_steady_state(include_transient=True)
+        np.testing.assert_allclose(direct.results.y, integrated.results.y, atol=1e-7)
+
+    def test_shooting_matches_analytic_solution(self):
+        analytic = periodic_steady_state(self.half_car, self.road_profile, self.t_eval)
+        shooting = periodic_steady_state(
+            self.half_car, self.road_profile, self.t_eval, method="shooting"
+        )
+        np.testing.assert_allclose(shooting.y, analytic.y, atol=1e-7)
+
+    def test_steady_state_amplitudes(self):
+        amplitudes = steady_state_amplitudes(
+            [HalfCarModel(HalfCarModelParams(longitudial_velocity=v)) for v in (5, 12)],
+            [1.3],
+            0.05,
+            ["body_disp"],
+        )
+        self.assertEqual(amplitudes["body_disp"].shape, (2, 1))
+        steady = periodic_steady_state(self.half_car, self.road_profile, self.t_eval)
+        self.assertAlmostEqual(
+            amplitudes["body_disp"][1, 0], np.max(np.abs(steady.y[0])), places=5
+        )
+
+    def test_requires_sinusoidal_road(self):
+        step = RoadProfile(profile_type="step", amplitude=0.05, activation_time=1)
+        with self.assertRaises(ValueError):
+            periodic_steady_state(self.half_car, step, self.t_eval)
+
+
+class TestAssembledModel(unittest.TestCase):
+    def half_car_components(self, p):
+        return [
+            Body("body", p.ms, pitch_inertia=p.I),
+            Body("wheel_front", p.mu_f),
+            Body("wheel_rear", p.mu_r),
+            Spring("front", "body", "wheel_front", p.ks_f, point_a=(p.a, 0)),
+            Damper("front_damper", "body", "wheel_front", p.cs_f, point_a=(p.a, 0)),
+            Spring("rear", "body", "wheel_rear", p.ks_r, point_a=(-p.b, 0)),
+            Damper("rear_damper", "body", "wheel_rear", p.cs_r, point_a=(-p.b, 0)),
+            RoadContact("tire_front", "wheel_front", p.ku_f),
+            RoadContact("tire_rear", "wheel_rear", p.ku_r, offset=p.a + p.b),
+        ]
+
+    def test_matches_half_car(self):
+        params = HalfCarModelParams()
+        half_car = HalfCarModel(params)
+        model = AssembledModel(
+            self.half_car_components(params), velocity=params.longitudial_velocity
+        )
+        for expected, actual in zip(half_car.state_space(), model.state_space()):
+            np.testing.assert_allclose(actual, expected)
+        np.testing.assert_allclose(model.input_delays(), half_car.input_delays())
+
+        road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        t_eval = np.linspace(0, 3, 301)
+        results = []
+        for vehicle_model in (half_car, model):
+            simulation = SimulationControl(vehicle_model, road, (0, 3), t_eval)
+            simulation.run_simulation()
+            results.append(simulation.results.y)
+        np.testing.assert_allclose(results[1], results[0], atol=1e-10)
+
+    def test_sparse_chain(self):
+        n = 200
+        components = [Body(f"m{i}", 10.0) for i in range(n)]
+        components += [Spring(f"k{i}", f"m{i}", f"m{i + 1}", 1e4) for i in range(n - 1)]
+        components += [RoadContact("tire", "m0", 1e5)]
+        model = AssembledModel(components)
+        self.assertTrue(model.is_sparse)
+        M, C, K, K_road = model.sparse_matrices()
+        self.assertEqual(K.nnz, 3 * n - 2)
+
+        y = np.zeros(2 * n)
+        dydt = model.equations_of_motion(y, 0.0, lambda t: 0.01)
+        self.assertAlmostEqual(dydt[1], 1e5 * 0.01 / 10.0)
+        self.assertEqual(np.count_nonzero(dydt), 1)
+
+        A, B = model.sparse_state_space()
+        self.assertEqual(A.nnz, n + K.nnz)
+        channels = model.output_channels()
+        np.testing.assert_allclose(
+            channels["m1_acc"][0][[0, 2, 4]], np.array([1.0, -2.0, 1.0]) * 1e3
+        )
+
+    def test_geometry_in_params(self):
+        def model(x):
+            return AssembledModel(
+                [
+                    Body("body", 300.0, pitch_inertia=400.0),
+                    Body("wheel", 40.0),
+                    Spring("spring", "body", "wheel", 20000.0, point_a=(x, 0)),
+                    Damper("damper", "body", "wheel", 1500.0, point_a=(x, 0)),
+                    Spring("rear", "body", None, 20000.0, point_a=(-1.0, 0)),
+                    Damper("rear_damper", "body", None, 1500.0, point_a=(-1.0, 0)),
+                    RoadContact("tire", "wheel", 200000.0),
+                ]
+            )
+
+        models = [model(1.0), model(0.3)]
+        self.assertNotEqual(models[0].params, models[1].params)
+        engine = ConvolutionEngine(1e-3, ["body_acc"], fft_size=2**16)
+        road = 0.01 * np.sin(2 * np.pi * 1.5 * np.arange(0, 2, 1e-3))
+        shared = [engine.response(m, road)["body_acc"] for m in models]
+        for m, response in zip(models, shared):
+            fresh = ConvolutionEngine(1e-3, ["body_acc"], fft_size=2**16)
+            np.testing.assert_allclose(
+                response, fresh.response(m, road)["body_acc"], atol=1e-12
+            )
+
+    def test_invalid_components(self):
+        with self.assertRaises(ValueError):
+            AssembledModel(
+                [
+                    Body("body", 100.0),
+                    Spring("k", "body", "wheel", 1e4),
+                    RoadContact("tire", "body", 1e5),
+                ]
+            )
+        with self.assertRaises(ValueError):
+            AssembledModel([Body("body", 100.0)])
+        # springs and dampers share the travel channels
+        with self.assertRaises(ValueError):
+            AssembledModel(
+                [
+                    Body("body", 100.0),
+                    Spring("front", "body", None, 1e4),
+                    Damper("front", "body", None, 1e3),
+                    RoadContact("tire", "body", 1e5),
+                ]
+            )
+
+
+class TestPiecewiseLinearEngine(unittest.TestCase):
+    def setUp(self):
+        self.params = QuarterCarParams()
+        self.model = QuarterCarModel(self.params)
+        self.t_eval = np.linspace(0, 1, 1001)
+        # sampled road, piecewise linear between the samples
+        self.road = 0.04 * np.sin(2 * np.pi * 9.0 * self.t_eval)
+        self.engine = PiecewiseLinearEngine(
+            [TireLiftOff(preload=2943.0), BumpStop(clearance=-0.02, stiffness=2e5)]
+        )
+
+    def test_matches_nonlinear_integration(self):
+        p = self.params
+
+        def equations(t, y):
+            z_s, z_s_dot, z_u, z_u_dot = y
+            r = np.interp(t, self.t_eval, self.road)
+            tire = max(p.ku * (r - z_u), -2943.0)
+            travel = z_s - z_u
+            stop = -2e5 * (travel + 0.02) if travel < -0.02 else 0.0
+            suspension = -p.ks * travel - p.cs * (z_s_dot - z_u_dot) + stop
+            return [z_s_dot, suspension / p.ms, z_u_dot, (tire - suspension) / p.mu]
+
+        expected = solve_ivp(
+            equations,
+            (0, 1),
+            [0, 0, 0, 0],
+            t_eval=self.t_eval,
+            method="DOP853",
+            rtol=1e-11,
+            atol=1e-13,
+            max_step=1e-4,
+        )
+        results = self.engine.simulate(self.model, self.road, self.t_eval)
+        self.assertGreater(len(results.switch_times), 0)
+        self.assertTrue(np.any(results.contact_state[0]))
+        self.assertTrue(np.any(results.contact_state[1]))
+        np.testing.assert_allclose(results.y, expected.y, atol=1e-7)
+
+    def test_recorded_channels_follow_contacts(self):
+        p = self.params
+        road = RoadProfile("sinusoidal", amplitude=0.04, frequency=9.0)
+        channels = ["tire_force", "body_acc", "wheel_acc", "suspension_travel"]
+        simulations = [
+            SimulationControl(
+                self.model, road, (0, 1), self.t_eval, engine=self.engine, output=spec
+            )
+            for spec in (None, OutputSpec(channels=channels))
+        ]
+        for simulation in simulations:
+            simulation.run_simulation()
+        full, recorded = (simulation.results for simulation in simulations)
+        self.assertTrue(np.any(full.contact_state[0]))
+
+        z_s, z_s_dot, z_u, z_u_dot = full.y
+        r = road.get_profile(self.t_eval)
+        tire = np.maximum(p.ku * (r - z_u), -2943.0)
+        travel = z_s - z_u
+        stop = np.where(full.contact_state[1], -2e5 * (travel + 0.02), 0.0)
+        suspension = -p.ks * travel - p.cs * (z_s_dot - z_u_dot) + stop
+        outputs = recorded.outputs
+        np.testing.assert_allclose(outputs["tire_force"], tire, atol=1e-6)
+        np.testing.assert_allclose(outputs["body_acc"], suspension / p.ms, atol=1e-8)
+        np.testing.assert_allclose(
+            outputs["wheel_acc"], (tire - suspension) / p.mu, atol=1e-8
+        )
+        np.testing.assert_allclose(outputs["suspension_travel"], travel, atol=1e-12)
+
+    def test_short_contacts_and_switch_budget(self):
+        # coarse steps in which contacts engage and release again
+        t_coarse = self.t_eval[::50]
+        road = self.road[::50]
+        elements = self.engine.elements
+        expected = PiecewiseLinearEngine(elements).simulate(
+            self.model, np.interp(self.t_eval, t_coarse, road), self.t_eval
+        )
+        missed = PiecewiseLinearEngine(elements).simulate(self.model, road, t_coarse)
+        detected = PiecewiseLinearEngine(elements, substeps=50).simulate(
+            self.model, road, t_coarse
+        )
+        self.assertLess(len(missed.switch_times), len(expected.switch_times))
+        np.testing.assert_allclose(
+            detected.switch_times, expected.switch_times, atol=1e-9
+        )
+        np.testing.assert_allclose(detected.y, expected.y[:, ::50], atol=1e-10)
+
+        with self.assertRaises(RuntimeError):
+            PiecewiseLinearEngine(elements, max_switches=1).simulate(
+                self.model, road, t_coarse
+            )
+
+    def test_linear_without_contact_events(self):
+        road = RoadProfile("sinusoidal", amplitude=0.005, frequency=1.5)
+        t_eval = np.linspace(0, 2, 2001)
+        simulation = SimulationControl(
+            self.model, road, (0, 2), t_eval, engine=self.engine
+        )
+        simulation.run_simulation()
+        integrated = SimulationControl(self.model, road, (0, 2), t_eval)
+        integrated.run_simulation()
+        self.assertEqual(len(simulation.results.switch_times), 0)
+        np.testing.assert_allclose(
+            simulation.results.y, integrated.results.y, atol=1e-6
+        )
+
+
+class TestControlLoop(unittest.TestCase):
+    def setUp(self):
+        self.params = QuarterCarParams(cs=300.0)
+        self.model = QuarterCarModel(self.params)
+        self.road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.2)
+        self.t_eval = np.linspace(0, 3, 15001)
+
+    def test_zero_gains_match_passive_model(self):
+        loop = ControlLoop(StateFeedbackController(np.zeros((1, 4))))
+        simulation = SimulationControl(
+            self.model, self.road, (0, 3), self.t_eval, engine=loop
+        )
+        simulation.run_simulation()
+        passive = SimulationControl(self.model, self.road, (0, 3), self.t_eval)
+        passive.run_simulation()
+        np.testing.assert_allclose(simulation.results.y, passive.results.y, atol=1e-6)
+
+    def test_active_skyhook(self):
+        p = self.params
+
+        def equations(t, y):
+            z_s, z_s_dot, z_u, z_u_dot = y
+            suspension = (
+                -p.ks * (z_s - z_u) - p.cs * (z_s_dot - z_u_dot) - 1500.0 * z_s_dot
+            )
+            tire = p.ku * (self.road.get_profile(t) - z_u)
+            return [z_s_dot, suspension / p.ms, z_u_dot, (tire - suspension) / p.mu]
+
+        expected = solve_ivp(
+            equations,
+            (0, 3),
+            [0, 0, 0, 0],
+            t_eval=self.t_eval,
+            rtol=1e-10,
+            atol=1e-12,
+            max_step=1e-3,
+        )
+        loop = ControlLoop(SkyhookController(1500.0, semi_active=False))
+        results = loop.simulate(self.model, self.road, self.t_eval)
+        # forces are held over a step of 0.2 ms, first order accurate
+        np.testing.assert_allclose(results.y, expected.y, atol=2e-4)
+        np.testing.assert_allclose(results.forces[0, :-1], -1500.0 * results.y[1, :-1])
+
+    def test_semi_active_batch(self):
+        c_sky = np.array([[500.0], [2000.0], [4000.0]])
+        models = [self.model] * 3
+        loop = ControlLoop(SkyhookController(c_sky, c_max=3000.0), latency=2)
+        results = loop.run_batch(models, self.road, self.t_eval[:2001])
+
+        travel_rate = results.y[:, 1] - results.y[:, 3]
+        self.assertTrue(np.all(results.forces[:, 0, 2:] * travel_rate[:, :-2] <= 0))
+        damping = np.abs(results.forces[:, 0, 2:]) / np.maximum(
+            np.abs(travel_rate[:, :-2]), 1e-12
+        )
+        self.assertLessEqual(np.max(damping), 3000.0 + 1e-6)
+
+        single = ControlLoop(SkyhookController(2000.0, c_max=3000.0), latency=2)
+        expected = single.simulate(self.model, self.road, self.t_eval[:2001])
+        np.testing.assert_allclose(results.y[1], expected.y)
+
+    def test_latency_in_plant_steps(self):
+        gains = np.array([[0.0, 800.0, 0.0, 0.0]])
+        loop = ControlLoop(StateFeedbackController(gains), control_period=5, latency=3)
+        results = loop.simulate(self.model, self.road, self.t_eval[:2001])
+
+        forces = results.forces[0]
+        np.testing.assert_array_equal(forces[:3], 0.0)
+        for k in range(0, 1990, 5):
+            # measured at step k, acting from step k + 3 until the next force
+            np.testing.assert_allclose(
+                forces[k + 3 : k + 8], -800.0 * results.y[1, k], rtol=1e-12
+            )
+
+    def test_batch_with_different_delays(self):
+        models = [
+            HalfCarModel(HalfCarModelParams(longitudial_velocity=velocity))
+            for velocity in (10.0, 25.0)
+        ]
+        road = RoadProfile("step", amplitude=0.05, activation_time=0.1)
+        t_eval = self.t_eval[:2001]
+        loop = ControlLoop(
+            SkyhookController(1000.0),
+            actuators=("suspension_travel_front", "suspension_travel_rear"),
+        )
+        results = loop.run_batch(models, road, t_eval)
+        for model, y in zip(models, results.y):
+            expected = loop.simulate(model, road, t_eval)
+            np.testing.assert_allclose(y, expected.y, atol=1e-12)
+
+
+class TestSimulationServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = SimulationServer(workers=1, batch_window=0.05)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def request(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode()
+        with urllib.request.urlopen(self.server.url + path, data, timeout=60) as r:
+            return json.loads(r.read())
+
+    def spec(self, **params):
+        return {
+            "model": "QuarterCarModel",
+            "params": params,
+            "road": {
+                "type": "sinusoidal",
+                "params": {"amplitude": 0.02, "frequency": 1.5},
+            },
+            "t_span": [0, 2],
+            "t_eval": {"start": 0, "stop": 2, "num": 201},
+        }
+
+    def test_batch_matches_simulation_control(self):
+        masses = [250.0, 300.0, 350.0]
+        results = self.request("/simulate", [self.spec(ms=ms) for ms in masses])
+        self.assertEqual(len(results), 3)
+
+        road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        t_eval = np.linspace(0, 2, 201)
+        for ms, result in zip(masses, results):
+            model = QuarterCarModel(QuarterCarParams(ms=ms))
+            simulation = SimulationControl(model, road, (0, 2), t_eval)
+            simulation.run_simulation()
+            self.assertEqual(result["vehicle_model"]["params"]["ms"], ms)
+            np.testing.assert_allclose(
+                result["results"]["y"], simulation.results.y, atol=1e-6
+            )
+
+        latency = self.request("/latency")
+        self.assertGreaterEqual(latency["count"], 3)
+        self.assertGreater(latency["mean_batch_size"], 1.0)
+
+    def test_stored_result_handle(self):
+        handle = self.request("/simulate", dict(self.spec(), store=True))
+        stored = self.request(handle["url"])
+        self.assertEqual(stored["name"], handle["handle"])
+        self.assertEqual(len(stored["results"]["t"]), 201)
+        # stored arrays stay in the shared memory written by the worker
+        self.assertIn(handle["handle"], self.server.service.collector._shared)
+
+    def test_status_endpoints(self):
+        self.assertEqual(self.request("/health")["status"], "ok")
+        self.assertEqual(self.request("/queue"), {"queued": 0, "in_flight": 0})
+
+    def test_invalid_requests(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request("/simulate", dict(self.spec(), model="FullCarModel"))
+        self.assertEqual(context.exception.code, 400)
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request("/results/unknown")
+        self.assertEqual(context.exception.code, 404)
+        for payload in (
+            dict(self.spec(), t_span=5),
+            dict(self.spec(), t_span=[0]),
+            dict(self.spec(), params={"ms": "heavy"}),
+            dict(self.spec(), initial_conditions=[0.1]),
+            [self.spec(), dict(self.spec(), t_span=None)],
+        ):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.request("/simulate", payload)
+            self.assertEqual(context.exception.code, 400)
+        # no job of a rejected request was queued
+        self.assertEqual(self.request("/queue"), {"queued": 0, "in_flight": 0})
+
+    def test_failed_batch_frees_shared_arrays(self):
+        jobs = [parse_job(self.spec(ms=ms)) for ms in (250.0, 300.0)]
+        created = []
+        from_array = SharedArray.from_array
+
+        def share(array):
+            if len(created) == 5:
+                raise MemoryError("No shared memory left")
+            created.append(from_array(array))
+            return created[-1]
+
+        with mock.patch("service.jobs.SharedArray.from_array", side_effect=share):
+            with self.assertRaises(MemoryError):
+                run_jobs(jobs)
+        for handle in created:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=handle.name)
+
+    def test_shutdown_fails_queued_jobs(self):
+        service = SimulationService(workers=1, max_batch=1, batch_window=0.0)
+        futures = service.submit_many([self.spec(ms=200.0 + i) for i in range(20)])
+        service.shutdown()
+        for future in futures:
+            self.assertTrue(future.done())
+            if future.exception() is not None:
+                self.assertIsInstance(future.exception(), RuntimeError)
+        with self.assertRaises(RuntimeError):
+            service.submit(self.spec())
+
+    def test_batch_with_different_delays(self):
+        velocities = [10.0, 25.0]
+        specs = [
+            dict(
+                self.spec(longitudial_velocity=velocity),
+                model="HalfCarModel",
+                road={
+                    "type": "step",
+                    "params": {"amplitude": 0.05, "activation_time": 0.1},
+                },
+            )
+            for velocity in velocities
+        ]
+        results = self.request("/simulate", specs)
+
+        road = RoadProfile("step", amplitude=0.05, activation_time=0.1)
+        for velocity, result in zip(velocities, results):
+            model = HalfCarModel(HalfCarModelParams(longitudial_velocity=velocity))
+            simulation = SimulationControl(model, road, (0, 2), np.linspace(0, 2, 201))
+            simulation.run_simulation()
+            np.testing.assert_allclose(
+                result["results"]["y"], simulation.results.y, atol=1e-5
+            )
+
+
+class TestAsyncSimulationRunner(unittest.TestCase):
+    def setUp(self):
+        self.road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        self.t_eval = np.linspace(0, 2, 401)
+        self.executor = ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def simulation(self, ms=250.0, simulation_class=SimulationControl):
+        model = QuarterCarModel(QuarterCarParams(ms=ms))
+        return simulation_class(model, self.road, (0, 2), self.t_eval, name=str(ms))
+
+    def test_as_completed_matches_blocking_runs(self):
+        masses = [200.0, 250.0, 300.0, 350.0]
+
+        async def main():
+            runner = AsyncSimulationRunner(self.executor, max_concurrency=2)
+            simulations = [self.simulation(ms) for ms in masses]
+            return [s async for s in runner.as_completed(simulations)]
+
+        finished = asyncio.run(main())
+        self.assertEqual(sorted(s.name for s in finished), [str(m) for m in masses])
+        for simulation in finished:
+            expected = self.simulation(simulation.vehicle_model.params["ms"])
+            expected.run_simulation()
+            np.testing.assert_allclose(simulation.results.y, expected.results.y)
+
+    def test_bounded_concurrency_and_cancellation(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        class TrackedSimulation(SimulationControl):
+            def run_simulation(self):
+                with lock:
+                    active.append(self)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                super().run_simulation()
+                with lock:
+                    active.remove(self)
+
+        async def main():
+            runner = AsyncSimulationRunner(self.executor, max_concurrency=2)
+            simulations = [
+                self.simulation(200.0 + i, TrackedSimulation) for i in range(6)
+            ]
+            tasks = [runner.submit(s) for s in simulations]
+            tasks[-1].cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return simulations, tasks
+
+        simulations, tasks = asyncio.run(main())
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(len(peak), 5)
+        self.assertTrue(tasks[-1].cancelled())
+        self.assertIsNone(simulations[-1].results)
+
+    def test_stream_chunks(self):
+        async def main():
+            runner = AsyncSimulationRunner(self.executor)
+            return [chunk async for chunk in runner.stream(self.simulation(), 64)]
+
+        chunks = asyncio.run(main())
+        self.assertEqual(len(chunks), 7)
+        expected = self.simulation()
+        expected.run_simulation()
+        np.testing.assert_allclose(
+            np.concatenate([chunk.t for chunk in chunks]), self.t_eval
+        )
+        np.testing.assert_allclose(
+            np.hstack([chunk.y for chunk in chunks]), expected.results.y, atol=1e-6
+        )
+
+    def test_process_pool(self):
+        async def main():
+            async with AsyncSimulationRunner(max_concurrency=2) as runner:
+                return await runner.run_all([self.simulation(), self.simulation(300.0)])
+
+        simulations = asyncio.run(main())
+        self.assertEqual(simulations[1].results.y.shape, (4, 401))
+        self.assertIsNotNone(simulations[0].execution_date)
+
+
+class TestSharedResults(unittest.TestCase):
+    def setUp(self):
+        road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        t_eval = np.linspace(0, 2, 2001)
+        self.simulations = [
+            SimulationControl(
+                HalfCarModel(HalfCarModelParams(ms=ms)),
+                road,
+                (0, 2),
+                t_eval,
+                name=f"ms={ms}",
+            )
+            for ms in (900.0, 1200.0)
+        ]
+
+    def adopt(self, directory=None):
+        collector = SimulationCollector()
+        with ProcessPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(run_shared, simulation, directory)
+                for simulation in self.simulations
+            ]
+            for future in futures:
+                collector.adopt_shared_analysis(future.result())
+        return collector
+
+    def check(self, collector):
+        for simulation in self.simulations:
+            simulation.run_simulation()
+            analysis = collector.get_analysis(simulation.name)
+            self.assertIsInstance(analysis["results"]["y"], np.ndarray)
+            np.testing.assert_array_equal(
+                analysis["results"]["y"], simulation.results.y
+            )
+            np.testing.assert_array_equal(analysis["t_eval"], simulation.t_eval)
+
+    def test_shared_memory(self):
+        collector = self.adopt()
+        self.check(collector)
+        handles, _ = collector._shared["ms=900.0"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "session.json")
+            collector.export_results(filename)
+            imported = SimulationCollector()
+            imported.import_results(filename)
+        np.testing.assert_array_equal(
+            imported.get_analysis("ms=900.0")["results"]["y"],
+            collector.get_analysis("ms=900.0")["results"]["y"],
+        )
+
+        collector.release()
+        self.assertEqual(collector.list_analyses(), [])
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=handles[0].name)
+
+    def test_memory_mapped_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            collector = self.adopt(directory)
+            self.check(collector)
+            self.assertEqual(len(os.listdir(directory)), 8)
+            collector.release("ms=900.0")
+            self.assertEqual(collector.list_analyses(), ["ms=1200.0"])
+            self.assertEqual(len(os.listdir(directory)), 4)
+            collector.release()
+
+    def test_reduced_results(self):
+        simulation = self.simulations[0]
+        simulation.output = OutputSpec(
+            states=[0], channels=["body_acc", "pitch"], decimation=10
+        )
+        collector = SimulationCollector()
+        with ProcessPoolExecutor(1) as executor:
+            shared = executor.submit(run_shared, simulation).result()
+        collector.adopt_shared_analysis(shared)
+        self.assertIsNone(shared["t_eval"])
+
+        simulation.run_simulation()
+        analysis = collector.get_analysis(simulation.name)
+        self.assertEqual(analysis["results"]["states"], [0])
+        for name, value in simulation.results.outputs.items():
+            np.testing.assert_array_equal(analysis["results"]["outputs"][name], value)
+        handles, _ = collector._shared[simulation.name]
+        self.assertEqual(len(handles), 5)
+        collector.release()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=handles[-1].name)
+
+
+class TestAnalysisRecord(unittest.TestCase):
+    def setUp(self):
+        model = SeatAddedQuarterCarModel(SeatAddedQuarterCarParams())
+        road = RoadProfile("step", amplitude=0.05, activation_time=0.5)
+        self.simulation = SimulationControl(
+            model, road, (0, 2), np.linspace(0, 2, 501), name="Step Road"
+        )
+        self.simulation.run_simulation()
+        self.collector = SimulationCollector()
+        self.collector.add_analysis(self.simulation)
+
+    def test_arrays_without_copies(self):
+        record = self.collector.get_analysis("Step Road")
+        self.assertIsInstance(record, AnalysisRecord)
+        self.assertIs(record["results"]["y"], self.simulation.results.y)
+        self.assertIs(record["t_eval"], record["results"]["t"])
+        self.assertEqual(record.nbytes, (1 + 6 + 1) * 501 * 8)
+        self.assertEqual(record["vehicle_model"]["type"], "SeatAddedQuarterCarModel")
+        self.assertEqual(set(record), set(record.keys()))
+        with self.assertRaises(AttributeError):
+            record.comment = "records are slotted"
+
+    def test_export_import_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "session.json")
+            self.collector.export_results(filename)
+            with open(filename) as f:
+                exported = json.load(f)["Step Road"]
+            imported = SimulationCollector()
+            imported.import_results(filename)
+
+        self.assertEqual(len(exported["results"]["y"]), 6)
+        self.assertEqual(len(exported["t_eval"]), 501)
+        record = imported.get_analyses()
+        np.testing.assert_array_equal(record.y, self.simulation.results.y)
+        np.testing.assert_array_equal(record.road, self.simulation.results.road_profile)
+        self.assertEqual(record.to_dict(), exported)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            self.collector.add_analysis_from_data({"name": "no results"})
+
+
+class TestAnalysisIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = AnalysisIndex()
+        self.collector = SimulationCollector()
+        road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        t_eval = np.linspace(0, 2, 401)
+        for cs in (500.0, 1000.0, 2000.0):
+            model = QuarterCarModel(QuarterCarParams(cs=cs))
+            simulation = SimulationControl(model, road, (0, 2), t_eval, f"cs={cs}")
+            simulation.run_simulation()
+            self.collector.add_analysis(simulation)
+
+    def tearDown(self):
+        self.index.close()
+
+    def synthetic(self, i):
+        return AnalysisRecord(
+            name=f"run {i:03d}",
+            execution_date=f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}",
+            vehicle_model={"type": "HalfCarModel", "params": {"cs_r": 10.0 * i}},
+            road_profile={"type": "step", "params": {"amplitude": 0.05}},
+            t=np.zeros(3),
+            y=np.zeros((8, 3)),
+            road=np.zeros(3),
+            t_span=(0, 1),
+        )
+
+    def test_default_metrics(self):
+        self.collector.index_analyses(self.index, storage="session.json")
+        self.assertEqual(len(self.index), 3)
+        entry = self.index.get("cs=1000.0")
+        self.assertEqual(entry["params"]["cs"], 1000.0)
+        self.assertEqual(entry["road"]["frequency"], 1.5)
+        self.assertEqual(entry["storage"], "session.json")
+        metrics = ResultsVisualization(
+            self.collector.get_analysis("cs=1000.0")
+        ).compute_performance_metrics()
+        self.assertEqual(entry["metrics"], metrics)
+
+        least_damped = self.index.query(
+            "QuarterCarModel", order_by="metrics.rms_acc_ms", descending=True, limit=1
+        )
+        self.assertEqual(least_damped[0]["name"], "cs=500.0")
+
+    def test_compare_and_command_line_queries(self):
+        self.collector.index_analyses(self.index)
+        compared = self.collector.compare_analyses(
+            index=self.index, params={"cs": (None, 1000.0)}
+        )
+        self.assertEqual(list(compared), ["cs=1000.0", "cs=500.0"])
+        compared = self.collector.compare_analyses(
+            ["cs=500.0", "cs=2000.0"], index=self.index, params={"cs": (None, 1000.0)}
+        )
+        self.assertEqual(list(compared), ["cs=500.0"])
+        with self.assertRaises(ValueError):
+            self.collector.compare_analyses(params={"cs": 500.0})
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.collector.save_session(SessionStore(directory))
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                session_main(["index", directory])
+                session_main(
+                    [
+                        "query",
+                        directory,
+                        "--model",
+                        "QuarterCarModel",
+                        "--param",
+                        "cs=600:",
+                        "--order-by",
+                        "metrics.rms_acc_ms",
+                    ]
+                )
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "Indexed 3 analyses")
+        entries = [json.loads(line) for line in lines[1:]]
+        self.assertEqual(
+            [entry["name"] for entry in entries], ["cs=2000.0", "cs=1000.0"]
+        )
+        self.assertEqual(entries[0]["storage"], directory)
+
+    def test_range_queries_and_pagination(self):
+        records = [self.synthetic(i) for i in range(200)]
+        metrics = [{"rms_acc_ms": 0.01 * i} for i in range(200)]
+        self.index.add_many(records, metrics)
+        self.collector.index_analyses(self.index)
+
+        conditions = dict(params={"cs_r": (None, 1000)}, metrics={"rms_acc_ms": 1.5})
+        self.assertEqual(self.index.count("HalfCarModel", **conditions), 0)
+        conditions["metrics"] = {"rms_acc_ms": (0.5, None)}
+        self.assertEqual(self.index.count("HalfCarModel", **conditions), 51)
+        pages = [
+            self.index.query("HalfCarModel", limit=20, offset=offset, **conditions)
+            for offset in (0, 20, 40)
+        ]
+        names = [row["name"] for page in pages for row in page]
+        self.assertEqual(names, [f"run {i:03d}" for i in range(50, 101)])
+        self.assertEqual(
+            len(self.index.query(executed=("2024-01-01T00:03:00", "2024-12-31"))), 20
+        )
+
+        plan = self.index.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT analysis_id FROM attributes "
+            "WHERE kind = 'param' AND key = 'cs_r' AND value <= 1000"
+        ).fetchall()
+        self.assertIn("attributes_value", str([tuple(row) for row in plan]))
+
+        self.index.add(records[0], {"rms_acc_ms": 9.0})
+        self.assertEqual(len(self.index), 203)
+        self.assertEqual(self.index.get("run 000")["metrics"], {"rms_acc_ms": 9.0})
+        self.index.remove("run 000")
+        self.assertIsNone(self.index.get("run 000"))
+        with self.assertRaises(ValueError):
+            self.index.query(comments={"x": 1})
+
+
+def _checkpoint_sweep(path, worker, count):
+    store = SessionStore(path, segment_size=4096)
+    for i in range(count):
+        store.append(
+            AnalysisRecord(
+                name=f"worker {worker} run {i}",
+                execution_date="2024-01-01T00:00:00",
+                vehicle_model={"type": "QuarterCarModel", "params": {"cs": i}},
+                road_profile={"type": "step", "params": {}},
+                t=np.linspace(0, 1, 50),
+                y=np.full((4, 50), float(worker * 100 + i)),
+                road=np.zeros(50),
+                t_span=(0, 1),
+            )
+        )
+    return count
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session")
+        model = QuarterCarModel(QuarterCarParams())
+        road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        self.collector = SimulationCollector()
+        for name in ("first", "second"):
+            simulation = SimulationControl(
+                model, road, (0, 2), np.linspace(0, 2, 201), name
+            )
+            simulation.run_simulation()
+            self.collector.add_analysis(simulation)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_incremental_appends(self):
+        store = SessionStore(self.path)
+        self.collector.save_session(store)
+        size = store.stats()["bytes"]
+        store.append(self.collector.get_analysis("first"))
+        # the second save of an analysis appends only that analysis
+        self.assertEqual(store.stats()["bytes"], size * 3 // 2)
+
+        loaded = SimulationCollector()
+        loaded.load_session(SessionStore(self.path))
+        self.assertEqual(loaded.list_analyses(), ["first", "second"])
+        record = loaded.get_analysis("second")
+        expected = self.collector.get_analysis("second")
+        np.testing.assert_array_equal(record.y, expected.y)
+        self.assertEqual(record.to_dict(), expected.to_dict())
+
+        store.delete("first")
+        self.assertEqual(SessionStore(self.path).names(), ["second"])
+
+    def test_compaction_of_all_analyses(self):
+        store = SessionStore(self.path)
+        self.collector.save_session(store)
+        reader = SessionStore(self.path)
+        self.assertEqual(reader.names(), ["first", "second"])
+
+        store.delete("first")
+        store.delete("second")
+        store.compact()
+        self.assertEqual(store.names(), [])
+        record = self.collector.get_analysis("first")
+        store.append(dict(record.to_dict(), name="third"))
+
+        reader.refresh()
+        self.assertEqual(reader.names(), ["third"])
+        np.testing.assert_array_equal(reader.load("third").y, record.y)
+
+    def test_torn_entry_is_ignored_and_repaired(self):
+        store = SessionStore(self.path)
+        self.collector.save_session(store, ["first"])
+        segment = os.path.join(self.path, "00000001.log")
+        with open(segment, "ab") as f:
+            f.write(b"VCSR" + b"\x00" * 20)
+
+        self.assertEqual(SessionStore(self.path).names(), ["first"])
+        store.append(self.collector.get_analysis("second"))
+        reopened = SessionStore(self.path)
+        self.assertEqual(reopened.names(), ["first", "second"])
+        self.assertEqual(os.path.getsize(segment), reopened.stats()["live_bytes"])
+
+    def test_concurrent_writers_and_compaction(self):
+        with ProcessPoolExecutor(4) as executor:
+            futures = [
+                executor.submit(_checkpoint_sweep, self.path, worker, 25)
+                for worker in range(4)
+            ]
+            self.assertEqual(sum(future.result() for future in futures), 100)
+
+        store = SessionStore(self.path)
+        self.assertEqual(len(store), 100)
+        for worker in range(4):
+            for i in (0, 24):
+                record = store.load(f"worker {worker} run {i}")
+                np.testing.assert_array_equal(record.y, worker * 100 + i)
+
+        reader = SessionStore(self.path)
+        for i in range(50):
+            store.delete(
+                f"worker 0 run {i % 25}" if i < 25 else f"worker 1 run {i - 25}"
+            )
+        before = store.stats()
+        store.compact()
+        after = store.stats()
+        self.assertEqual(after["analyses"], 50)
+        self.assertEqual(after["bytes"], after["live_bytes"])
+        self.assertLess(after["bytes"], before["bytes"] / 2)
+
+        # a reader opened before the compaction follows it
+        reader.refresh()
+        self.assertEqual(sorted(reader.names()), sorted(store.names()))
+        np.testing.assert_array_equal(reader.load("worker 3 run 7").y, 307.0)
+
+
+class TestCheckpointedRun(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.road = RoadProfile(
+            "chirp",
+            amplitude=0.01,
+            initial_frequency=0.5,
+            final_frequency=5.0,
+            end_time=4.0,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def simulation(self, name="drive", cs=1500.0):
+        model = QuarterCarModel(QuarterCarParams(cs=cs))
+        return SimulationControl(
+            model, self.road, (0, 4), np.linspace(0, 4, 2001), name
+        )
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_resume_matches_uninterrupted_run(self):
+        uninterrupted = CheckpointedRun(self.simulation(), self.path("a"), 300).run()
+
+        self.assertIsNone(
+            CheckpointedRun(self.simulation(), self.path("b"), 300).run(2)
+        )
+        # samples written after the last checkpoint are discarded on resume
+        with open(os.path.join(self.path("b"), "trajectory.bin"), "ab") as f:
+            f.write(b"\x00" * 100)
+        resumed_run = CheckpointedRun(self.simulation(), self.path("b"), 300)
+        self.assertFalse(resumed_run.completed)
+        resumed = resumed_run.run()
+        self.assertTrue(resumed_run.completed)
+
+        np.testing.assert_array_equal(resumed.y, uninterrupted.y)
+        np.testing.assert_array_equal(
+            resumed.metrics["rms"], uninterrupted.metrics["rms"]
+        )
+        np.testing.assert_allclose(
+            resumed.metrics["rms"], np.sqrt(np.mean(resumed.y**2, axis=1))
+        )
+        np.testing.assert_array_equal(
+            resumed.metrics["peak"], np.max(np.abs(resumed.y), axis=1)
+        )
+
+        direct = self.simulation()
+        direct.run_simulation()
+        np.testing.assert_allclose(resumed.y, direct.results.y, atol=1e-6)
+
+        with self.assertRaises(ValueError):
+            CheckpointedRun(self.simulation(cs=900.0), self.path("b"), 300).run()
+
+    def test_sweep_resumes_after_completed_jobs(self):
+        jobs = [self.simulation(f"cs={cs}", cs) for cs in (800.0, 1200.0, 1600.0)]
+        store = self.path("sweep")
+        self.assertEqual(run_sweep(jobs[:1], store), ["cs=800.0"])
+        self.assertEqual(
+            sorted(run_sweep(jobs, store, workers=2)), ["cs=1200.0", "cs=1600.0"]
+        )
+        self.assertEqual(run_sweep(jobs, store), [])
+
+        stored = SessionStore(store)
+        self.assertEqual(len(stored), 3)
+        jobs[2].run_simulation()
+        np.testing.assert_array_equal(stored.load("cs=1600.0").y, jobs[2].results.y)
+
+
+class TestJsonStream(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "Session_ThesisWork.json")
+        self.analyses = {
+            f"run {i}": {
+                "name": f"run {i}",
+                "vehicle_model": {"type": "QuarterCarModel", "params": {"cs": 1e3 * i}},
+                "road_profile": {"type": "step", "params": {}},
+                "note": 'quotes " and braces { [ in \\ strings',
+                "results": {
+                    "t": [0.0, 0.5, 1.0],
+                    "y": [[1.5e-3 * i, -2.0, 3.25]] * 4,
+                    "road_profile": [0, 0, 1],
+                },
+                "t_span": [0, 1],
+                "t_eval": [0.0, 0.5, 1.0],
+                "empty": {},
+                "flag": None,
+            }
+            for i in range(5)
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writer_matches_json_dump(self):
+        for indent in (2, None):
+            write_session(self.filename, self.analyses.items(), indent=indent)
+            with open(self.filename) as f:
+                self.assertEqual(f.read(), json.dumps(self.analyses, indent=indent))
+        write_session(self.filename, [])
+        with open(self.filename) as f:
+            self.assertEqual(json.load(f), {})
+
+    def test_incremental_parser(self):
+        write_session(self.filename, self.analyses.items())
+        for chunk_size in (1, 7, 2**20):
+            parsed = dict(iter_session(self.filename, chunk_size))
+            self.assertEqual(parsed, self.analyses)
+        with open(self.filename, "w") as f:
+            f.write('{"run": {"t": [1, 2')
+        with self.assertRaises(ValueError):
+            list(iter_session(self.filename))
+
+    def test_collector_and_conversion(self):
+        write_session(self.filename, self.analyses.items())
+        collector = SimulationCollector()
+        collector.import_results(self.filename)
+        self.assertEqual(collector.list_analyses(), list(self.analyses))
+        np.testing.assert_array_equal(
+            collector.get_analysis("run 3")["results"]["y"],
+            self.analyses["run 3"]["results"]["y"],
+        )
+
+        store = SessionStore(os.path.join(self.directory.name, "store"))
+        self.assertEqual(convert_session(self.filename, store), 5)
+        self.assertEqual(store.load("run 4").vehicle_model["params"]["cs"], 4e3)
+
+
+class TestStoragePolicies(unittest.TestCase):
+    def setUp(self):
+        road = RoadProfile(
+            "chirp",
+            amplitude=0.02,
+            initial_frequency=0.5,
+            final_frequency=15.0,
+            end_time=10.0,
+        )
+        simulation = SimulationControl(
+            HalfCarModel(HalfCarModelParams()),
+            road,
+            (0, 10),
+            np.linspace(0, 10, 10001),
+            "chirp",
+        )
+        simulation.run_simulation()
+        collector = SimulationCollector()
+        collector.add_analysis(simulation)
+        self.record = collector.get_analysis("chirp")
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_policies(self):
+        y = self.record.y
+        for policy, tolerance in (
+            (StoragePolicy("float32", compression="zlib"), 1e-6 * np.max(np.abs(y))),
+            (StoragePolicy("quantized", 1e-5), 1e-5),
+            (StoragePolicy("quantized", 1e-5, delta=True, compression="lzma"), 1e-5),
+            ([StoragePolicy("quantized", 10.0**-i, True) for i in range(8)], 1.0),
+        ):
+            data, metadata = encode_array(y, policy)
+            decoded = decode_array(data, metadata)
+            self.assertEqual(decoded.shape, y.shape)
+            self.assertLessEqual(np.max(np.abs(decoded - y)), tolerance * (1 + 1e-9))
+        data, metadata = encode_array(y[0], StoragePolicy("quantized", 1e-4, True))
+        self.assertEqual(metadata["dtype"], "|i1")
+
+        for arguments in (("float16",), ("quantized",), ("float32", None, True)):
+            with self.assertRaises(ValueError):
+                StoragePolicy(*arguments)
+
+    def test_compressed_session(self):
+        dt = self.record.t[1] - self.record.t[0]
+        store = SessionStore(
+            os.path.join(self.directory.name, "archive"),
+            policies=lambda record: table_style_policies(len(record.y), dt, "lzma"),
+        )
+        report = store.append(self.record)
+        self.assertGreater(report.ratio, 10.0)
+        self.assertLessEqual(report.max_error["y"], 0.5e-4 * (1 + 1e-9))
+        self.assertLess(store.stats()["bytes"], report.raw_bytes / 10)
+
+        stored = store.load("chirp")
+        np.testing.assert_allclose(stored.t, self.record.t, atol=1e-12)
+        np.testing.assert_allclose(stored.y, self.record.y, atol=0.5e-4 * (1 + 1e-9))
+        # accelerations derived from the velocities keep two decimals
+        acceleration = np.gradient(stored.y[1], stored.t)
+        expected = np.gradient(self.record.y[1], self.record.t)
+        np.testing.assert_allclose(acceleration, expected, atol=0.005)
+
+
+class TestOutputSpec(unittest.TestCase):
+    def setUp(self):
+        self.road = RoadProfile("sinusoidal", amplitude=0.02, frequency=1.5)
+        self.t_eval = np.linspace(0, 2, 2001)
+        self.spec = OutputSpec(
+            states=[0],
+            channels=["body_acc", "suspension_travel_rear", "damper_power"],
+            points={"driver": 0.5},
+            decimation=10,
+        )
+        self.full = SimulationControl(
+            HalfCarModel(HalfCarModelParams()), self.road, (0, 2), self.t_eval
+        )
+        self.full.run_simulation()
+
+    def test_selected_channels(self):
+        simulation = SimulationControl(
+            HalfCarModel(HalfCarModelParams()),
+            self.road,
+            (0, 2),
+            self.t_eval,
+            output=self.spec,
+        )
+        simulation.run_simulation()
+        results = simulation.results
+        y = self.full.results.y[:, ::10]
+        np.testing.assert_allclose(results.t, self.t_eval[::10])
+        self.assertEqual(results.y.shape, (1, 201))
+        self.assertEqual(
+            list(results.outputs),
+            ["body_acc", "suspension_travel_rear", "damper_power", "driver"],
+        )
+        self.assertEqual(len(results.road_profile), 201)
+
+        model = simulation.vehicle_model
+        p = model.params
+        travel = y[0] - p["b"] * y[2] - y[6]
+        travel_rate = y[1] - p["b"] * y[3] - y[7]
+        front_rate = y[1] + p["a"] * y[3] - y[5]
+        acceleration = np.array(
+            [
+                model.equations_of_motion(x, t, self.road.get_profile)[1]
+                for x, t in zip(y.T, results.t)
+            ]
+        )
+        np.testing.assert_allclose(results.y[0], y[0], atol=1e-8)
+        np.testing.assert_allclose(
+            results.outputs["suspension_travel_rear"], travel, atol=1e-8
+        )
+        np.testing.assert_allclose(
+            results.outputs["damper_power"],
+            p["cs_f"] * front_rate**2 + p["cs_r"] * travel_rate**2,
+            atol=1e-6,
+        )
+        np.testing.assert_allclose(
+            results.outputs["driver"], y[0] + 0.5 * y[2], atol=1e-8
+        )
+        np.testing.assert_allclose(results.outputs["body_acc"], acceleration, atol=1e-6)
+
+    def test_compressed_reduced_results(self):
+        spec = OutputSpec(states=[1, 3], channels=["body_acc"], decimation=10)
+        simulation = SimulationControl(
+            HalfCarModel(HalfCarModelParams()),
+            self.road,
+            (0, 2),
+            self.t_eval,
+            name="reduced",
+            output=spec,
+        )
+        simulation.run_simulation()
+        collector = SimulationCollector()
+        collector.add_analysis(simulation)
+        record = collector.get_analysis("reduced")
+        dt = record.t[1] - record.t[0]
+
+        policies = table_style_policies(record.states, dt, outputs={"body_acc": 1e-3})
+        expected = table_style_policies(4, dt)["y"]
+        self.assertEqual(policies["y"], [expected[1], expected[3]])
+        with tempfile.TemporaryDirectory() as directory:
+            store = SessionStore(
+                directory,
+                policies=lambda r: table_style_policies(
+                    r.states, dt, outputs={"body_acc": 1e-3}
+                ),
+            )
+            report = store.append(record)
+            stored = store.load("reduced")
+        self.assertLessEqual(report.max_error["y"], expected[1].tolerance * (1 + 1e-9))
+        np.testing.assert_allclose(
+            stored.outputs["body_acc"], record.outputs["body_acc"], atol=1e-3
+        )
+        self.assertGreater(report.max_error["outputs.body_acc"], 0.0)
+
+    def test_collect_export_and_metrics(self):
+        simulation = SimulationControl(
+            HalfCarModel(HalfCarModelParams()),
+            self.road,
+            (0, 2),
+            self.t_eval,
+            name="reduced",
+            output=self.spec,
+        )
+        simulation.run_simulation()
+        collector = SimulationCollector()
+        collector.add_analysis(simulation)
+        record = collector.get_analysis("reduced")
+        self.assertEqual(record.states, [0])
+        np.testing.assert_array_equal(record.t_eval, record.t)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "session.json")
+            collector.export_results(filename)
+            imported = SimulationCollector()
+            imported.import_results(filename)
+            store = SessionStore(os.path.join(directory, "store"))
+            store.append(record)
+            stored = store.load("reduced")
+
+        expected = simulation.results.outputs
+        for analysis in (imported.get_analysis("reduced"), stored):
+            self.assertEqual(analysis.states, [0])
+            self.assertEqual(list(analysis.outputs), list(expected))
+            for name, values in expected.items():
+                np.testing.assert_array_equal(analysis.outputs[name], values)
+
+            visualization = ResultsVisualization(analysis)
+            metrics = visualization.compute_performance_metrics()
+            self.assertAlmostEqual(
+                metrics["peak_body_acc"], np.max(np.abs(expected["body_acc"]))
+            )
+            self.assertIn("rms_state_0", metrics)
+            with self.assertRaises(ValueError):
+                visualization.calculate_performance_metrics()
+
+    def test_cache_and_stream(self):
+        cached = SimulationControl(
+            HalfCarModel(HalfCarModelParams()),
+            self.road,
+            (0, 2),
+            self.t_eval,
+            cache=SuperpositionCache(),
+            output=self.spec,
+        )
+        cached.run_simulation()
+        self.assertEqual(cached.results.y.shape, (1, 201))
+
+        async def main(executor):
+            runner = AsyncSimulationRunner(executor)
+            simulation = SimulationControl(
+                HalfCarModel(HalfCarModelParams()),
+                self.road,
+                (0, 2),
+                self.t_eval,
+                output=self.spec,
+            )
+            return [chunk async for chunk in runner.stream(simulation, 64)]
+
+        with ThreadPoolExecutor(2) as executor:
+            chunks = asyncio.run(main(executor))
+        self.assertEqual(len(chunks), 4)
+        for name in self.spec.channels:
+            streamed = np.concatenate([chunk.outputs[name] for chunk in chunks])
+            np.testing.assert_allclose(
+                streamed, cached.results.outputs[name], rtol=1e-4, atol=1e-6
+            )
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            OutputSpec(decimation=0)
+        with self.assertRaises(ValueError):
+            OutputSpec(channels=["driver"], points={"driver": 0.5})
+        for spec in (
+            OutputSpec(states=[4]),
+            OutputSpec(channels=["seat_acc"]),
+            OutputSpec(points={"driver": 0.5}),
+        ):
+            simulation = SimulationControl(
+                QuarterCarModel(QuarterCarParams()),
+                self.road,
+                (0, 2),
+                self.t_eval,
+                output=spec,
+            )
+            with self.assertRaises(ValueError):
+                simulation.run_simulation()
+
+
 if __name__ == "__main__":
     unittest.main()